@@ -1,11 +1,14 @@
 import argparse
 import logging
 import multiprocessing.connection
+import os
 
 from abc import ABC, abstractmethod
 from enum import Enum
 from functools import cached_property
+from botting.controller import INPUT_TIMING
 from botting.core import ActionRequest, DiscordRequest
+from paths import ROOT
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.NOTSET
@@ -16,6 +19,7 @@ class Actions(Enum):
     PAUSE = "PAUSE"
     RESUME = "RESUME"
     WRITE = "WRITE"
+    TIMING = "TIMING"
 
 
 class BaseParser(ABC):
@@ -29,6 +33,7 @@ class BaseParser(ABC):
     PAUSE --ign IgnFromARunningBot1 IgnFromARunningBot2
     RESUME --ign IgnFromAPausedBot
     WRITE --ign IgnFromABot --m Message to write
+    TIMING
     """
 
     action_choices = [action.value for action in Actions]
@@ -121,6 +126,16 @@ class BaseParser(ABC):
                 self.pipe.send(msg)
                 return
             request = self.write(" ".join(args.message), args.ign)
+
+        elif action == "TIMING":
+            if args.ign or args.message:
+                msg = (
+                    "TIMING action does not accept --ign or --message arguments. "
+                    "They will be ignored."
+                )
+                logger.warning(msg)
+                self.pipe.send(msg)
+            request = self.input_timing()
         else:
             raise ValueError(f"Invalid action: {action}")
 
@@ -145,6 +160,24 @@ class BaseParser(ABC):
             discord_request=DiscordRequest("Kill request from Discord confirmed")
         )
 
+    @staticmethod
+    async def _dump_input_timing() -> None:
+        await INPUT_TIMING.dump_async(os.path.join(ROOT, "logs", "Input Timing.json"))
+
+    def input_timing(self) -> ActionRequest:
+        """
+        Called from the MainProcess. Dumps the timing fidelity of the inputs sent so
+        far into the logs folder. The priority is above those of all bots, such that
+        the dump is never parked behind them. It does not block anything.
+        :return: The ActionRequest performing the dump.
+        """
+        return ActionRequest(
+            "Dumping input timing",
+            self._dump_input_timing,
+            ign="All",
+            priority=999,
+        )
+
     # @property
     # @abstractmethod
     # def decision_makers_to_pause(self) -> list[str]:
@@ -1,4 +1,3 @@
-import asyncio
 import cv2
 import discord
 import logging
@@ -6,9 +5,10 @@ import multiprocessing.connection
 import numpy as np
 import os
 
+from contextlib import aclosing
 from functools import cached_property
 
-from botting.utilities import config_reader
+from botting.utilities import config_reader, pipe_messages
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.DEBUG
@@ -91,10 +91,9 @@ class DiscordIO(discord.Client):
         :return: None
         """
         try:
-            while True:
+            async with aclosing(pipe_messages(self.pipe)) as signals:
                 # Check if a signal is received from main process
-                if await asyncio.to_thread(self.pipe.poll):
-                    signal = self.pipe.recv()
+                async for signal in signals:
                     if signal is None:
                         await self.get_channel(self.chat_id).send(
                             f"Discord Communication Stopped with {self.user}"
@@ -10,6 +10,7 @@ from .inputs.focused_inputs import (
 )
 
 from .inputs.non_focused_inputs import non_focused_input, message_constructor
+from .inputs.input_timing import INPUT_TIMING, InputTimingRecorder
 from .inputs.inputs_helpers import random_delay, KEYBOARD_MAPPING
 
 from .high_level import (
@@ -8,5 +8,6 @@ from .focused_inputs import (
 )
 
 from .non_focused_inputs import non_focused_input, message_constructor
+from .input_timing import INPUT_TIMING, InputTimingRecorder
 from .inputs_helpers import DELAY, random_delay
 from .shared_resources import SharedResources
@@ -0,0 +1,109 @@
+"""
+Arbitrates which window owns the PC focus (foreground window) in the MainProcess.
+Switching the foreground window is expensive and error-prone, so consecutive inputs
+for the same window are batched: every pending request for the window in focus is
+granted at once, and the window keeps the focus for as long as it has requests,
+up to a time slice. Once the slice is expired, other windows are served in the order
+in which they started waiting.
+"""
+import asyncio
+import logging
+import time
+
+from collections import deque
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+FOCUS_TIME_SLICE = 1.0  # Seconds during which a window may keep the focus
+
+
+class FocusArbiter:
+    """
+    Any number of tasks may hold the focus simultaneously, as long as they target
+    the same window.
+    """
+
+    def __init__(self, time_slice: float = FOCUS_TIME_SLICE) -> None:
+        self.time_slice = time_slice
+        self.owner: int | None = None  # Window currently (or last) in focus
+        self.holders = 0
+        self.switches = 0
+        self._slice_start = 0.0
+        # Ordered by the time at which each window started waiting
+        self._waiters: dict[int, deque[asyncio.Future]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(owner={self.owner}, holders={self.holders}, "
+            f"waiting={list(self._waiters)})"
+        )
+
+    @property
+    def slice_expired(self) -> bool:
+        return time.perf_counter() - self._slice_start > self.time_slice
+
+    async def acquire(self, hwnd: int) -> None:
+        """
+        Waits until the window may be in focus. Must be followed by release().
+        :param hwnd: The window to which inputs are sent.
+        """
+        if self._can_join(hwnd):
+            self._grant(hwnd, 1)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(hwnd, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(hwnd)  # Granted just before being cancelled
+            else:
+                self._discard(hwnd, waiter)
+            raise
+
+    def release(self, hwnd: int) -> None:
+        assert hwnd == self.owner and self.holders > 0
+        self.holders -= 1
+        if self.holders == 0:
+            self._grant_next()
+
+    def _can_join(self, hwnd: int) -> bool:
+        if self.holders == 0:
+            return not self._waiters
+        # Others may not wait forever behind a window which keeps the focus
+        return hwnd == self.owner and not (self._waiters and self.slice_expired)
+
+    def _grant(self, hwnd: int, count: int) -> None:
+        if hwnd != self.owner:
+            logger.log(LOG_LEVEL, f"Focus switched from {self.owner} to {hwnd}.")
+            self.owner = hwnd
+            self.switches += 1
+            self._slice_start = time.perf_counter()
+        self.holders += count
+
+    def _grant_next(self) -> None:
+        while self._waiters:
+            if self.owner in self._waiters and (
+                len(self._waiters) == 1 or not self.slice_expired
+            ):
+                hwnd = self.owner
+            else:
+                hwnd = next(hwnd for hwnd in self._waiters if hwnd != self.owner)
+            # Cancelled waiters are discarded once their task resumes
+            waiters = [w for w in self._waiters.pop(hwnd) if not w.cancelled()]
+            if waiters:
+                self._grant(hwnd, len(waiters))
+                for waiter in waiters:
+                    waiter.set_result(None)
+                return
+
+    def _discard(self, hwnd: int, waiter: asyncio.Future) -> None:
+        waiters = self._waiters.get(hwnd)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._waiters[hwnd]
+        if self.holders == 0:
+            self._grant_next()
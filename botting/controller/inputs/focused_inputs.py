@@ -6,22 +6,26 @@ import ctypes
 import logging
 import win32con
 
+from array import array
+from bisect import bisect_left
 from ctypes import wintypes
 from dataclasses import dataclass, field
-from typing import Literal, Generator
+from itertools import accumulate
+from typing import Generator, Iterable, Literal
 from win32com.client import Dispatch
 from win32api import HIBYTE, GetKeyState, GetAsyncKeyState
 from win32gui import SetForegroundWindow, GetForegroundWindow
 
+from .input_dispatcher import DispatchTrace, dispatch
+from .input_timing import INPUT_TIMING
 from .shared_resources import SharedResources
 
 from .inputs_helpers import (
     _EXPORTED_FUNCTIONS,
     _get_virtual_key,
+    _key_codes,
     _keyboard_layout_handle,
     EXTENDED_KEYS,
-    MAPVK_VK_TO_VSC_EX,
-    OVERHEAD,
 )
 
 KEYEVENTF_EXTENDEDKEY = 0x0001
@@ -118,33 +122,130 @@ KEYBOARD = wintypes.DWORD(1)
 HARDWARE = wintypes.DWORD(2)
 
 
+class CompiledInputs:
+    """
+    Input structures of a sequence of keyboard inputs, built once into a single
+    contiguous Input array. Each step is sent as a slice of that array, through the
+    same (count, pointer, size) arguments as the ones built by input_constructor.
+    """
+
+    __slots__ = ("structures", "steps")
+
+    def __init__(
+        self,
+        hwnd: int,
+        keys: list[str | list[str]],
+        events: list[EVENTS | list[EVENTS]],
+    ) -> None:
+        inputs = []
+        bounds = []
+        for step_keys, step_events in zip(keys, events):
+            if not isinstance(step_keys, list):
+                step_keys, step_events = [step_keys], [step_events]
+            assert len(step_keys) == len(step_events)
+            bounds.append((len(inputs), len(step_keys)))
+            for key, event in zip(step_keys, step_events):
+                SharedResources.keys_sent.add(key)
+                inputs.append(_single_input_constructor(hwnd, key, event))
+
+        self.structures = (Input * len(inputs))(*inputs)
+        size = ctypes.sizeof(Input)
+        self.steps = [
+            (
+                wintypes.UINT(count),
+                ctypes.byref(self.structures, offset * size),
+                wintypes.INT(size),
+            )
+            for offset, count in bounds
+        ]
+
+
 @dataclass
 class KeyboardInputWrapper:
     """
     Dataclass that stores the input structure and the delay to wait before sending
     the next input.
+    Delays are stored in an array, along with the cumulative duration at the end of
+    each input. Since inputs are sent at absolute deadlines, the duration is the sum
+    of the delays. The duration is therefore known in constant time, and truncation is
+    a bisection on those cumulative durations. The keys held at the end of the
+    structure are maintained as inputs are appended, such that existing inputs must
+    be modified through replace(). Input structures are compiled when first sent, and
+    compiled again only if inputs are modified. The DispatchTrace of the last send is
+    kept in last_trace, and recorded into INPUT_TIMING along with the actions marked
+    on the structure.
     """
 
     handle: int
     keys: list[str | list[str]] = field(default_factory=list)
     events: list[EVENTS | list[EVENTS]] = field(default_factory=list)
-    delays: list[float] = field(default_factory=list)
+    delays: array = field(default_factory=lambda: array("d"))
     forced_key_releases: list[str] = field(default_factory=list)
+    actions: list[tuple[str, int]] = field(default_factory=list, compare=False)
+    _ends: array = field(init=False, repr=False, compare=False)
+    _held: set[str] | None = field(init=False, repr=False, compare=False)
+    _compiled: CompiledInputs | None = field(init=False, repr=False, compare=False)
+    last_trace: DispatchTrace | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.delays, array):
+            self.delays = array("d", self.delays)
+        self._ends = array("d", accumulate(self.delays))
+        self._held = None if self.keys else set()  # Computed when first needed
+        self._compiled = None
+
+    def __getstate__(self) -> dict:
+        # ctypes structures containing pointers cannot be pickled
+        return dict(self.__dict__, _compiled=None)
 
     @property
     def c_input(self) -> list[tuple]:
-        return input_constructor(self.handle, self.keys, self.events)
+        if self._compiled is None:
+            self._compiled = CompiledInputs(self.handle, self.keys, self.events)
+        return self._compiled.steps
 
     @property
     def duration(self) -> float:
-        return sum(self.delays) + OVERHEAD * len(self.delays)
+        return self._ends[-1] if self._ends else 0.0
 
     def append(
         self, keys: str | list[str], events: EVENTS | list[EVENTS], delay: float
     ) -> None:
+        ends = self._ends
         self.keys.append(keys)
         self.events.append(events)
         self.delays.append(delay)
+        ends.append((ends[-1] if ends else 0.0) + delay)
+        self._compiled = None
+        if self._held is not None:
+            self._track_held(keys, events)
+
+    def replace(
+        self, index: int, keys: str | list[str], events: EVENTS | list[EVENTS]
+    ) -> None:
+        """
+        Replaces the keys and events of an existing input, keeping its delay.
+        The held keys are then computed again when next needed.
+        """
+        self.keys[index] = keys
+        self.events[index] = events
+        self._held = None
+        self._compiled = None
+
+    def mark(self, action: str, index: int = None) -> None:
+        """
+        Marks the inputs from index onward as belonging to an action, for the timing
+        reports. Marks at or beyond index are replaced.
+        :param action: Type of action, such as "move".
+        :param index: Index of the first input of the action. Defaults to the next
+         input appended.
+        """
+        index = len(self.keys) if index is None else index
+        while self.actions and self.actions[-1][1] >= index:
+            self.actions.pop()
+        self.actions.append((action, index))
 
     def fill(self, key: str, event: EVENTS, delay_generator: Generator, limit: float):
         """
@@ -156,35 +257,58 @@ class KeyboardInputWrapper:
         :param limit:
         :return:
         """
-        while self.duration < limit:
-            self.append(key, event, next(delay_generator))
+        delays, ends = self.delays, self._ends
+        size = len(delays)
+        duration = self.duration
+        while duration < limit:
+            delay = next(delay_generator)
+            duration += delay
+            delays.append(delay)
+            ends.append(duration)
+        added = len(delays) - size
+        if added:
+            self._compiled = None
+            self.keys.extend([key] * added)
+            self.events.extend([event] * added)
+            if self._held is not None:
+                self._track_held(key, event)
 
     @property
     def keys_held(self) -> set[str]:
         """
-        Introspects the input structures to find the keys for which a KEYDOWN event is
-        sent and for which no subsequent KEYUP event is sent.
-        :return:
+        The keys for which a KEYDOWN event is sent and for which no subsequent KEYUP
+        event is sent.
+        :return: A copy, such that inputs may be appended while iterating over it.
         """
-        keys_down = set()
-        for i, key in enumerate(self.keys):
-            if isinstance(key, list):
-                for j, k in enumerate(key):
-                    if self.events[i][j] == "keydown":
-                        keys_down.add(k)
-                    elif self.events[i][j] == "keyup":
-                        keys_down.discard(k)
-            else:
-                if self.events[i] == "keydown":
-                    keys_down.add(key)
-                elif self.events[i] == "keyup":
-                    keys_down.discard(key)
-        return keys_down
+        if self._held is None:
+            self._held = set()
+            for keys, events in zip(self.keys, self.events):
+                self._track_held(keys, events)
+        return set(self._held)
+
+    def _track_held(
+        self, keys: str | list[str], events: EVENTS | list[EVENTS]
+    ) -> None:
+        if not isinstance(keys, list):
+            keys, events = [keys], [events]
+        for key, event in zip(keys, events):
+            if event == "keydown":
+                self._held.add(key)
+            elif event == "keyup":
+                self._held.discard(key)
 
     async def send(self):
-        return await focused_inputs(
-            self.handle, self.c_input, self.delays, self.forced_key_releases
-        )
+        self.last_trace = trace = DispatchTrace()
+        try:
+            return await focused_inputs(
+                self.handle,
+                self.c_input,
+                self.delays,
+                self.forced_key_releases,
+                trace=trace,
+            )
+        finally:
+            INPUT_TIMING.record(self.handle, self.actions, len(self.delays), trace)
 
     # def cancelled_callback(self, future):
     #     breakpoint()
@@ -194,53 +318,68 @@ class KeyboardInputWrapper:
     #         logger.debug(f"Keys to release: {forced_key_releases}")
     #
     def truncate(self, limit: float) -> "KeyboardInputWrapper":
-        result = KeyboardInputWrapper(
-            self.handle, forced_key_releases=self.forced_key_releases
+        """
+        :param limit: Duration at which inputs are cut. The input during which the
+        limit is reached is kept.
+        :return: A new structure with the first inputs of this one.
+        """
+        size = 0
+        if limit > 0:
+            size = min(bisect_left(self._ends, limit) + 1, len(self.delays))
+        return KeyboardInputWrapper(
+            self.handle,
+            self.keys[:size],
+            self.events[:size],
+            self.delays[:size],
+            forced_key_releases=self.forced_key_releases,
+            actions=[action for action in self.actions if action[1] < size],
         )
-        generator = zip(self.keys, self.events, self.delays)
-        while result.duration < limit:
-            try:
-                key, event, delay = next(generator)
-                result.append(key, event, delay)
-            except StopIteration:
-                break
-        return result
 
 
 async def activate(hwnd: int) -> bool:
     """
-    Activates the window associated with the handle.
+    Activates the window associated with the handle, once the FocusArbiter grants it.
     Any key press or mouse click will be sent to the active window.
-    :return: None
+    :return: Whether the focus was granted (and must be released).
     """
-    acquired = False
-    if GetForegroundWindow() != hwnd:
-        acquired = await SharedResources.focus_lock.acquire()
-        logger.debug(f"Activating window {hwnd}")
-        # Before activating, make sure to release any keys that are currently pressed.
-        release_all(GetForegroundWindow())
-        Dispatch("WScript.Shell").SendKeys("%")
-        SetForegroundWindow(hwnd)
-
-    elif not acquired and not SharedResources.focus_lock.locked():
-        acquired = await SharedResources.focus_lock.acquire()
-    return acquired
+    await SharedResources.focus.acquire(hwnd)
+    try:
+        if GetForegroundWindow() != hwnd:
+            logger.debug(f"Activating window {hwnd}")
+            # Before activating, release any keys that are currently pressed.
+            release_all(GetForegroundWindow())
+            Dispatch("WScript.Shell").SendKeys("%")
+            SetForegroundWindow(hwnd)
+    except BaseException:
+        SharedResources.focus.release(hwnd)
+        raise
+    return True
+
+
+def held_keys(hwnd: int, keys: Iterable[str]) -> list[str]:
+    """
+    Queries the state of each distinct virtual key once (e.g. "alt" and "alt_right"
+    share the same virtual key).
+    :param hwnd: Handle to the window, used for its keyboard layout.
+    :param keys: Keys to look for.
+    :return: The keys currently held, in the given order.
+    """
+    layout = _keyboard_layout_handle(hwnd)
+    states = {}
+    held = []
+    for key in keys:
+        vk_key = _key_codes(key, layout)[0]
+        if vk_key not in states:
+            states[vk_key] = HIBYTE(GetAsyncKeyState(vk_key)) != 0
+        if states[vk_key]:
+            held.append(key)
+    return held
 
 
 def release_all(hwnd: int = None) -> None:
     if hwnd is None:
         hwnd = GetForegroundWindow()
-    keys_to_release = []
-    for key in SharedResources.keys_sent:
-        if (
-            HIBYTE(
-                GetAsyncKeyState(
-                    _get_virtual_key(key, True, _keyboard_layout_handle(hwnd))
-                )
-            )
-            != 0
-        ):
-            keys_to_release.append(key)
+    keys_to_release = held_keys(hwnd, SharedResources.keys_sent)
     if keys_to_release:
         logger.debug(f"Releasing keys {keys_to_release} from window {hwnd}")
     release_keys(keys_to_release)
@@ -249,20 +388,10 @@ def release_all(hwnd: int = None) -> None:
 def release_directions(hwnd: int = None) -> None:
     if hwnd is None:
         hwnd = GetForegroundWindow()
-    release_keys = []
-    for key in ["left", "right"]:
-        if (
-            HIBYTE(
-                GetAsyncKeyState(
-                    _get_virtual_key(key, True, _keyboard_layout_handle(hwnd))
-                )
-            )
-            != 0
-        ):
-            release_keys.append(key)
-    if release_keys:
-        logger.debug(f"Releasing keys {release_keys} from window {hwnd}")
-    release_keys(release_keys)
+    keys_to_release = held_keys(hwnd, ["left", "right"])
+    if keys_to_release:
+        logger.debug(f"Releasing keys {keys_to_release} from window {hwnd}")
+    release_keys(keys_to_release)
 
 
 def input_constructor(
@@ -354,27 +483,25 @@ async def focused_inputs(
     inputs: list[tuple],
     delays: list[float],
     forced_key_releases: list[str] = None,
+    spin: float = 0.0,
+    trace: DispatchTrace = None,
 ) -> int:
     """
     Sends the inputs to the active window.
-    A small delay is added between each input.
+    Each input is sent at an absolute deadline, given by the delays which precede it.
     :param hwnd: handle to the window to send the inputs to.
     :param inputs: input structures to send.
     :param delays: delays between each input.
     :param forced_key_releases: If provided, these are sure to be released at the end,
     even if the task is cancelled.
+    :param spin: Duration (in seconds) before each deadline spent polling the clock.
+    :param trace: If provided, records the planned and actual time of each input.
     :return: Nbr of inputs successfully sent.
     """
-    res = 0
     acquired = False
     try:
         acquired = await activate(hwnd)
-
-        for i in range(len(inputs)):
-            _send_input(inputs[i])
-            res += 1
-            await asyncio.sleep(delays[i])
-        return res
+        return await dispatch(inputs, delays, _send_input, spin, trace)
 
     except asyncio.CancelledError as e:
         raise e
@@ -384,20 +511,9 @@ async def focused_inputs(
 
     finally:
         if forced_key_releases:
-            keys_to_release = []
-            for key in forced_key_releases:
-                if (
-                    HIBYTE(
-                        GetAsyncKeyState(
-                            _get_virtual_key(key, True, _keyboard_layout_handle(hwnd))
-                        )
-                    )
-                    != 0
-                ):
-                    keys_to_release.append(key)
-            release_keys(keys_to_release)
+            release_keys(held_keys(hwnd, forced_key_releases))
         if acquired:
-            SharedResources.focus_lock.release()
+            SharedResources.focus.release(hwnd)
 
 
 def get_held_movement_keys(hwnd: int) -> list[str]:
@@ -406,16 +522,7 @@ def get_held_movement_keys(hwnd: int) -> list[str]:
     :param hwnd:
     :return:
     """
-    return [
-        key
-        for key in OPPOSITES
-        if HIBYTE(
-            GetAsyncKeyState(
-                _get_virtual_key(key, False, _keyboard_layout_handle(hwnd))
-            )
-        )
-        != 0
-    ]
+    return held_keys(hwnd, OPPOSITES)
 
 
 def _send_input(structure: tuple) -> None:
@@ -425,9 +532,6 @@ def _send_input(structure: tuple) -> None:
     :return:
     """
     failure_count = 0
-    array_class = Input * structure[0].value
-    pointer = ctypes.POINTER(array_class)
-    _EXPORTED_FUNCTIONS["SendInput"].argtypes = [wintypes.UINT, pointer, wintypes.INT]
     while _EXPORTED_FUNCTIONS["SendInput"](*structure) != structure[0].value:
         logger.error(f"Failed to send input {structure}")
         failure_count += 1
@@ -453,7 +557,6 @@ def _single_input_constructor(
     assert isinstance(key, str) and isinstance(event, str)
     assert event in ["keyup", "keydown"], f"Event type {event} is not supported"
     flags = KEYEVENTF_EXTENDEDKEY if key in EXTENDED_KEYS else 0
-    vk_key = _get_virtual_key(key, False, _keyboard_layout_handle(hwnd))
     if as_unicode:
         assert (
             len(key) == 1
@@ -462,11 +565,7 @@ def _single_input_constructor(
         vk_key = 0
         flags |= KEYEVENTF_UNICODE
     else:
-        scan_code = _EXPORTED_FUNCTIONS["MapVirtualKeyExW"](
-            vk_key,
-            MAPVK_VK_TO_VSC_EX,
-            _keyboard_layout_handle(hwnd),
-        )
+        vk_key, scan_code = _key_codes(key, _keyboard_layout_handle(hwnd))
     flags = flags | KEYEVENTF_KEYUP if event == "keyup" else flags
 
     keybd_input = KeyBdInputStruct(
@@ -0,0 +1,125 @@
+"""
+Sends a sequence of inputs at absolute deadlines.
+Each input is scheduled at the cumulative sum of the preceding delays, measured from
+the first input. When asyncio.sleep overshoots (which it does by up to the timer
+resolution of the OS), the next deadline is unchanged and the following wait is
+shortened accordingly, such that errors do not accumulate along the sequence.
+However, when an input is sent later than the delay which follows it (the event loop
+was stalled), the remaining deadlines are shifted instead of being caught up, such
+that the following inputs are not sent in a burst.
+Optionally, the last portion of each wait is spent spinning on the clock instead of
+sleeping, for sub-millisecond precision at the cost of blocking the event loop.
+Otherwise, asyncio.sleep may wake up slightly early (on Windows, timers within the
+clock resolution of the event loop are considered due), which is accepted.
+"""
+import asyncio
+import logging
+import time
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+
+@dataclass(slots=True)
+class DispatchTrace:
+    """
+    Planned and actual times at which each input is sent, in seconds since the first
+    input was due (time.perf_counter() at started_at). Lags are the delays with
+    which the event loop resumed the dispatch after each sleep. Durations are only
+    set once the last delay has elapsed.
+    """
+
+    started_at: float = 0.0
+    planned: array = field(default_factory=lambda: array("d"))
+    actual: array = field(default_factory=lambda: array("d"))
+    lags: array = field(default_factory=lambda: array("d"))
+    planned_duration: float = 0.0
+    actual_duration: float = 0.0
+    completed: bool = False
+
+    @property
+    def errors(self) -> list[float]:
+        """
+        :return: The lateness of each input (negative when early).
+        """
+        return [actual - planned for planned, actual in zip(self.planned, self.actual)]
+
+    @property
+    def max_error(self) -> float:
+        return max(map(abs, self.errors), default=0.0)
+
+
+async def wait_until(deadline: float, spin: float = 0.0) -> float | None:
+    """
+    :param deadline: time.perf_counter() value to wait for.
+    :param spin: Duration (in seconds) before the deadline during which the clock is
+     polled without yielding to the event loop. If 0, the clock is never polled.
+    :return: How late the event loop resumed after sleeping (negative when early),
+     or None if the deadline was too close to sleep.
+    """
+    lag = None
+    remaining = deadline - time.perf_counter()
+    if remaining > spin:
+        await asyncio.sleep(remaining - spin)
+        lag = time.perf_counter() - deadline + spin
+    if spin > 0:
+        while time.perf_counter() < deadline:
+            pass
+    return lag
+
+
+async def dispatch(
+    inputs: Sequence[Any],
+    delays: Sequence[float],
+    send: Callable[[Any], Any],
+    spin: float = 0.0,
+    trace: DispatchTrace = None,
+) -> int:
+    """
+    Sends each input once its deadline is reached, then waits for the last delay.
+    Planned times are those of the original schedule, even if deadlines are shifted
+    after a stall.
+    :param inputs: The inputs, passed one at a time to send.
+    :param delays: Delay between each input and the next one (or the end).
+    :param send: Callable which sends a single input.
+    :param spin: See wait_until.
+    :param trace: If provided, records the planned and actual time of each input,
+     along with the event loop lag.
+    :return: Nbr of inputs sent.
+    """
+    start = time.perf_counter()
+    if trace is not None:
+        trace.started_at = start
+    deadline = start
+    planned = 0.0
+    sent = 0
+    for structure, delay in zip(inputs, delays):
+        lag = await wait_until(deadline, spin)
+        send(structure)
+        sent += 1
+        now = time.perf_counter()
+        if trace is not None:
+            trace.planned.append(planned)
+            trace.actual.append(now - start)
+            if lag is not None:
+                trace.lags.append(lag)
+        if now - deadline > delay:
+            deadline = now  # Too late to catch up, the next delay is kept instead
+        deadline += delay
+        planned += delay
+    lag = await wait_until(deadline, spin)
+    if trace is not None:
+        trace.planned_duration = planned
+        trace.actual_duration = time.perf_counter() - start
+        trace.completed = True
+        if lag is not None:
+            trace.lags.append(lag)
+        logger.log(
+            LOG_LEVEL,
+            f"Sent {sent} inputs within {trace.max_error * 1e3:.2f} ms of plan.",
+        )
+    return sent
@@ -0,0 +1,212 @@
+"""
+Timing fidelity of the inputs sent by the MainProcess.
+Each KeyboardInputWrapper sent records its DispatchTrace into a ring buffer, such
+that the latest sends are kept at a bounded cost. Reports are computed from the
+buffer when requested:
+- Jitter: how late each input is sent compared to its deadline.
+- Overshoot: how much longer each complete send lasts than planned.
+- Event loop lag: how late the event loop resumes the dispatch after each sleep.
+- Planned vs. actual durations of each type of action (move, single_jump, etc.),
+ as marked on the KeyboardInputWrapper.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+from .input_dispatcher import DispatchTrace
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+EXPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass(slots=True)
+class TimingRecord:
+    """
+    A single send. Segments are the (action, planned, actual) durations of each
+    action whose inputs were all sent.
+    """
+
+    handle: int
+    sent_at: float
+    trace: DispatchTrace
+    segments: list[tuple[str, float, float]] = field(default_factory=list)
+
+    @classmethod
+    def from_trace(
+        cls,
+        handle: int,
+        actions: Sequence[tuple[str, int]],
+        nbr_inputs: int,
+        trace: DispatchTrace,
+    ) -> "TimingRecord":
+        """
+        :param handle: Window handle to which the inputs were sent.
+        :param actions: The action and index of the first input of each segment.
+        :param nbr_inputs: Nbr of inputs planned, sent or not.
+        :param trace: The DispatchTrace of the send.
+        """
+        record = cls(handle, time.time(), trace)
+        sent = len(trace.actual)
+        for i, (action, start) in enumerate(actions):
+            end = actions[i + 1][1] if i + 1 < len(actions) else nbr_inputs
+            if start >= end:
+                continue
+            if end < sent:
+                planned, actual = trace.planned[end], trace.actual[end]
+            elif end == nbr_inputs and trace.completed:
+                planned, actual = trace.planned_duration, trace.actual_duration
+            else:
+                break
+            record.segments.append(
+                (
+                    action,
+                    planned - trace.planned[start],
+                    actual - trace.actual[start],
+                )
+            )
+        return record
+
+
+class InputTimingRecorder:
+    """
+    Lives in MainProcess.
+    Keeps the latest sends in a ring buffer. Bots are identified by the handle of
+    their window, unless a name is registered for it.
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        self.records: deque[TimingRecord] = deque(maxlen=capacity)
+        self.names: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def register(self, handle: int, name: str) -> None:
+        self.names[handle] = name
+
+    def record(
+        self,
+        handle: int,
+        actions: Sequence[tuple[str, int]],
+        nbr_inputs: int,
+        trace: DispatchTrace,
+    ) -> None:
+        """
+        See TimingRecord.from_trace. Sends which did not send any input are ignored.
+        """
+        if not trace.actual:
+            return
+        self.records.append(TimingRecord.from_trace(handle, actions, nbr_inputs, trace))
+
+    def clear(self) -> None:
+        self.records.clear()
+
+    def report(self) -> dict:
+        """
+        :return: A JSON-serializable report, per bot, with durations in seconds.
+        """
+        grouped: dict[str, list[TimingRecord]] = {}
+        for record in self.records:
+            name = self.names.get(record.handle, str(record.handle))
+            grouped.setdefault(name, []).append(record)
+        return {
+            "generated_at": time.time(),
+            "bots": {
+                name: self._bot_report(records)
+                for name, records in sorted(grouped.items())
+            },
+        }
+
+    @staticmethod
+    def _bot_report(records: list[TimingRecord]) -> dict:
+        actions: dict[str, list[tuple[float, float]]] = {}
+        for record in records:
+            for action, planned, actual in record.segments:
+                actions.setdefault(action, []).append((planned, actual))
+
+        completed = [record.trace for record in records if record.trace.completed]
+        return {
+            "sends": len(records),
+            "completed": len(completed),
+            "inputs": sum(len(record.trace.actual) for record in records),
+            "jitter": distribution(
+                error for record in records for error in record.trace.errors
+            ),
+            "overshoot": distribution(
+                trace.actual_duration - trace.planned_duration for trace in completed
+            ),
+            "loop_lag": distribution(
+                lag for record in records for lag in record.trace.lags
+            ),
+            "actions": {
+                action: {
+                    "count": len(durations),
+                    "planned": sum(planned for planned, _ in durations),
+                    "actual": sum(actual for _, actual in durations),
+                    "overshoot": distribution(
+                        actual - planned for planned, actual in durations
+                    ),
+                }
+                for action, durations in sorted(actions.items())
+            },
+        }
+
+    def dump(self, path: str) -> dict:
+        """
+        Writes the report to path as JSON. The file is replaced atomically.
+        :return: The report.
+        """
+        report = self.report()
+        self._write(path, report)
+        return report
+
+    async def dump_async(self, path: str) -> dict:
+        """
+        Same as dump, but the file is written in a thread. The report is computed on
+        the calling thread, where sends are recorded.
+        :return: The report.
+        """
+        report = self.report()
+        await asyncio.to_thread(self._write, path, report)
+        return report
+
+    def _write(self, path: str, report: dict) -> None:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            json.dump(report, f, indent=2)
+        os.replace(f.name, path)
+        logger.log(LOG_LEVEL, f"Input timing dumped to {path}.")
+
+
+def distribution(values: Iterable[float]) -> dict:
+    """
+    :return: Count, mean, extremes and quantiles (nearest-rank) of the values.
+    """
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+    count = len(values)
+    return {
+        "count": count,
+        "min": values[0],
+        "mean": sum(values) / count,
+        "max": values[-1],
+        **{
+            f"p{q * 100:g}": values[max(math.ceil(q * count), 1) - 1]
+            for q in EXPORTED_QUANTILES
+        },
+    }
+
+
+INPUT_TIMING = InputTimingRecorder()
@@ -27,24 +27,6 @@ def _random_delay():
 random_delay = _random_delay()
 
 
-def _get_asyncio_overhead():
-    import timeit
-    import asyncio
-
-    actuals = []
-
-    async def _measure_delay():
-        actuals.append(next(random_delay))
-        await asyncio.sleep(actuals[-1])
-
-    def _main():
-        asyncio.run(_measure_delay())
-
-    return timeit.timeit(_main, number=50) / 50 - sum(actuals) / len(actuals)
-
-
-OVERHEAD: float = _get_asyncio_overhead()
-
 KEYBOARD_MAPPING = {
     "alt": win32con.VK_MENU,
     # Or win32con.VK_RMENU, but Spy++ shows that the game uses the VK_MENU instead.
@@ -124,10 +106,10 @@ def _setup_exported_functions() -> dict[str, callable]:
         wintypes.LPARAM,
     ]
 
-    # Note - The argtypes of SendInput is defined in each function call,
-    # since the array length may change at each call.
+    # Inputs are passed as a pointer to the first Input of a (possibly larger) array
     send_input = ctypes.windll.user32.SendInput
     send_input.restype = wintypes.UINT
+    send_input.argtypes = [wintypes.UINT, ctypes.c_void_p, wintypes.INT]
 
     return {
         "MapVirtualKeyExW": map_virtual_key,
@@ -155,6 +137,20 @@ def _get_virtual_key(key: str, case_sensitive: bool, layout: wintypes.HKL) -> in
         return KEYBOARD_MAPPING[key]
 
 
+@lru_cache(maxsize=None)
+def _key_codes(key: str, layout: wintypes.HKL) -> tuple[int, int]:
+    """
+    :param key: String representation of the key to be pressed.
+    :param layout: Handle to the keyboard layout of the window.
+    :return: Virtual key code and scan code associated with the key.
+    """
+    vk_key = _get_virtual_key(key, False, layout)
+    scan_code = _EXPORTED_FUNCTIONS["MapVirtualKeyExW"](
+        vk_key, MAPVK_VK_TO_VSC_EX, layout
+    )
+    return vk_key, scan_code
+
+
 @lru_cache
 def _keyboard_layout_handle(hwnd: int) -> wintypes.HKL:
     """
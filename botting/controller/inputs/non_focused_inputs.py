@@ -1,12 +1,12 @@
 """
 Low-level module that handles sending inputs to any window through PostMessage().
 """
-import asyncio
 import logging
 import win32con
 
 from ctypes import wintypes
 
+from .input_dispatcher import dispatch
 from .inputs_helpers import (
     EXTENDED_KEYS,
     _EXPORTED_FUNCTIONS,
@@ -26,9 +26,7 @@ async def non_focused_input(
     delays: list[float],
 ) -> None:
     try:
-        for i in range(len(messages)):
-            _post_message(messages[i])
-            await asyncio.sleep(delays[i])
+        await dispatch(messages, delays, _post_message)
     except Exception as e:
         raise e
 
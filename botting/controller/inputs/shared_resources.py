@@ -1,10 +1,11 @@
-import asyncio
 import ctypes
 import functools
 import logging
 
 from win32gui import GetForegroundWindow, SetForegroundWindow
 
+from .focus_arbiter import FocusArbiter
+
 logger = logging.getLogger(__name__)
 
 MOUSE = 0
@@ -15,37 +16,38 @@ HARDWARE = 2
 class SharedResources:
     """
     Helper class shared across all spawned processes.
-    Manages a Lock to prevent multiple processes from trying to use PC Focus
-    simultaneously.
+    Manages a FocusArbiter to prevent multiple tasks from trying to use PC Focus
+    for different windows simultaneously.
     Additionally, it maintains a set of all keys that have been sent through SendInput
     during the lifecycle of the program. This set is used to inspect keys that may
     require releasing before a switch of window focus is performed.
     """
 
-    focus_lock = asyncio.Lock()  # All instances of this class will share the same lock.
-    # Used to prevent multiple processes from trying to use PC Focus simultaneously.
+    focus = FocusArbiter()  # All instances of this class will share the same arbiter.
+    # Used to prevent multiple tasks from trying to use PC Focus simultaneously.
 
     keys_sent = set()
 
     @classmethod
     def requires_focus(cls, func: callable) -> callable:
         """
-        Use this decorator to ensure a lock is acquired for any coroutine that
+        Use this decorator to ensure the focus is granted for any coroutine that
         require the PC focus (foreground window).
-        :return: The function after the acquiring the lock.
+        The first argument of the coroutine must be the window handle.
+        :return: The function after the focus is granted.
         """
 
         @functools.wraps(func)
-        async def inner(*args, **kwargs):
+        async def inner(hwnd: int, *args, **kwargs):
             """
-            Lock is required to prevent multiple tasks or processes from trying
+            Focus is required to prevent multiple tasks or processes from trying
              to use PC Focus simultaneously.
             """
-            await cls.focus_lock.acquire()
+            await cls.focus.acquire(hwnd)
             try:
-                res = await func(*args, **kwargs)
+                res = await func(hwnd, *args, **kwargs)
             finally:
-                cls.focus_lock.release()
+                cls.focus.release(hwnd)
             return res
 
         return inner
@@ -1,8 +1,31 @@
-from .action_data import ActionRequest, ActionWithValidation, DiscordRequest
+from .action_codec import PROCEDURES, ActionPipe, ProcedureRegistry
+from .action_data import (
+    ActionRequest,
+    ActionResult,
+    ActionWithValidation,
+    DiscordRequest,
+)
 from .async_task_manager import AsyncTaskManager
+from .attribute_history import (
+    AttributeHistory,
+    HashHistory,
+    LastValidHistory,
+    NoHistory,
+    ThumbnailHistory,
+    ValuesHistory,
+)
+from .attribute_metrics import (
+    AttributeMetrics,
+    LatencyHistogram,
+    MetricsExporter,
+    MetricsSnapshot,
+)
 from .bot import Bot
 from .bot_data import BotData
+from .control_channel import CONTROL_CHANNEL, ControlChannel, ControlCommand
 from .decision_maker import DecisionMaker
 from .engine import Engine
+from .pending_actions import PENDING_ACTIONS, PendingActions
 from .peripherals_process import PeripheralsProcess
 from .session_manager import SessionManager
+from .shared_primitives import SHARED_PRIMITIVES, SharedPrimitive, SharedPrimitives
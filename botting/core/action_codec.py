@@ -0,0 +1,308 @@
+"""
+Compact wire format for ActionRequests sent from Engines to the MainProcess.
+Pickling a full ActionRequest includes the dataclass itself, every default field,
+bound methods along with their instance, and functools.partial wrappers. Instead,
+requests are encoded into a tuple carrying an opcode, the identifier and packed
+arguments:
+- Procedures registered in PROCEDURES are sent as their opcode only.
+- KeyboardInputWrapper.send is sent as its keys, events and an array of delays.
+- ActionWithValidation wrappers are sent as the opcode of the wrapped procedure,
+  along with the condition and timeout.
+- Images within DiscordRequests are PNG-encoded.
+Any other procedure is pickled as before. Encoded messages are decoded back into
+ActionRequests by the MainProcess.
+"""
+import asyncio
+import cv2
+import logging
+import multiprocessing.connection
+import numpy as np
+import zlib
+
+from array import array
+from functools import partial
+from typing import Any, Callable, NamedTuple
+
+from botting import controller
+from botting.controller import KeyboardInputWrapper
+from .action_data import ActionRequest, ActionWithValidation, DiscordRequest
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+WIRE_TAG = "AR1"  # First element of every encoded request
+
+# Reserved opcodes. Registered procedures use opcodes above those.
+OP_PICKLED = 0
+OP_KEYBOARD = 1
+OP_VALIDATED = 2
+_RESERVED = 16
+
+# Flags packed along with the priority
+_CANCELS_ITSELF = 1
+_REQUEUE = 2
+_BLOCK_LOWER = 4
+_LOG = 8
+_FLAG_BITS = 4
+
+# Optional fields, sent only when they differ from their default value
+_OPTIONAL_FIELDS = (
+    "cancel_tasks",
+    "callbacks",
+    "cancel_callback",
+    "discord_request",
+    "args",
+    "kwargs",
+    "max_age",
+    "deadline",
+    "correlation_id",
+)
+
+# Fastest compression level, since game frames are mostly flat regions anyway
+_PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+
+class ProcedureRegistry:
+    """
+    Maps procedures to opcodes. Opcodes are derived from the qualified name of each
+    procedure, such that they are identical in every process without requiring
+    procedures to be registered in the same order.
+    Procedures must be registered at import time, in a module imported by both the
+    Engines and the MainProcess.
+    """
+
+    def __init__(self) -> None:
+        self._opcodes: dict[Callable, int] = {}
+        self._procedures: dict[int, Callable] = {}
+
+    def __contains__(self, procedure: Callable) -> bool:
+        return procedure in self._opcodes
+
+    def __len__(self) -> int:
+        return len(self._procedures)
+
+    @staticmethod
+    def name_of(procedure: Callable) -> str:
+        return f"{procedure.__module__}.{procedure.__qualname__}"
+
+    def register(self, procedure: Callable) -> Callable:
+        """
+        Registers a procedure. Can be used as a decorator (below @staticmethod).
+        :param procedure: A module-level function or a static method.
+        :return: The procedure itself.
+        """
+        name = self.name_of(procedure)
+        opcode = _RESERVED + zlib.crc32(name.encode())
+        existing = self._procedures.get(opcode)
+        if existing is not None and existing is not procedure:
+            raise ValueError(f"Opcode of {name} collides with {existing}.")
+        self._opcodes[procedure] = opcode
+        self._procedures[opcode] = procedure
+        logger.log(LOG_LEVEL, f"Registered {name} under opcode {opcode}.")
+        return procedure
+
+    def opcode(self, procedure: Callable) -> int | None:
+        try:
+            return self._opcodes.get(procedure)
+        except TypeError:  # Unhashable callable
+            return None
+
+    def procedure(self, opcode: int) -> Callable:
+        try:
+            return self._procedures[opcode]
+        except KeyError:
+            raise KeyError(f"No procedure registered under opcode {opcode}.")
+
+
+PROCEDURES = ProcedureRegistry()
+
+
+class PackedInputs(NamedTuple):
+    """
+    KeyboardInputWrapper without its dataclass envelope, and with delays packed as
+    an array of doubles. Keys and events are sent as is: pickle already memoizes
+    repeated strings, and packing them into index arrays costs more to build than
+    it saves in size.
+    """
+
+    handle: int
+    keys: list
+    events: list
+    delays: bytes
+    forced_key_releases: list[str]
+    actions: list[tuple[str, int]]
+
+    @classmethod
+    def pack(cls, inputs: KeyboardInputWrapper) -> "PackedInputs":
+        return cls(
+            inputs.handle,
+            inputs.keys,
+            inputs.events,
+            inputs.delays.tobytes(),
+            inputs.forced_key_releases,
+            inputs.actions,
+        )
+
+    def unpack(self) -> KeyboardInputWrapper:
+        delays = array("d")
+        delays.frombytes(self.delays)
+        return KeyboardInputWrapper(
+            self.handle,
+            self.keys,
+            self.events,
+            delays,
+            self.forced_key_releases,
+            self.actions,
+        )
+
+
+class PackedImage(NamedTuple):
+    png: bytes
+
+    @classmethod
+    def pack(cls, img: np.ndarray) -> "PackedImage":
+        return cls(cv2.imencode(".png", img, _PNG_PARAMS)[1].tobytes())
+
+    def unpack(self) -> np.ndarray:
+        return cv2.imdecode(np.frombuffer(self.png, np.uint8), cv2.IMREAD_UNCHANGED)
+
+
+def encode(request: ActionRequest) -> tuple:
+    """
+    :param request: The ActionRequest to send.
+    :return: The encoded request, which is a tuple of builtin types.
+    """
+    flags = (
+        request.cancels_itself * _CANCELS_ITSELF
+        | request.requeue_if_not_scheduled * _REQUEUE
+        | request.block_lower_priority * _BLOCK_LOWER
+        | request.log * _LOG
+    )
+    opcode, payload = _encode_procedure(request.procedure)
+    optional = {}
+    for name in _OPTIONAL_FIELDS:
+        value = getattr(request, name)
+        if value:
+            optional[name] = value
+    if "args" in optional:
+        optional["args"] = tuple(_pack_value(arg) for arg in request.args)
+    if "max_age" in optional:
+        optional["created_at"] = request.created_at  # Age counts from the Engine
+    if "discord_request" in optional and request.discord_request.img is not None:
+        optional["discord_request"] = (
+            request.discord_request.msg,
+            PackedImage.pack(request.discord_request.img),
+        )
+    return (
+        WIRE_TAG,
+        opcode,
+        request.identifier,
+        request.ign,
+        request.priority << _FLAG_BITS | flags,
+        payload,
+        optional or None,
+    )
+
+
+def decode(message: tuple) -> ActionRequest:
+    """
+    :param message: A tuple produced by encode().
+    :return: The equivalent ActionRequest.
+    """
+    _, opcode, identifier, ign, header, payload, optional = message
+    optional = optional or {}
+    if "args" in optional:
+        optional["args"] = tuple(_unpack_value(arg) for arg in optional["args"])
+    if isinstance(optional.get("discord_request"), tuple):
+        msg, img = optional["discord_request"]
+        optional["discord_request"] = DiscordRequest(msg, img.unpack())
+    return ActionRequest(
+        identifier,
+        _decode_procedure(opcode, payload),
+        ign,
+        priority=header >> _FLAG_BITS,
+        cancels_itself=bool(header & _CANCELS_ITSELF),
+        requeue_if_not_scheduled=bool(header & _REQUEUE),
+        block_lower_priority=bool(header & _BLOCK_LOWER),
+        log=bool(header & _LOG),
+        **optional,
+    )
+
+
+def is_encoded(message: Any) -> bool:
+    return isinstance(message, tuple) and len(message) == 7 and message[0] == WIRE_TAG
+
+
+def _encode_procedure(procedure: Callable) -> tuple[int, Any]:
+    if isinstance(getattr(procedure, "__self__", None), KeyboardInputWrapper):
+        if procedure.__func__ is KeyboardInputWrapper.send:
+            return OP_KEYBOARD, PackedInputs.pack(procedure.__self__)
+    elif (
+        isinstance(procedure, partial)
+        and procedure.func is ActionWithValidation._wrapped_procedure
+        and not procedure.keywords
+    ):
+        wrapped, condition, timeout = procedure.args
+        return OP_VALIDATED, (*_encode_procedure(wrapped), condition, timeout)
+
+    opcode = PROCEDURES.opcode(procedure)
+    if opcode is not None:
+        return opcode, None
+    return OP_PICKLED, procedure
+
+
+def _decode_procedure(opcode: int, payload: Any) -> Callable:
+    if opcode == OP_PICKLED:
+        return payload
+    elif opcode == OP_KEYBOARD:
+        return payload.unpack().send
+    elif opcode == OP_VALIDATED:
+        wrapped_opcode, wrapped_payload, condition, timeout = payload
+        return partial(
+            ActionWithValidation._wrapped_procedure,
+            _decode_procedure(wrapped_opcode, wrapped_payload),
+            condition,
+            timeout,
+        )
+    return PROCEDURES.procedure(opcode)
+
+
+def _pack_value(value: Any) -> Any:
+    if isinstance(value, KeyboardInputWrapper):
+        return PackedInputs.pack(value)
+    return value
+
+
+def _unpack_value(value: Any) -> Any:
+    if isinstance(value, PackedInputs):
+        return value.unpack()
+    return value
+
+
+class ActionPipe:
+    """
+    Engine-side wrapper of the Connection to the MainProcess.
+    ActionRequests are encoded when sent. Everything else is sent as is.
+    """
+
+    def __init__(self, connection: multiprocessing.connection.Connection) -> None:
+        self.connection = connection
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.connection, item)
+
+    def send(self, obj: Any) -> None:
+        if isinstance(obj, ActionRequest):
+            obj = encode(obj)
+        self.connection.send(obj)
+
+
+for _procedure in (
+    asyncio.sleep,
+    controller.click,
+    controller.mouse_move,
+    controller.mouse_move_and_click,
+    controller.press,
+    controller.write,
+):
+    PROCEDURES.register(_procedure)
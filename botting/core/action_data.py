@@ -5,6 +5,9 @@ import multiprocessing.managers
 import numpy as np
 from dataclasses import field, dataclass
 from functools import partial
+from typing import Any, Literal
+
+from .pending_actions import PENDING_ACTIONS
 
 
 @dataclass
@@ -35,14 +38,44 @@ class ActionRequest:
     # Used to block lower priority tasks from being scheduled
     block_lower_priority: bool = field(default=False)
 
+    # Requests built from a snapshot of the game (e.g. a movement planned from the
+    # current minimap position) become obsolete. Once older than max_age seconds or
+    # past their deadline (time.time()), requests are dropped instead of scheduled.
+    max_age: float = field(default=None)
+    deadline: float = field(default=None)
+    created_at: float = field(default_factory=time.time, compare=False, repr=False)
+
     callbacks: list[callable] = field(default_factory=list)
     cancel_callback: callable = field(default=None)
     task: asyncio.Task = field(default=None, init=False)
+
+    # Set by PendingActions when the Engine awaits the outcome of the request.
+    # The MainProcess then sends an ActionResult back through reply.
+    correlation_id: int = field(default=None)
+    reply: callable = field(default=None, init=False, compare=False, repr=False)
+    # Set by the MainProcess when first queued (time.perf_counter_ns)
+    received_at: int = field(default=None, init=False, compare=False, repr=False)
     discord_request: "DiscordRequest" = field(default=None)
     log: bool = field(default=False)
     args: tuple = field(default_factory=tuple)
     kwargs: dict = field(default_factory=dict)
 
+    @property
+    def expires_at(self) -> float | None:
+        """
+        :return: The time.time() at which the request expires, if any.
+        """
+        if self.max_age is None:
+            return self.deadline
+        expires_at = self.created_at + self.max_age
+        return expires_at if self.deadline is None else min(expires_at, self.deadline)
+
+    def expired(self, now: float = None) -> bool:
+        expires_at = self.expires_at
+        if expires_at is None:
+            return False
+        return (time.time() if now is None else now) > expires_at
+
     def __lt__(self, other):
         """
         Used by the PriorityQueue to determine the order of tasks.
@@ -64,6 +97,22 @@ class ActionRequest:
         return self.priority < other.priority
 
 
+@dataclass(frozen=True)
+class ActionResult:
+    """
+    Outcome of an ActionRequest, sent by the MainProcess to the Engine which awaits
+    it. Requests which never run (expired, superseded or blocked) are reported with
+    that status.
+    """
+
+    correlation_id: int
+    status: Literal[
+        "completed", "cancelled", "failed", "expired", "superseded", "blocked"
+    ]
+    value: Any = field(default=None)
+    error: BaseException = field(default=None)
+
+
 @dataclass
 class DiscordRequest:
     msg: str
@@ -109,14 +158,28 @@ class ActionWithValidation:
         This must be called from within an Engine process.
         Does not block the Engine process, but instead schedules the action to be
         executed asynchronously.
+        Each trial awaits the result of the action sent back by the MainProcess,
+        such that the Condition is not used.
         :param action:
         :return:
         """
-        action.procedure = self._wrap(action.procedure)
+        action.procedure = partial(
+            self._wrapped_procedure, action.procedure, None, self.timeout
+        )
         now = time.perf_counter()
 
         while not self.validator():
-            await asyncio.to_thread(self._send_and_wait, action, now)
+            remaining = self.timeout - (time.perf_counter() - now)
+            try:
+                await asyncio.wait_for(
+                    PENDING_ACTIONS.submit(self.pipe, action), max(remaining, 0)
+                )
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(f"{action.identifier} failed validation") from e
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise  # The DecisionMaker itself is cancelled
+                # Otherwise the action did not run (e.g. blocked), which is a trial
             self._check_for_trials(action)
 
     def _send_and_wait(self, action: ActionRequest, started_at: float) -> None:
@@ -160,6 +223,8 @@ class ActionWithValidation:
 
     @staticmethod
     async def _conditional_procedure(procedure: callable, condition, *args, **kwargs):
+        if condition is None:
+            return await procedure(*args, **kwargs)
         while True:
             if not condition.acquire(timeout=0.1):
                 await asyncio.sleep(0.1)
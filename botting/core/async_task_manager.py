@@ -1,42 +1,126 @@
 import asyncio
 import logging
 import multiprocessing.connection
+import pickle
+import time
 
-from .action_data import ActionRequest
+from dataclasses import dataclass, field
+from functools import partial
+
+from .action_data import ActionRequest, ActionResult
+from .attribute_metrics import LatencyHistogram
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.INFO
 
 MAX_CONCURRENT_TASKS = 30
+GLOBAL_LANE = "All"  # Requests of this lane concern all clients (e.g. kill, pause)
+
+
+@dataclass(slots=True)
+class SchedulingMetrics:
+    """
+    Latencies of the requests sharing an identifier, in nanoseconds.
+    queue_wait: From reception by the MainProcess until scheduled (parked time
+    included).
+    dispatch: From scheduled until the procedure actually starts running.
+    """
+
+    queue_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    dispatch: LatencyHistogram = field(default_factory=LatencyHistogram)
+    parked: int = 0
+    superseded: int = 0
+    expired: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.queue_wait.count} scheduled, {self.parked} parked, "
+            f"{self.superseded} superseded, {self.expired} expired. "
+            f"Queue wait p50/p99: "
+            f"{self.queue_wait.percentile(50) / 1e6:.2f}/"
+            f"{self.queue_wait.percentile(99) / 1e6:.2f} ms. Dispatch p50/p99: "
+            f"{self.dispatch.percentile(50) / 1e6:.2f}/"
+            f"{self.dispatch.percentile(99) / 1e6:.2f} ms."
+        )
+
+
+@dataclass(slots=True)
+class Lane:
+    """
+    Scheduling state of a single client (Bot). Priorities only block lower
+    priority requests within the same lane, such that clients do not serialize on
+    each other. Inputs of different clients are arbitrated by the FocusArbiter.
+    The exception is the GLOBAL_LANE, whose priorities block every lane, and whose
+    requests are blocked by the priorities of every lane.
+    """
+
+    running: dict[str, ActionRequest] = field(default_factory=dict)
+    parked: dict[int, list[ActionRequest]] = field(default_factory=dict)
+
+    @property
+    def blocking_priority(self) -> int:
+        """
+        :return: The highest priority of all running tasks that prevents lower
+        priorities from being scheduled.
+        """
+        return max(
+            (r.priority for r in self.running.values() if r.block_lower_priority),
+            default=0,
+        )
+
+
+class _ReceptionQueue(asyncio.PriorityQueue):
+    """
+    Stamps requests with the time at which they are first received.
+    """
+
+    def _put(self, item: ActionRequest | None) -> None:
+        if item is not None and item.received_at is None:
+            item.received_at = time.perf_counter_ns()
+        super()._put(item)
 
 
 class AsyncTaskManager:
     """
     Main Process class for managing asynchronous tasks.
     Task priority, scheduling, and cancellations are handled here.
+    Requests are dispatched as soon as they are received. Each client (IGN) has its
+    own Lane. Requests blocked by a higher priority task of their lane are parked,
+    keyed on the priority blocking them, and re-queued as soon as that priority no
+    longer blocks. A parked request is superseded by any newer request with the same
+    identifier that cancels itself. Expired requests are dropped whenever they come
+    up for scheduling, including when woken up.
+    The outcome of requests awaited by their Engine (those with a correlation id) is
+    sent back to that Engine as an ActionResult.
     """
 
     _event_loop_overflow = MAX_CONCURRENT_TASKS
-    _throttle = 0.1
 
     def __init__(self, discord_pipe: multiprocessing.connection.Connection) -> None:
-        self.queue = asyncio.PriorityQueue()
+        self.queue = _ReceptionQueue()
         self.running_tasks: dict[str, ActionRequest] = {}
         self.discord_pipe = discord_pipe
+        self.lanes: dict[str, Lane] = {}
+        self.metrics: dict[str, SchedulingMetrics] = {}
 
     async def start(self) -> None:
-        while True:
-            await asyncio.sleep(self._throttle)
-            action_request: ActionRequest = await self.queue.get()
-            if action_request is None:
-                logger.info("Received None from the queue. Exiting Task Manager.")
-                break
+        try:
+            while True:
+                action_request: ActionRequest = await self.queue.get()
+                if action_request is None:
+                    logger.info("Received None from the queue. Exiting Task Manager.")
+                    break
 
-            await self._process_request(action_request)
-            self._check_for_event_loop_overflow()
-            self._check_for_queue_overflow()
+                await self._process_request(action_request)
+                self._check_for_event_loop_overflow()
+                self._check_for_queue_overflow()
+        finally:
+            self._log_metrics()
 
     async def _process_request(self, request: ActionRequest) -> None:
+        if request.expired():
+            self._drop(request)
+            return
         if request.identifier in self.running_tasks:
             self._handle_duplicate_request(request)
         await self._handle_priority(request)
@@ -56,32 +140,94 @@ class AsyncTaskManager:
             )
 
     async def _handle_priority(self, request: ActionRequest) -> None:
-        if request.priority >= self._get_priority_blocking():
+        if request.priority >= self._blocking_priority(request.ign):
             if request.log:
                 logger.log(LOG_LEVEL, f"{request.identifier} has been scheduled.")
             await self._schedule_task(request)
         elif request.requeue_if_not_scheduled:
             if request.log:
-                logger.log(LOG_LEVEL, f"{request.identifier} has been re-queued.")
-            # Self-inflicted delay to avoid infinite re-queueing
-            asyncio.get_running_loop().call_later(1.0, self.queue.put_nowait, request)
-            # await self.queue.put(request)
+                logger.log(LOG_LEVEL, f"{request.identifier} has been parked.")
+            self._park(request)
         else:
             logger.log(
                 logging.INFO,
                 f"{request.identifier} has been blocked by higher priority tasks.",
             )
+            self._reply(request, "blocked")
 
-    def _get_priority_blocking(self) -> int:
+    def _drop(self, request: ActionRequest) -> None:
         """
-        :return: The highest priority of all running tasks that prevents lower priorities
-        from being scheduled.
+        Drops an expired request. It never runs, but its callbacks are called such
+        that the resources it holds (e.g. Locks) are released.
         """
+        self._metrics(request.identifier).expired += 1
+        if request.log:
+            logger.log(LOG_LEVEL, f"{request.identifier} has expired.")
+        for cb in request.callbacks:
+            cb()
+        self._reply(request, "expired")
+
+    def _lane(self, ign: str) -> Lane:
+        lane = self.lanes.get(ign)
+        if lane is None:
+            lane = self.lanes[ign] = Lane()
+        return lane
+
+    def _blocking_priority(self, ign: str) -> int:
+        if ign == GLOBAL_LANE:
+            return max(
+                (lane.blocking_priority for lane in self.lanes.values()), default=0
+            )
+        global_lane = self.lanes.get(GLOBAL_LANE)
         return max(
-            (r.priority for r in self.running_tasks.values() if r.block_lower_priority),
-            default=0,
+            self._lane(ign).blocking_priority,
+            0 if global_lane is None else global_lane.blocking_priority,
         )
 
+    def _park(self, request: ActionRequest) -> None:
+        """
+        Parks a blocked request until the priority blocking it is released.
+        Any parked request superseded by this one never runs, but its callbacks are
+        called such that the resources it holds (e.g. Locks) are released.
+        """
+        lane = self._lane(request.ign)
+        metrics = self._metrics(request.identifier)
+        metrics.parked += 1
+        if request.cancels_itself:
+            for requests in lane.parked.values():
+                for former in requests:
+                    if former.identifier == request.identifier:
+                        requests.remove(former)
+                        metrics.superseded += 1
+                        for cb in former.callbacks:
+                            cb()
+                        self._reply(former, "superseded")
+                        break
+        lane.parked.setdefault(self._blocking_priority(request.ign), []).append(request)
+
+    def _wake_parked(self, ign: str) -> None:
+        """
+        Re-queues the parked requests which are no longer blocked, following the
+        completion of a task in the lane of ign. Since the GLOBAL_LANE blocks (and is
+        blocked by) every lane, all lanes concerned are woken up.
+        """
+        if ign == GLOBAL_LANE:
+            for other in list(self.lanes):
+                self._wake_lane(other)
+        else:
+            self._wake_lane(ign)
+            if GLOBAL_LANE in self.lanes:
+                self._wake_lane(GLOBAL_LANE)
+
+    def _wake_lane(self, ign: str) -> None:
+        lane = self.lanes[ign]
+        if not lane.parked:
+            return
+        blocking = self._blocking_priority(ign)
+        for level in [level for level in lane.parked if level > blocking]:
+            for request in lane.parked.pop(level):
+                self.queue.put_nowait(request)
+
     async def _schedule_task(self, request: ActionRequest) -> None:
         for task in request.cancel_tasks:
             if task in self.running_tasks:
@@ -95,33 +241,79 @@ class AsyncTaskManager:
             if request.discord_request.img is not None:
                 self.discord_pipe.send(request.discord_request.img)
 
+        scheduled_at = time.perf_counter_ns()
+        metrics = self._metrics(request.identifier)
+        if request.received_at is not None:
+            metrics.queue_wait.record(scheduled_at - request.received_at)
         request.task = asyncio.create_task(
-            request.procedure(*request.args, **request.kwargs), name=request.identifier
+            self._dispatch(request, scheduled_at, metrics), name=request.identifier
         )
-        request.task.add_done_callback(self._cleanup_handler)
+        request.task.add_done_callback(partial(self._cleanup_handler, request))
         if request.callbacks:
             for cb in request.callbacks:
                 request.task.add_done_callback(self.cb_wrapper(cb))
         if request.cancel_callback is not None:
             request.task.add_done_callback(request.cancel_callback)
         self.running_tasks[request.identifier] = request
+        self._lane(request.ign).running[request.identifier] = request
+
+    @staticmethod
+    async def _dispatch(
+        request: ActionRequest, scheduled_at: int, metrics: SchedulingMetrics
+    ):
+        metrics.dispatch.record(time.perf_counter_ns() - scheduled_at)
+        return await request.procedure(*request.args, **request.kwargs)
+
+    def _metrics(self, identifier: str) -> SchedulingMetrics:
+        metrics = self.metrics.get(identifier)
+        if metrics is None:
+            metrics = self.metrics[identifier] = SchedulingMetrics()
+        return metrics
+
+    def _log_metrics(self) -> None:
+        for identifier, metrics in sorted(self.metrics.items()):
+            logger.log(LOG_LEVEL, f"{identifier}: {metrics.summary()}")
+
+    @staticmethod
+    def _reply(request: ActionRequest, status: str, value=None, error=None) -> None:
+        """
+        Sends the outcome of the request to the Engine awaiting it, if any.
+        """
+        if request.reply is None:
+            return
+        result = ActionResult(request.correlation_id, status, value, error)
+        try:
+            request.reply(result)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Results which can't be pickled are reduced to their representation
+            error = None if error is None else RuntimeError(repr(error))
+            request.reply(ActionResult(request.correlation_id, status, None, error))
+        except OSError:
+            logger.warning(f"Could not send {result}: the Engine pipe is closed.")
 
-    def _cleanup_handler(self, fut):
-        # TODO - Handling of future result back to the DecisionMaker
+    def _cleanup_handler(self, request: ActionRequest, fut: asyncio.Task):
         try:
             exception = fut.exception()
             if exception:
                 logger.error(
                     f"Exception occurred in task {fut.get_name()}: {exception}"
                 )
+                self._reply(request, "failed", error=exception)
                 self.queue.put_nowait(None)
                 raise exception
+            self._reply(request, "completed", fut.result())
         except asyncio.CancelledError:
-            pass
+            self._reply(request, "cancelled")
         except Exception:
             raise
         finally:
-            self.running_tasks.pop(fut.get_name(), None)
+            # A task cancelled by a newer one with the same identifier must not
+            # remove the newer one.
+            lane = self._lane(request.ign)
+            for running in (self.running_tasks, lane.running):
+                if running.get(request.identifier) is request:
+                    del running[request.identifier]
+            self._wake_parked(request.ign)
 
     def _check_for_event_loop_overflow(self):
         """
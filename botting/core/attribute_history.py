@@ -0,0 +1,217 @@
+"""
+Retention policies for the previous values of BotData attributes.
+Keeping the last N values is cheap for small values (positions, boxes), but not for
+images. Each attribute can therefore define how much of its history is retained.
+"""
+import hashlib
+import pickle
+import sys
+import numpy as np
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Iterator
+
+N_RET_VALUES = 10
+
+
+def is_valid(value: Any) -> bool:
+    """
+    None, empty containers and arrays that are empty or entirely zero are invalid.
+    Checks are made based on the type of the value, such that values are never
+    compared against other types (which is costly for arrays).
+    """
+    if value is None:
+        return False
+    elif isinstance(value, np.ndarray):
+        return bool(value.any())
+    elif isinstance(value, (str, list, dict, set, frozenset)):
+        return len(value) > 0
+    return True
+
+
+def equals(value: Any, other: Any) -> bool:
+    if value is other:
+        return True
+    elif isinstance(value, np.ndarray) or isinstance(other, np.ndarray):
+        return np.array_equal(value, other)
+    return value == other
+
+
+def size_of(value: Any) -> int:
+    """
+    Estimates the memory used by a value, in bytes. Arrays are measured exactly,
+    containers include the size of their direct elements.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        size += sum(size_of(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(size_of(k) + size_of(v) for k, v in value.items())
+    return size
+
+
+class AttributeHistory(ABC):
+    """
+    Base class for all history policies. Values are appended after each update.
+    """
+
+    @abstractmethod
+    def append(self, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Iterates over the retained entries, from oldest to most recent.
+        """
+        pass
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, value: Any) -> bool:
+        return any(equals(entry, value) for entry in self)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} entries)"
+
+    def last_valid(self) -> Any:
+        """
+        :return: The most recent valid entry, or None.
+        """
+        for entry in reversed(list(self)):
+            if entry is not None and is_valid(entry):
+                return entry
+
+    def memory_usage(self, exclude: set[int] = frozenset()) -> int:
+        """
+        :param exclude: ids of objects already accounted for elsewhere (such as the
+         current value of the attribute), which are then not counted twice.
+        :return: Estimated memory (bytes) used by the retained entries.
+        """
+        counted = set(exclude)
+        total = 0
+        for entry in self:
+            if id(entry) not in counted:
+                counted.add(id(entry))
+                total += size_of(entry)
+        return total
+
+
+class NoHistory(AttributeHistory):
+    """
+    Nothing is retained.
+    """
+
+    def append(self, value: Any) -> None:
+        pass
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(())
+
+
+class ValuesHistory(AttributeHistory):
+    """
+    The last N values are retained. This is the default policy.
+    """
+
+    def __init__(self, max_len: int = N_RET_VALUES) -> None:
+        self._values = deque(maxlen=max_len)
+
+    def append(self, value: Any) -> None:
+        self._values.append(value)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def last_valid(self) -> Any:
+        for value in reversed(self._values):
+            if value is not None and is_valid(value):
+                return value
+
+
+class LastValidHistory(AttributeHistory):
+    """
+    Only the most recent valid value is retained. When the current value is valid,
+    this is a reference to it and no additional memory is used.
+    """
+
+    def __init__(self) -> None:
+        self._value = None
+
+    def append(self, value: Any) -> None:
+        if value is not None and is_valid(value):
+            self._value = value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(() if self._value is None else (self._value,))
+
+    def last_valid(self) -> Any:
+        return self._value
+
+
+class HashHistory(AttributeHistory):
+    """
+    Only digests of the last N values are retained, which allows to know whether
+    (and when) values changed without keeping them. No value can be recovered.
+    """
+
+    def __init__(self, max_len: int = N_RET_VALUES) -> None:
+        self._digests = deque(maxlen=max_len)
+
+    @staticmethod
+    def digest(value: Any) -> bytes:
+        hasher = hashlib.blake2b(digest_size=8)
+        if isinstance(value, np.ndarray):
+            hasher.update(np.ascontiguousarray(value).data)
+            hasher.update(repr((value.shape, value.dtype.str)).encode())
+        else:
+            try:
+                hasher.update(pickle.dumps(value))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                hasher.update(repr(value).encode())
+        return hasher.digest()
+
+    def append(self, value: Any) -> None:
+        self._digests.append(self.digest(value))
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._digests)
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __contains__(self, value: Any) -> bool:
+        return self.digest(value) in self._digests
+
+    def last_valid(self) -> Any:
+        return None
+
+
+class ThumbnailHistory(ValuesHistory):
+    """
+    The last N values are retained, but images are downsampled (by keeping one pixel
+    out of every `step` along each axis). Other values are retained as is.
+    get_last_known_value therefore returns a thumbnail for image attributes.
+    """
+
+    def __init__(self, max_len: int = N_RET_VALUES, step: int = 8) -> None:
+        super().__init__(max_len)
+        self.step = step
+
+    def append(self, value: Any) -> None:
+        if isinstance(value, np.ndarray) and value.ndim >= 2:
+            value = value[:: self.step, :: self.step].copy()
+        super().append(value)
+
+    def __contains__(self, value: Any) -> bool:
+        if isinstance(value, np.ndarray) and value.ndim >= 2:
+            thumbnail = value[:: self.step, :: self.step]
+            return any(equals(entry, thumbnail) for entry in self._values)
+        return super().__contains__(value)
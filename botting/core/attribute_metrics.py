@@ -0,0 +1,321 @@
+"""
+Latency metrics of BotData attributes.
+Each attribute may record the duration of its updates and the age of its value when
+read (staleness), into log-linear histograms which preserve tail latencies at a
+constant relative precision. Metrics are collected within each Engine, periodically
+shipped to the MainProcess and exported there, such that thresholds can be tuned.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+NS_PER_SECOND = 1_000_000_000
+SUB_BUCKET_BITS = 7  # Relative precision of 1 / 2 ** (SUB_BUCKET_BITS - 1)
+EXPORTED_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of non-negative integer values (nanoseconds).
+    Values below 2 ** SUB_BUCKET_BITS are counted exactly. Above, each power of 2 is
+    split into 2 ** (SUB_BUCKET_BITS - 1) linear sub-buckets, such that the
+    relative error on any recorded value is bounded regardless of its magnitude.
+    Counts are stored sparsely, which keeps histograms small to ship across
+    processes.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    _SUB_BUCKETS = 2**SUB_BUCKET_BITS
+    _HALF = _SUB_BUCKETS // 2
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(count={self.count}, "
+            f"p50={self.percentile(50)}, max={self.max})"
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        if value < cls._SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return cls._SUB_BUCKETS + (shift - 1) * cls._HALF + (value >> shift) - cls._HALF
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> tuple[int, int]:
+        """
+        :return: The lowest and highest values counted in a bucket.
+        """
+        if index < cls._SUB_BUCKETS:
+            return index, index
+        shift, sub_bucket = divmod(index - cls._SUB_BUCKETS, cls._HALF)
+        lowest = (sub_bucket + cls._HALF) << (shift + 1)
+        return lowest, lowest + (1 << (shift + 1)) - 1
+
+    def record(self, value: int) -> None:
+        value = max(value, 0)
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if not other.count:
+            return
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.min = other.min if not self.count else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, percentile: float) -> int:
+        """
+        :param percentile: Between 0 and 100.
+        :return: The highest value equivalent to the given percentile, bounded by the
+         extreme values recorded. 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        target = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(max(self.bucket_bounds(index)[1], self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """
+        :return: A JSON-serializable summary, in seconds, along with the raw buckets
+         (lowest value in nanoseconds, count) such that histograms can be rebuilt.
+        """
+        return {
+            "count": self.count,
+            "min": self.min / NS_PER_SECOND,
+            "mean": self.mean / NS_PER_SECOND,
+            "max": self.max / NS_PER_SECOND,
+            **{
+                f"p{q * 100:g}": self.percentile(q * 100) / NS_PER_SECOND
+                for q in EXPORTED_QUANTILES
+            },
+            "buckets": [
+                [self.bucket_bounds(index)[0], self.counts[index]]
+                for index in sorted(self.counts)
+            ],
+        }
+
+
+@dataclass(slots=True)
+class AttributeMetrics:
+    """
+    Metrics recorded for a single attribute since the beginning of its window.
+    """
+
+    update_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    staleness: LatencyHistogram = field(default_factory=LatencyHistogram)
+    reads: int = 0
+    window_start_ns: int = field(default_factory=time.monotonic_ns)
+    window_ns: int = 0  # Duration of the window, set when the window is closed
+
+    def record_read(self, staleness_ns: int) -> None:
+        self.reads += 1
+        self.staleness.record(staleness_ns)
+
+    def close_window(self) -> "AttributeMetrics":
+        """
+        :return: The metrics of the current window. A new window is started.
+        """
+        now = time.monotonic_ns()
+        closed = AttributeMetrics(
+            self.update_latency, self.staleness, self.reads, self.window_start_ns
+        )
+        closed.window_ns = now - self.window_start_ns
+        self.update_latency = LatencyHistogram()
+        self.staleness = LatencyHistogram()
+        self.reads = 0
+        self.window_start_ns = now
+        return closed
+
+    @property
+    def read_rate(self) -> float:
+        """
+        :return: Reads per second over the window.
+        """
+        return self.reads / self.window_ns * NS_PER_SECOND if self.window_ns else 0.0
+
+    def merge(self, other: "AttributeMetrics") -> None:
+        self.update_latency.merge(other.update_latency)
+        self.staleness.merge(other.staleness)
+        self.reads += other.reads
+        self.window_ns += other.window_ns
+
+
+@dataclass(slots=True)
+class MetricsSnapshot:
+    """
+    Sent by an Engine to the MainProcess. Contains, for each bot, the metrics of its
+    attributes recorded since the previous snapshot.
+    """
+
+    engine: str
+    metrics: dict[str, dict[str, AttributeMetrics]]
+    thresholds: dict[str, dict[str, float | None]]
+
+
+class MetricsExporter:
+    """
+    Lives in MainProcess.
+    Aggregates the snapshots received from all Engines and writes them to disk, both
+    as JSON and in the Prometheus text exposition format. Histograms are cumulative
+    over the session, whereas read rates are those of the latest window.
+    Files are replaced atomically, such that readers never see partial exports.
+    Since all Engine listeners share the exporter, exports are rendered on the event
+    loop (where snapshots are added) and written one at a time in a thread.
+    """
+
+    def __init__(self, directory: str, filename: str = "BotData Metrics") -> None:
+        self.json_path = os.path.join(directory, f"{filename}.json")
+        self.prometheus_path = os.path.join(directory, f"{filename}.prom")
+        self.metrics: dict[str, dict[str, AttributeMetrics]] = {}
+        self.read_rates: dict[str, dict[str, float]] = {}
+        self.thresholds: dict[str, dict[str, float | None]] = {}
+        self._lock = asyncio.Lock()
+
+    def add(self, snapshot: MetricsSnapshot) -> None:
+        for ign, attributes in snapshot.metrics.items():
+            bot_metrics = self.metrics.setdefault(ign, {})
+            bot_rates = self.read_rates.setdefault(ign, {})
+            for name, metrics in attributes.items():
+                bot_metrics.setdefault(name, AttributeMetrics()).merge(metrics)
+                bot_rates[name] = metrics.read_rate
+        for ign, thresholds in snapshot.thresholds.items():
+            self.thresholds.setdefault(ign, {}).update(thresholds)
+        logger.log(LOG_LEVEL, f"Received metrics from {snapshot.engine}.")
+
+    def export(self) -> None:
+        self._write_all(self._render())
+
+    async def export_async(self) -> None:
+        """
+        Renders the exports on the calling thread, then writes them in a thread once
+        previous exports are written.
+        """
+        rendered = self._render()
+        async with self._lock:
+            await asyncio.to_thread(self._write_all, rendered)
+
+    def _render(self) -> dict[str, str]:
+        return {
+            self.json_path: json.dumps(self.to_json(), indent=2),
+            self.prometheus_path: self.to_prometheus(),
+        }
+
+    def _write_all(self, rendered: dict[str, str]) -> None:
+        for path, content in rendered.items():
+            self._write(path, content)
+
+    def to_json(self) -> dict:
+        return {
+            "generated_at": time.time(),
+            "bots": {
+                ign: {
+                    name: {
+                        "threshold": self.thresholds.get(ign, {}).get(name),
+                        "reads": metrics.reads,
+                        "read_rate": self.read_rates[ign][name],
+                        "update_latency": metrics.update_latency.summary(),
+                        "staleness": metrics.staleness.summary(),
+                    }
+                    for name, metrics in sorted(attributes.items())
+                }
+                for ign, attributes in self.metrics.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for metric, attr, help_text in (
+            ("update_latency", "update_latency", "Duration of attribute updates."),
+            ("read_staleness", "staleness", "Age of attribute values when read."),
+        ):
+            name = f"botdata_{metric}_seconds"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+            for labels, metrics in self._labelled():
+                histogram: LatencyHistogram = getattr(metrics, attr)
+                for q in EXPORTED_QUANTILES:
+                    value = histogram.percentile(q * 100) / NS_PER_SECOND
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {value:.9f}')
+                lines.append(
+                    f"{name}_sum{{{labels}}} {histogram.total / NS_PER_SECOND:.9f}"
+                )
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        lines += [
+            "# HELP botdata_reads_total Number of attribute reads.",
+            "# TYPE botdata_reads_total counter",
+        ]
+        lines += [
+            f"botdata_reads_total{{{labels}}} {metrics.reads}"
+            for labels, metrics in self._labelled()
+        ]
+        lines += [
+            "# HELP botdata_read_rate Attribute reads per second (latest window).",
+            "# TYPE botdata_read_rate gauge",
+        ]
+        lines += [
+            f"botdata_read_rate{{{labels}}} {self.read_rates[ign][name]:.3f}"
+            for labels, metrics, ign, name in self._labelled(True)
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _labelled(self, with_keys: bool = False) -> Iterable[tuple]:
+        for ign, attributes in self.metrics.items():
+            for name, metrics in sorted(attributes.items()):
+                labels = f'bot="{_escape(ign)}",attribute="{_escape(name)}"'
+                yield (labels, metrics, ign, name) if with_keys else (labels, metrics)
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            f.write(content)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
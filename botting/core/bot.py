@@ -1,5 +1,7 @@
 import asyncio
+import logging
 import multiprocessing.connection
+import time
 import multiprocessing.managers
 from abc import ABC, abstractmethod
 from functools import cached_property
@@ -8,6 +10,9 @@ from botting.utilities import client_handler
 from .bot_data import BotData
 from .decision_maker import DecisionMaker
 
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.INFO
+
 
 class Bot(ABC):
     """
@@ -56,12 +61,32 @@ class Bot(ABC):
         Called by the Engine to start the DecisionMakers tasks.
         Passes the TaskGroup to each DecisionMaker, such that they can define sub-tasks
         if required.
+        The refresh pool of the BotData is shut down once the DecisionMakers stop.
+        """
+        try:
+            async with asyncio.TaskGroup() as tg:
+                start = time.perf_counter()
+                decision_makers = self.decision_makers  # Instantiate DecisionMakers.
+                logger.log(
+                    LOG_LEVEL,
+                    f"{self.ign} instantiated {len(decision_makers)} DecisionMakers "
+                    f"in {time.perf_counter() - start:.2f}s.",
+                )
+                await asyncio.to_thread(self.barrier.wait)
+                for dm in decision_makers:
+                    tg.create_task(dm.start(tg), name=f"{dm}")
+        finally:
+            self.data.shutdown()
+
+    def shared_primitives(self) -> dict[str, str]:
+        """
+        Called from the MainProcess.
+        :return: The native primitives required by the DecisionMakers of this Bot.
         """
-        async with asyncio.TaskGroup() as tg:
-            decision_makers = self.decision_makers  # Instantiate DecisionMakers.
-            await asyncio.to_thread(self.barrier.wait)
-            for dm in decision_makers:
-                tg.create_task(dm.start(tg), name=f"{dm}")
+        primitives = {}
+        for class_ in self._decision_makers():
+            primitives.update(class_.shared_primitives(self.ign))
+        return primitives
 
     @cached_property
     def decision_makers(self) -> list[DecisionMaker]:
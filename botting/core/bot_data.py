@@ -1,31 +1,65 @@
+import asyncio
 import logging
 import numpy as np
-from collections import deque
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
+
+from .attribute_history import (
+    AttributeHistory,
+    ValuesHistory,
+    is_valid,
+    size_of,
+    N_RET_VALUES,
+)
+from .attribute_metrics import AttributeMetrics
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.NOTSET
-N_RET_VALUES = 10
+
+# All timestamps are obtained from time.monotonic_ns()
+NS_PER_SECOND = 1_000_000_000
+NO_THRESHOLD = sys.maxsize  # Attributes without threshold are never auto-updated
+# Timestamp of events that never occurred. Attributes never updated are always stale.
+NEVER = -NO_THRESHOLD - 1
+# Maximum number of update functions executed concurrently by refresh_attributes
+DEFAULT_REFRESH_WORKERS = 4
 
 
-@dataclass
+def threshold_to_ns(threshold: float | None) -> int:
+    """
+    Converts a threshold in seconds into nanoseconds. None or 0 means no threshold.
+    """
+    return round(threshold * NS_PER_SECOND) if threshold else NO_THRESHOLD
+
+
+@dataclass(slots=True)
 class AttributeMetadata:
     """
     A data container instance used by BotData to retain the overall frequency of
-    updates for each attribute, as well as the average update time and the last
-    N values of the attribute.
+    updates for each attribute, as well as the average update time and the
+    previous values of the attribute (according to its history policy).
+    Timestamps are monotonic, in nanoseconds.
     """
 
     access_count: int = 0  # Number of times the attribute has been accessed
     update_count: int = 0  # Number of times the attribute has been updated
-    total_update_time: float = 0.0  # Total time spent updating the attribute
-    last_update_time: datetime = datetime.min  # Timestamp of last update
-    last_valid_update_time: datetime = datetime.min  # Timestamp of last valid update
-    last_value_change_time: datetime = datetime.min  # Timestamp of last value change
-    # Last N values of the attribute
-    prev_values: deque[Any] = field(default_factory=lambda: deque(maxlen=N_RET_VALUES))
+    total_update_time: float = 0.0  # Total time (seconds) spent updating
+    last_update_ns: int = NEVER  # Timestamp of last update
+    last_valid_update_ns: int = NEVER  # Timestamp of last valid update
+    last_value_change_ns: int = NEVER  # Timestamp of last value change
+    threshold_ns: int = NO_THRESHOLD  # Maximum delay before an automatic update
+    version: int = 0  # Incremented whenever the value changes
+    dependencies: tuple[str, ...] = ()  # Attributes from which the value is derived
+    # Version of each dependency when the value was last computed
+    dependency_versions: tuple[int, ...] | None = None
+    # Previous values of the attribute. By default, the last N values are retained.
+    prev_values: AttributeHistory = field(default_factory=ValuesHistory)
+    # Latency histograms, only recorded once metrics are enabled
+    metrics: AttributeMetrics | None = None
 
     @property
     def average_update_time(self) -> float:
@@ -36,6 +70,40 @@ class AttributeMetadata:
         return self.total_update_time / self.update_count
 
 
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _AttributeDescriptor:
+    """
+    Installed on the BotData class for each attribute name created, such that reads
+    do not go through the (slow) failed attribute lookup preceding __getattr__.
+    Instances which did not create that attribute fall back on __getattr__.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: "BotData", owner: type) -> Any:
+        if instance is None:
+            return self
+        name = self.name
+        metadata = instance._metadata.get(name)
+        if metadata is None:
+            return instance.__getattr__(name)
+        metadata.access_count += 1
+        if time.monotonic_ns() - metadata.last_update_ns > metadata.threshold_ns or (
+            metadata.dependencies and instance._dependencies_changed(metadata)
+        ):
+            instance._refresh(name)
+        if metadata.metrics is not None:
+            metadata.metrics.record_read(time.monotonic_ns() - metadata.last_update_ns)
+        return instance._attributes[name]
+
+
 class BotData:
     """
     A data container instance used by a Bot instance to enable communication
@@ -48,6 +116,11 @@ class BotData:
     Lastly, a thresh can be set for each attribute to ensure the attribute is
     automatically updated if the time since the last update is greater than the
     threshold value.
+    Attributes may also declare the attributes they are derived from. They are then
+    recomputed lazily, only when the value of an upstream attribute changed, which
+    is tracked through version counters.
+    Attribute reads are served by a descriptor installed on the class upon creation,
+    and timestamps are taken from the monotonic clock, in nanoseconds.
     """
 
     _authorized_attributes: set[str] = {
@@ -57,15 +130,29 @@ class BotData:
         "_update_functions",
         "_thresholds",
         "_error_handlers",
+        "_change_waiters",
+        "_refresh_workers",
+        "_executor",
+        "_refresh_lock",
+        "_refresh_owner",
+        "_metrics_enabled",
     }
 
-    def __init__(self, ign: str) -> None:
+    def __init__(
+        self, ign: str, refresh_workers: int = DEFAULT_REFRESH_WORKERS
+    ) -> None:
         self.ign = ign
         self._attributes: dict[str, Any] = {}
         self._metadata: dict[str, AttributeMetadata] = {}
         self._update_functions: dict[str, callable] = {}
         self._thresholds: dict[str, float] = {}
         self._error_handlers: dict[str, callable] = {}
+        self._change_waiters: dict[str, asyncio.Future] = {}
+        self._refresh_workers = refresh_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._refresh_lock = threading.RLock()
+        self._refresh_owner: int | None = None  # Thread currently refreshing
+        self._metrics_enabled = False
 
     def __str__(self) -> str:
         return f"BotData({self.ign})"
@@ -78,17 +165,11 @@ class BotData:
         :return: Last known value of the attribute.
         """
         if name in self._metadata:
-            last_known_update = next(
-                (
-                    value
-                    for value in reversed(self._metadata[name].prev_values)
-                    if value not in [None, "", [], {}]
-                ),
-                None,
-            )
+            last_known_update = self._metadata[name].prev_values.last_valid()
             if not update:
                 return last_known_update
-            return getattr(self, name) or last_known_update
+            value = getattr(self, name)
+            return value if self._update_is_valid(value) else last_known_update
         raise AttributeError(f"{name} not found in {self}")
 
     def get_time_since_last_valid_update(self, name: str) -> float:
@@ -98,9 +179,8 @@ class BotData:
         :return: Time since the last valid update.
         """
         if name in self._metadata:
-            return (
-                datetime.now() - self._metadata[name].last_valid_update_time
-            ).total_seconds()
+            last_valid_update = self._metadata[name].last_valid_update_ns
+            return (time.monotonic_ns() - last_valid_update) / NS_PER_SECOND
         raise AttributeError(f"{name} not found in {self}")
 
     def get_time_since_last_value_change(self, name: str) -> float:
@@ -110,9 +190,8 @@ class BotData:
         :return: Time since the last value change.
         """
         if name in self._metadata:
-            return (
-                datetime.now() - self._metadata[name].last_value_change_time
-            ).total_seconds()
+            last_value_change = self._metadata[name].last_value_change_ns
+            return (time.monotonic_ns() - last_value_change) / NS_PER_SECOND
         raise AttributeError(f"{name} not found in {self}")
 
     def __getattr__(self, name: str) -> Any:
@@ -124,17 +203,15 @@ class BotData:
         :param name: Name of the attribute.
         :return:
         """
-        if name in self._attributes:
-            metadata = self._metadata[name]
+        metadata = self._metadata.get(name)
+        if metadata is not None:
             metadata.access_count += 1
-            threshold = self._thresholds[name] or float("inf")
-            now = datetime.now()
-            last_update_time = metadata.last_update_time or datetime.min
-            if (now - last_update_time).total_seconds() > threshold:
-                logger.log(
-                    LOG_LEVEL, f"{self} Updating {name} due to exceeded threshold."
+            if self._is_stale(metadata):
+                self._refresh(name)
+            if metadata.metrics is not None:
+                metadata.metrics.record_read(
+                    time.monotonic_ns() - metadata.last_update_ns
                 )
-                self.update_attribute(name)
             return self._attributes[name]
         elif name in [*self._authorized_attributes, "_authorized_attributes"]:
             return super().__getattribute__(name)
@@ -142,6 +219,55 @@ class BotData:
             return False
         raise AttributeError(f"{name} not found in {self}")
 
+    def _refresh(self, name: str, force: bool = False) -> None:
+        """
+        Update functions running in the refresh pool may read stale attributes, which
+        are then refreshed from several threads. Refreshes are therefore serialized,
+        and skipped if another thread refreshed the attribute in the meantime.
+        :param name: Name of the attribute.
+        :param force: Refresh even if the attribute is not stale.
+        """
+        with self._refresh_lock:
+            owner = self._refresh_owner
+            self._refresh_owner = threading.get_ident()
+            try:
+                if force or self._is_stale(self._metadata[name]):
+                    logger.log(LOG_LEVEL, f"{self} Updating {name} since it is stale.")
+                    self.update_attribute(name)
+            finally:
+                self._refresh_owner = owner
+
+    def _is_stale(self, metadata: AttributeMetadata) -> bool:
+        """
+        An attribute is stale when it was never computed, when its threshold is
+        exceeded or when the value of one of its dependencies changed since it was
+        last computed.
+        """
+        elapsed = time.monotonic_ns() - metadata.last_update_ns
+        return elapsed > metadata.threshold_ns or (
+            bool(metadata.dependencies) and self._dependencies_changed(metadata)
+        )
+
+    def _dependencies_changed(self, metadata: AttributeMetadata) -> bool:
+        """
+        Dependencies which are themselves stale are refreshed first, such that
+        changes propagate lazily through the dependency graph.
+        """
+        return self._dependency_versions(metadata, True) != metadata.dependency_versions
+
+    def _dependency_versions(
+        self, metadata: AttributeMetadata, refresh: bool = False
+    ) -> tuple[int, ...]:
+        versions = []
+        for dependency in metadata.dependencies:
+            dep_metadata = self._metadata.get(dependency)
+            if dep_metadata is None:
+                raise AttributeError(f"Dependency {dependency} not found in {self}")
+            if refresh and self._is_stale(dep_metadata):
+                self._refresh(dependency)
+            versions.append(dep_metadata.version)
+        return tuple(versions)
+
     def __setattr__(self, name: str, value: Any) -> None:
         """
         Sets the value of an attribute, and also updates the metadata for that attribute
@@ -152,8 +278,18 @@ class BotData:
         if name in self._authorized_attributes:
             super().__setattr__(name, value)
         elif name in self._attributes:
+            # Values set manually are considered up-to-date
+            metadata = self._metadata[name]
+            metadata.last_update_ns = time.monotonic_ns()
+            is_change = self._update_is_change(value, self._attributes[name])
+            if is_change:
+                metadata.version += 1
+            if metadata.dependencies:
+                metadata.dependency_versions = self._dependency_versions(metadata)
             self._attributes[name] = value
-            self._metadata[name].prev_values.append(value)
+            metadata.prev_values.append(value)
+            if is_change and name in self._change_waiters:
+                self._notify_change(name)
         else:
             raise AttributeError(f"{name} created in {self}. Use create_attribute()")
 
@@ -166,6 +302,187 @@ class BotData:
         for name in names:
             self.update_attribute(name)
 
+    def refresh_attributes(self, *names: str) -> dict[str, float]:
+        """
+        Updates the specified attributes, running independent update functions
+        concurrently in a bounded thread pool. Most update functions are OpenCV calls,
+        which release the GIL.
+        Stale dependencies of the attributes are refreshed as well. Attributes are
+        grouped into layers such that each attribute is computed after its
+        dependencies. The results of a layer are applied all at once on the calling
+        thread, once every update function of the layer has returned. Therefore, no
+        value of a layer is applied if any of its update functions fails (and cannot
+        be recovered by its error handler).
+        Update functions of a same layer must not read attributes which are stale
+        and are not declared as dependencies, since those would then be refreshed
+        concurrently.
+        :param names: Name of the attributes.
+        :return: Time (in seconds) spent in the update function of each attribute.
+        """
+        timings = {}
+        start = time.monotonic_ns()
+        for layer in self._refresh_layers(names):
+            if len(layer) == 1:
+                results = {layer[0]: self._compute(layer[0])}
+            else:
+                results = self._compute_concurrently(layer)
+            self._apply_layer(results, timings)
+        self._log_refresh(timings, start)
+        return timings
+
+    async def refresh_attributes_async(self, *names: str) -> dict[str, float]:
+        """
+        Same as refresh_attributes, but every update function runs in the refresh
+        pool, such that the event loop is not blocked meanwhile. Error handlers and
+        results are still applied on the calling thread.
+        :param names: Name of the attributes.
+        :return: Time (in seconds) spent in the update function of each attribute.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        timings = {}
+        start = time.monotonic_ns()
+        for layer in self._refresh_layers(names):
+            outcomes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, self._timed_update, name)
+                    for name in layer
+                ),
+                return_exceptions=True,
+            )
+            results = {}
+            for name, outcome in zip(layer, outcomes):
+                if isinstance(outcome, Exception):
+                    self._recover(name, outcome)
+                    outcome = await loop.run_in_executor(
+                        executor, self._timed_update, name
+                    )
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                results[name] = outcome
+            self._apply_layer(results, timings)
+        self._log_refresh(timings, start)
+        return timings
+
+    def _apply_layer(self, results: dict[str, tuple], timings: dict) -> None:
+        with self._refresh_lock:
+            for name, (value, update_start, update_end) in results.items():
+                self._apply_value(name, value, update_start, update_end)
+                timings[name] = (update_end - update_start) / NS_PER_SECOND
+
+    def _log_refresh(self, timings: dict[str, float], start: int) -> None:
+        logger.log(
+            LOG_LEVEL,
+            f"{self} Refreshed {len(timings)} attributes in "
+            f"{(time.monotonic_ns() - start) / NS_PER_SECOND:.4f}s "
+            f"(sequential: {sum(timings.values()):.4f}s).",
+        )
+
+    def _refresh_layers(self, names: Iterable[str]) -> list[list[str]]:
+        """
+        Orders the attributes to refresh, along with their stale dependencies, into
+        layers. Each attribute belongs to the layer following the one of its deepest
+        dependency. Staleness is evaluated without refreshing anything.
+        """
+        targets = dict.fromkeys(names)
+        depths: dict[str, int | None] = {}
+
+        def depth(name: str) -> int | None:
+            """
+            :return: The layer of the attribute, or None if it is not refreshed.
+            """
+            if name not in depths:
+                metadata = self._metadata.get(name)
+                if metadata is None:
+                    raise AttributeError(f"{name} not found in {self}")
+                dep_depths = [depth(dep) for dep in metadata.dependencies]
+                refreshed = [d for d in dep_depths if d is not None]
+                elapsed = time.monotonic_ns() - metadata.last_update_ns
+                if (
+                    name in targets
+                    or refreshed
+                    or elapsed > metadata.threshold_ns
+                    or bool(metadata.dependencies)
+                    and self._dependency_versions(metadata)
+                    != metadata.dependency_versions
+                ):
+                    depths[name] = 1 + max(refreshed, default=-1)
+                else:
+                    depths[name] = None
+            return depths[name]
+
+        for name in targets:
+            depth(name)
+        layers = [[] for _ in range(max(filter(None, depths.values()), default=0) + 1)]
+        for name, layer in depths.items():
+            if layer is not None:
+                layers[layer].append(name)
+        return [layer for layer in layers if layer]
+
+    def _compute(self, name: str) -> tuple[Any, int, int]:
+        """
+        Calls the update function of an attribute without applying its result.
+        The error handler of the attribute, if any, is called upon failure, after
+        which the update function is called once more.
+        :return: The new value, and the start and end timestamps of the update.
+        """
+        try:
+            return self._timed_update(name)
+        except Exception as e:
+            self._recover(name, e)
+            return self._timed_update(name)
+
+    def _recover(self, name: str, error: Exception) -> None:
+        """
+        Calls the error handler of an attribute, or raises the error if it has none.
+        """
+        if name not in self._error_handlers:
+            raise error
+        self._error_handlers[name]()
+
+    def _compute_concurrently(self, names: list[str]) -> dict[str, tuple]:
+        """
+        Same as _compute, for several attributes at once. Error handlers may interact
+        with the client and are therefore called on the calling thread, once every
+        update function has returned.
+        When the calling thread is refreshing an attribute (e.g. from an error
+        handler), the pool workers could wait on that refresh while the calling thread
+        waits on them. Attributes are therefore computed on the calling thread instead.
+        """
+        if self._refresh_owner == threading.get_ident():
+            return {name: self._compute(name) for name in names}
+        executor = self._get_executor()
+        futures = {name: executor.submit(self._timed_update, name) for name in names}
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                self._recover(name, e)
+                results[name] = self._timed_update(name)
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self._refresh_workers, thread_name_prefix=f"{self} - Refresh"
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """
+        Shuts the refresh pool down, if it was created. Pending update functions are
+        cancelled, and those already running are not awaited.
+        A new pool is created if attributes are refreshed again.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _timed_update(self, name: str) -> tuple[Any, int, int]:
+        start = time.monotonic_ns()
+        return self._update_functions[name](), start, time.monotonic_ns()
+
     def update_attribute(self, name: str) -> None:
         """
         Updates the value of an attribute using the update function mapped to it.
@@ -189,30 +506,106 @@ class BotData:
         :param name: Name of the attribute.
         :return:
         """
-        metadata = self._metadata[name]
-        now = datetime.now()
+        start = time.monotonic_ns()
         value = self._update_functions[name]()
+        self._apply_value(name, value, start, time.monotonic_ns())
+
+    def _apply_value(self, name: str, value: Any, start: int, end: int) -> None:
+        """
+        Stores the result of an update function and updates the metadata.
+        :param name: Name of the attribute.
+        :param value: New value of the attribute.
+        :param start: Timestamp at which the update function was called.
+        :param end: Timestamp at which the update function returned.
+        :return:
+        """
+        metadata = self._metadata[name]
         metadata.update_count += 1
-        metadata.last_update_time = datetime.now()
+        metadata.last_update_ns = end
 
         if self._update_is_valid(value):
-            metadata.last_valid_update_time = metadata.last_update_time
+            metadata.last_valid_update_ns = end
 
-        if self._update_is_change(value, self._attributes[name]):
-            metadata.last_value_change_time = metadata.last_update_time
-        self.__setattr__(name, value)
-        metadata.total_update_time += (datetime.now() - now).total_seconds()
+        is_change = self._update_is_change(value, self._attributes[name])
+        if is_change:
+            metadata.last_value_change_ns = end
+            metadata.version += 1
+        if metadata.dependencies:
+            metadata.dependency_versions = self._dependency_versions(metadata)
+        self._attributes[name] = value
+        metadata.prev_values.append(value)
+        metadata.total_update_time += (end - start) / NS_PER_SECOND
+        if metadata.metrics is not None:
+            metadata.metrics.update_latency.record(end - start)
+        if is_change and name in self._change_waiters:
+            self._notify_change(name)
 
-    @staticmethod
-    def _update_is_valid(value: Any) -> bool:
-        if isinstance(value, np.ndarray):
-            return not (np.all(value == 0) or value.size == 0)
-        else:
-            return value not in [None, "", [], {}, set()]
+    async def changed(
+        self,
+        name: str,
+        since: int | None = None,
+        refresh_interval: float | None = None,
+    ) -> int:
+        """
+        Waits until the value of an attribute changes.
+        Multiple changes occurring before the waiter resumes are coalesced into a
+        single wake-up.
+        Since attributes are only updated when read, a refresh interval should be
+        provided unless other tasks read the attribute. The attribute is then
+        refreshed periodically (if stale) while waiting.
+        :param name: Name of the attribute.
+        :param since: Version of the attribute after which a change is awaited.
+            Defaults to its current version.
+        :param refresh_interval: Time (in seconds) between refreshes of the attribute.
+         The attribute is only refreshed when stale, unless it has neither threshold
+         nor dependencies.
+        :return: The new version of the attribute.
+        """
+        metadata = self._metadata.get(name)
+        if metadata is None:
+            raise AttributeError(f"{name} not found in {self}")
+        if since is None:
+            since = metadata.version
+
+        while metadata.version == since:
+            waiter = self._change_waiters.get(name)
+            if waiter is None or waiter.done():
+                waiter = asyncio.get_running_loop().create_future()
+                self._change_waiters[name] = waiter
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), refresh_interval)
+            except asyncio.TimeoutError:
+                # Without threshold nor dependencies, staleness cannot be assessed
+                always_refresh = (
+                    metadata.threshold_ns == NO_THRESHOLD and not metadata.dependencies
+                )
+                if always_refresh or self._is_stale(metadata):
+                    self._refresh(name, force=always_refresh)
+        return metadata.version
+
+    def _notify_change(self, name: str) -> None:
+        """
+        Wakes up all tasks awaiting a change of the attribute. Updates may occur in
+        other threads, in which case the waiters are resolved through their loop.
+        """
+        waiter = self._change_waiters.pop(name)
+        loop = waiter.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            _resolve(waiter)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+    _update_is_valid = staticmethod(is_valid)
 
     @staticmethod
     def _update_is_change(value: Any, prev_value: Any) -> bool:
-        if isinstance(value, np.ndarray):
+        if value is prev_value:
+            return False
+        elif isinstance(value, np.ndarray) or isinstance(prev_value, np.ndarray):
             return not np.array_equal(value, prev_value)
         else:
             return value != prev_value
@@ -224,19 +617,40 @@ class BotData:
         threshold: float = None,
         initial_value: Any = None,
         error_handler: callable = None,
+        dependencies: Iterable[str] = (),
+        history: AttributeHistory | None = None,
         **kwargs,
     ) -> None:
         """
         Creates a new attribute or overwrites the specifications of an existing one.
+        The update function is not called upon creation. Instead, the attribute is
+        computed on its first read (unless an initial value is provided).
         :param name: Name of the attribute.
         :param update_function: Function to update the attribute.
         :param threshold: Maximum delay after which the attribute is updated.
         :param initial_value: Initial value of the attribute, which bypasses the
             update function if specified.
         :param error_handler: Function to handle errors in the update function.
+        :param dependencies: Names of the attributes from which this one is derived.
+            The attribute is recomputed on read whenever the value of any
+            dependency has changed since its last update. Dependencies may be
+            created afterward.
+        :param history: Retention policy for the previous values of the attribute.
+            Defaults to the last N values.
         :return:
         """
-        self._metadata.setdefault(name, AttributeMetadata(**kwargs))
+        dependencies = tuple(dependencies)
+        self._check_cycles(name, dependencies)
+        if not hasattr(type(self), name):
+            setattr(type(self), name, _AttributeDescriptor(name))
+        metadata = self._metadata.setdefault(name, AttributeMetadata(**kwargs))
+        metadata.threshold_ns = threshold_to_ns(threshold)
+        metadata.dependencies = dependencies
+        metadata.dependency_versions = None
+        if history is not None:
+            metadata.prev_values = history
+        if self._metrics_enabled and metadata.metrics is None:
+            metadata.metrics = AttributeMetrics()
         self._update_functions[name] = update_function
         self._thresholds[name] = threshold
         self._attributes.setdefault(name, initial_value)
@@ -245,4 +659,62 @@ class BotData:
         else:
             self._error_handlers.pop(name, None)
         if not initial_value:
-            self.update_attribute(name)
+            metadata.last_update_ns = NEVER
+        else:
+            metadata.last_update_ns = time.monotonic_ns()
+            metadata.dependency_versions = tuple(
+                self._metadata[dep].version if dep in self._metadata else 0
+                for dep in dependencies
+            )
+
+    def memory_usage(self) -> dict[str, int]:
+        """
+        Estimates the memory used by each attribute, including its retained history.
+        History entries which are the current value are not counted twice.
+        :return: Bytes used by each attribute.
+        """
+        usage = {}
+        for name, metadata in self._metadata.items():
+            value = self._attributes[name]
+            usage[name] = size_of(value) + metadata.prev_values.memory_usage(
+                {id(value)}
+            )
+        return usage
+
+    def enable_metrics(self) -> None:
+        """
+        Starts recording the update latency and the staleness at read time of all
+        attributes, including those created afterward. Disabled by default, since
+        recording adds overhead to every read.
+        :return:
+        """
+        self._metrics_enabled = True
+        for metadata in self._metadata.values():
+            if metadata.metrics is None:
+                metadata.metrics = AttributeMetrics()
+
+    def metrics_snapshot(self) -> dict[str, AttributeMetrics]:
+        """
+        Closes the current metrics window of each attribute and starts a new one.
+        :return: The metrics recorded by each attribute since the previous snapshot.
+        """
+        return {
+            name: metadata.metrics.close_window()
+            for name, metadata in self._metadata.items()
+            if metadata.metrics is not None
+        }
+
+    def _check_cycles(self, name: str, dependencies: tuple[str, ...]) -> None:
+        """
+        Ensures that declaring the dependencies of an attribute does not create a
+        circular dependency.
+        """
+        to_visit = list(dependencies)
+        visited = set()
+        while to_visit:
+            current = to_visit.pop()
+            if current == name:
+                raise ValueError(f"Circular dependency detected for {name} in {self}")
+            if current not in visited and current in self._metadata:
+                visited.add(current)
+                to_visit.extend(self._metadata[current].dependencies)
@@ -0,0 +1,104 @@
+"""
+Control of DecisionMakers across all Engines.
+DecisionMakers may enable, disable or pause other DecisionMakers (e.g. Rotation is
+disabled while the inventory is being cleaned up). Commands are dispatched within the
+event loop of the issuing Engine, and relayed by the MainProcess to every other
+Engine, where they are dispatched by that Engine's channel.
+"""
+import asyncio
+import logging
+
+from dataclasses import dataclass, field
+from typing import Literal, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .decision_maker import DecisionMaker
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.INFO
+
+
+@dataclass(frozen=True)
+class ControlCommand:
+    """
+    Enables, disables or pauses the DecisionMakers matching any of the targets.
+    Targets are class names, which match any DecisionMaker having that class
+    within its MRO (such that base classes and mixins may be targeted).
+    If ign is specified, only the DecisionMakers of that Bot are targeted.
+    """
+
+    action: Literal["enable", "disable", "pause"]
+    targets: tuple[str, ...]
+    ign: str = field(default=None)
+    duration: float = field(default=None)  # Used by "pause" only
+
+
+class ControlChannel:
+    """
+    Lives in an Engine (one per process).
+    DecisionMakers register themselves when they are started. Commands are then
+    dispatched to every matching DecisionMaker.
+    """
+
+    def __init__(self) -> None:
+        self._makers: dict["DecisionMaker", frozenset[str]] = {}
+        self._resumes: dict["DecisionMaker", asyncio.TimerHandle] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self._makers)} DecisionMakers)"
+
+    def __len__(self) -> int:
+        return len(self._makers)
+
+    def register(self, maker: "DecisionMaker") -> None:
+        self._makers[maker] = frozenset(cls.__name__ for cls in type(maker).__mro__)
+
+    def unregister(self, maker: "DecisionMaker") -> None:
+        self._makers.pop(maker, None)
+        self._cancel_resume(maker)
+
+    def matching(self, command: ControlCommand) -> list["DecisionMaker"]:
+        return [
+            maker
+            for maker, names in self._makers.items()
+            if not names.isdisjoint(command.targets)
+            and command.ign in (None, maker.data.ign)
+        ]
+
+    def dispatch(self, command: ControlCommand) -> int:
+        """
+        Must be called from within the event loop of the Engine.
+        :param command: The command to dispatch.
+        :return: The number of DecisionMakers targeted.
+        """
+        makers = self.matching(command)
+        for maker in makers:
+            self._cancel_resume(maker)
+            if command.action == "enable":
+                maker.enable()
+            elif command.action == "disable":
+                maker.disable()
+            elif command.action == "pause":
+                maker.disable()
+                self._resumes[maker] = asyncio.get_running_loop().call_later(
+                    command.duration, self._resume, maker
+                )
+            else:
+                raise ValueError(f"Unknown action {command.action}.")
+        logger.log(
+            LOG_LEVEL, f"Dispatched {command} to {len(makers)} DecisionMakers."
+        )
+        return len(makers)
+
+    def _resume(self, maker: "DecisionMaker") -> None:
+        self._resumes.pop(maker, None)
+        maker.enable()
+
+    def _cancel_resume(self, maker: "DecisionMaker") -> None:
+        handle = self._resumes.pop(maker, None)
+        if handle is not None:
+            handle.cancel()
+
+
+# Channel of the current process.
+CONTROL_CHANNEL = ControlChannel()
@@ -6,6 +6,8 @@ from abc import ABC, abstractmethod
 
 from .action_data import ActionRequest, ActionWithValidation
 from .bot_data import BotData
+from .control_channel import CONTROL_CHANNEL, ControlCommand
+from .shared_primitives import SHARED_PRIMITIVES
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.INFO
@@ -18,9 +20,20 @@ class DecisionMaker(ABC):
     one at a time.
     When called, a DecisionMaker may return an ActionRequest container,
     which will be sent to the Main Process to be executed there.
+    When a _trigger attribute is defined, the DecisionMaker is only called again once
+    the value of that attribute changes, instead of at every _throttle interval.
+    The _throttle is then the interval at which the attribute is refreshed.
+    Primitives listed in _primitives are provisioned as native primitives before
+    Engines are spawned. Names are formatted with the class name (cls) and the IGN
+    (ign) of the Bot. Declarations of all base classes (including mixins) are
+    combined. Other primitives are requested from the Manager process.
+    DecisionMakers are enabled, disabled or paused through the ControlChannel of
+    their Engine, which other DecisionMakers (from any Engine) address by class name.
     """
 
     _throttle: float = None
+    _trigger: str = None
+    _primitives: dict[str, str] = {}
 
     def __init__(
         self,
@@ -33,14 +46,28 @@ class DecisionMaker(ABC):
         self.data = data
         self.pipe = pipe
 
-        self._disabler = self.request_proxy(
-            self.metadata, f"{self.__class__.__name__} - Disabler", "Condition", True
-        )
         self._decision_task = None
+        self._task_group: asyncio.TaskGroup | None = None
+        self._task_args: tuple[tuple, dict] = (), {}
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.data.ign})"
 
+    @classmethod
+    def shared_primitives(cls, ign: str) -> dict[str, str]:
+        """
+        Called from the MainProcess.
+        :param ign: The IGN of the Bot using this DecisionMaker.
+        :return: The type of each primitive to provision, by name.
+        """
+        primitives = {}
+        for base in reversed(cls.__mro__):
+            primitives.update(vars(base).get("_primitives", {}))
+        return {
+            name.format(cls=cls.__name__, ign=ign): primitive_type
+            for name, primitive_type in primitives.items()
+        }
+
     @staticmethod
     def request_proxy(
         metadata: multiprocessing.managers.DictProxy,
@@ -52,6 +79,8 @@ class DecisionMaker(ABC):
     ):
         """
         Creates a Proxy for a primitive type.
+        If a native primitive of that type was provisioned under the requester name,
+        it is returned instead (and args/kwargs are ignored).
         :param metadata: An EventProxy object that is set to notify the Manager of the
         request.
         :param requester: a string representing the requester.
@@ -60,6 +89,11 @@ class DecisionMaker(ABC):
         so multiple requesters can use the same proxy.
         :return: a Proxy instance.
         """
+        shared = SHARED_PRIMITIVES.get(requester, primitive_type)
+        if shared is not None:
+            logger.log(LOG_LEVEL, f"Using native {primitive_type} for {requester}.")
+            return shared
+
         logger.log(LOG_LEVEL, f"Requesting {primitive_type} for {requester}.")
         notifier = metadata["proxy_request"]
         with notifier:  # Acquire the underlying Lock
@@ -89,28 +123,47 @@ class DecisionMaker(ABC):
     def _disable_decision_makers(self, *args: str, self_only: bool = False) -> None:
         """
         Disables the given decision makers across all engines.
-        :param args: The DecisionMakers (class names) to disable.
+        :param args: The DecisionMakers (class names, or any of their bases) to disable.
+        :param self_only: If True, only the DecisionMakers of this Bot are disabled.
         :return:
         """
-        for class_name in args:
-            condition_proxy = self.metadata.get(f"{class_name} - Disabler", None)
-            if condition_proxy is not None:
-                logger.log(LOG_LEVEL, f"{self} is disabling {class_name}.")
-                with condition_proxy:
-                    condition_proxy.notify_all()  # noqa
+        self._control("disable", args, self_only)
 
     def _enable_decision_makers(self, *args: str, self_only: bool = False) -> None:
         """
         Enables the given decision makers across all engines.
-        :param args: The DecisionMakers (class names) to enable.
+        :param args: The DecisionMakers (class names, or any of their bases) to enable.
+        :param self_only: If True, only the DecisionMakers of this Bot are enabled.
+        :return:
+        """
+        self._control("enable", args, self_only)
+
+    def _pause_decision_makers(
+        self, *args: str, duration: float, self_only: bool = False
+    ) -> None:
+        """
+        Disables the given decision makers across all engines, and re-enables them
+        after the given duration.
+        :param args: The DecisionMakers (class names, or any of their bases) to pause.
+        :param duration: Time (in seconds) before the DecisionMakers are re-enabled.
+        :param self_only: If True, only the DecisionMakers of this Bot are paused.
         :return:
         """
-        for class_name in args:
-            condition_proxy = self.metadata.get(f"{class_name} - Disabler", None)
-            if condition_proxy is not None:
-                logger.log(LOG_LEVEL, f"{self} is re-enabling {class_name}.")
-                with condition_proxy:
-                    condition_proxy.notify_all()  # noqa1
+        self._control("pause", args, self_only, duration)
+
+    def _control(
+        self, action: str, targets: tuple[str, ...], self_only: bool, duration=None
+    ) -> None:
+        """
+        Dispatches the command within this Engine, and sends it to the MainProcess to
+        be relayed to all other Engines.
+        """
+        command = ControlCommand(
+            action, targets, self.data.ign if self_only else None, duration
+        )
+        logger.log(LOG_LEVEL, f"{self} is sending {command}.")
+        CONTROL_CHANNEL.dispatch(command)
+        self.pipe.send(command)
 
     async def _validate_request_async(
         self,
@@ -130,13 +183,29 @@ class DecisionMaker(ABC):
         await validator.execute_async(request)
 
     async def start(self, tg: asyncio.TaskGroup, *args, **kwargs) -> None:
-        tg.create_task(
-            asyncio.to_thread(self._disabler_task, tg, *args, **kwargs),
-            name=f"{self} - Disabler",
-        )
-        self._decision_task = tg.create_task(
-            self._task(*args, **kwargs), name=f"{self}"
-        )
+        self._task_group = tg
+        self._task_args = args, kwargs
+        CONTROL_CHANNEL.register(self)
+        self.enable()
+
+    def enable(self) -> None:
+        """
+        Called by the ControlChannel. Starts the decision task, unless it is running.
+        A task which is being cancelled is replaced right away.
+        """
+        task = self._decision_task
+        if task is None or task.done() or task.cancelling():
+            args, kwargs = self._task_args
+            self._decision_task = self._task_group.create_task(
+                self._task(*args, **kwargs), name=f"{self}"
+            )
+
+    def disable(self) -> None:
+        """
+        Called by the ControlChannel. Cancels the decision task, if it is running.
+        """
+        if self._decision_task is not None:
+            self._decision_task.cancel()
 
     async def _task(self, *args, **kwargs) -> None:
         """
@@ -148,7 +217,11 @@ class DecisionMaker(ABC):
         try:
             while True:
                 await self._decide(*args, **kwargs)
-                if self._throttle:
+                if self._trigger is not None:
+                    await self.data.changed(
+                        self._trigger, refresh_interval=self._throttle
+                    )
+                elif self._throttle:
                     await asyncio.sleep(self._throttle)
         except asyncio.CancelledError:
             logger.log(LOG_LEVEL, f"{name} has been disabled.")
@@ -157,21 +230,3 @@ class DecisionMaker(ABC):
             logger.error(f"Exception occurred in {name}: {e}.")
             # breakpoint()
             raise e
-
-    def _disabler_task(self, tg: asyncio.TaskGroup, *args, **kwargs) -> None:
-        """
-        Listens for a disable request.
-        TODO - Add failsafe to only add back into tg if not already in there?
-        :return:
-        """
-        while True:
-            with self._disabler:
-                # When notified, cancel the task
-                self._disabler.wait()
-                self._decision_task.cancel()
-
-                # Upon next notification, re-enable the task
-                self._disabler.wait()
-                self._decision_task = tg.create_task(
-                    self._task(*args, **kwargs), name=f"{self}"
-                )
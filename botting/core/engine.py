@@ -3,9 +3,17 @@ import logging
 import multiprocessing.connection
 import multiprocessing.managers
 
-from botting.utilities import setup_child_proc_logging
+from contextlib import aclosing
+
+from botting.utilities import pipe_messages, setup_child_proc_logging
+from botting.visuals import OCR_CACHE
 from .bot import Bot
-from .action_data import ActionRequest
+from .action_codec import ActionPipe, decode, is_encoded
+from .action_data import ActionRequest, ActionResult
+from .attribute_metrics import MetricsExporter, MetricsSnapshot
+from .control_channel import CONTROL_CHANNEL, ControlCommand
+from .pending_actions import PENDING_ACTIONS
+from .shared_primitives import SHARED_PRIMITIVES, SharedPrimitive
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.NOTSET
@@ -30,6 +38,7 @@ class _ChildProcessEngine:
         self.bots = bots
         self.bot_tasks: list[asyncio.Task] = []
         self.main_listener: asyncio.Task | None = None
+        self.metrics_shipper: asyncio.Task | None = None
         self.barrier = barrier
 
     def __repr__(self):
@@ -42,6 +51,7 @@ class _ChildProcessEngine:
         metadata: multiprocessing.managers.DictProxy,
         bots: list[Bot],
         barrier: multiprocessing.managers.BarrierProxy,
+        primitives: dict[str, SharedPrimitive] = None,
     ) -> None:
         """
         Child Process Entry Point.
@@ -52,10 +62,15 @@ class _ChildProcessEngine:
         :param bots: a list of Bot instances to include.
         :param barrier: a multiprocessing.Barrier instance, used to start all bots at
         the same time.
+        :param primitives: Native primitives provisioned by the MainProcess.
         :return:
         """
         setup_child_proc_logging(metadata["logging_queue"])
-        engine = cls(pipe, metadata, bots, barrier)
+        if primitives:
+            SHARED_PRIMITIVES.attach(primitives)
+        if "ocr_cache" in metadata:
+            OCR_CACHE.attach(metadata["ocr_cache"])
+        engine = cls(ActionPipe(pipe), metadata, bots, barrier)
         logger.info(f"{engine} Started.")
         asyncio.run(engine._cycle_forever())
 
@@ -67,11 +82,18 @@ class _ChildProcessEngine:
         """
         asyncio.current_task().set_name(f"MainTask - {self}")
         try:
+            metrics_interval = self.metadata.get("metrics_interval")
             for bot in self.bots:
                 bot.child_init(self.pipe, self.barrier)
+                if metrics_interval:
+                    bot.data.enable_metrics()
                 self.bot_tasks.append(
                     asyncio.create_task(bot.start(), name=f"Bot({bot.ign})")
                 )
+            if metrics_interval:
+                self.metrics_shipper = asyncio.create_task(
+                    self._ship_metrics(metrics_interval), name=f"Metrics - {self}"
+                )
             self.main_listener = asyncio.create_task(
                 self._poll_for_updates(), name=f"MainListener - {self}"
             )
@@ -103,22 +125,55 @@ class _ChildProcessEngine:
             raise e
 
         finally:
+            PENDING_ACTIONS.cancel_all()
+            if self.metrics_shipper is not None:
+                self.metrics_shipper.cancel()
+                if not self.pipe.closed:
+                    self.pipe.send(self._metrics_snapshot())
             if not self.pipe.closed:
                 logger.info(f"{self} is sending None and closing pipe")
                 self.pipe.send(None)
+            logger.info(f"{self} OCR cache statistics: {OCR_CACHE.stats()}.")
+            for bot in self.bots:
+                usage = bot.data.memory_usage()
+                logger.info(
+                    f"{bot.data} retains {sum(usage.values()) / 2**20:.1f} MB. "
+                    f"Largest attributes: {sorted(usage, key=usage.get)[-3:]}."
+                )
             logger.info(f"{self} Exited.")
 
-    async def _poll_for_updates(self) -> None:
+    def _metrics_snapshot(self) -> MetricsSnapshot:
+        return MetricsSnapshot(
+            engine=f"{self}",
+            metrics={bot.ign: bot.data.metrics_snapshot() for bot in self.bots},
+            thresholds={bot.ign: dict(bot.data._thresholds) for bot in self.bots},
+        )
+
+    async def _ship_metrics(self, interval: float) -> None:
         """
-        Parses the pipe for any updates to one BotData instance.
+        Periodically sends the attribute metrics of all Bots to the MainProcess.
+        :param interval: Time (in seconds) between two snapshots.
         :return:
         """
         while True:
-            if await asyncio.to_thread(self.pipe.poll):
-                data = self.pipe.recv()
+            await asyncio.sleep(interval)
+            self.pipe.send(self._metrics_snapshot())
+
+    async def _poll_for_updates(self) -> None:
+        """
+        Parses the pipe for any updates to one BotData instance, for control
+        commands relayed from other Engines, and for the results of ActionRequests.
+        :return:
+        """
+        async with aclosing(pipe_messages(self.pipe)) as messages:
+            async for data in messages:
                 if data is None:
                     logger.info(f"{self} received None from MainProcess. Exiting.")
                     break
+                elif isinstance(data, ControlCommand):
+                    CONTROL_CHANNEL.dispatch(data)
+                elif isinstance(data, ActionResult):
+                    PENDING_ACTIONS.resolve(data)
                 else:
                     breakpoint()  # TODO
 
@@ -141,6 +196,7 @@ class Engine(_ChildProcessEngine):
         metadata: multiprocessing.managers.DictProxy,
         bots: list[Bot],
         barrier: multiprocessing.managers.BarrierProxy,
+        primitives: dict[str, SharedPrimitive] = None,
     ) -> multiprocessing.Process:
         """
         Called from the MainProcess.
@@ -150,13 +206,14 @@ class Engine(_ChildProcessEngine):
         :param bots: a list of Bot instances to include.
         :param barrier: a multiprocessing.Barrier instance, used to start all bots at
         the same time.
+        :param primitives: Native primitives, which can only be transferred at spawn.
         :return:
         """
         assert multiprocessing.current_process().name == "MainProcess"
         process = multiprocessing.Process(
             target=cls._spawn_engine,
             name=f"Engine({', '.join([b.ign for b in bots])})",
-            args=(pipe, metadata, bots, barrier),
+            args=(pipe, metadata, bots, barrier, primitives),
         )
         process.start()
         return process
@@ -167,6 +224,8 @@ class Engine(_ChildProcessEngine):
         queue: asyncio.Queue,
         engine: multiprocessing.Process,
         discord_pipe: multiprocessing.connection.Connection,
+        metrics_exporter: MetricsExporter | None = None,
+        engine_pipes: list[multiprocessing.connection.Connection] = None,
     ) -> asyncio.Task:
         """
         Called from the MainProcess.
@@ -176,15 +235,19 @@ class Engine(_ChildProcessEngine):
         :param queue: an asyncio.Queue instance.
         :param engine: The spawned process connected at the other end of the pipe.
         :param discord_pipe: a multiprocessing.Connection instance to the Peripherals.
+        :param metrics_exporter: Receives the attribute metrics sent by the Engine.
+        :param engine_pipes: Connections to all Engines, to which control commands
+        are relayed (except the Engine which sent them).
         :return:
         """
         assert multiprocessing.current_process().name == "MainProcess"
 
         async def _coro():
             try:
-                while True:
-                    if await asyncio.to_thread(pipe.poll):
-                        request: ActionRequest = pipe.recv()
+                async with aclosing(pipe_messages(pipe)) as requests:
+                    async for request in requests:
+                        if is_encoded(request):
+                            request = decode(request)
 
                         if request is None:
                             msg = f"Received None from {engine.name}. Exiting."
@@ -202,6 +265,24 @@ class Engine(_ChildProcessEngine):
                             logger.info(f"Received {request} from {engine.name}.")
                             discord_pipe.send(request)
 
+                        elif isinstance(request, MetricsSnapshot):
+                            if metrics_exporter is not None:
+                                metrics_exporter.add(request)
+                                await metrics_exporter.export_async()
+                            continue
+
+                        elif isinstance(request, ControlCommand):
+                            for other in engine_pipes or []:
+                                if other is not pipe and not other.closed:
+                                    other.send(request)
+                            continue
+
+                        elif (
+                            isinstance(request, ActionRequest)
+                            and request.correlation_id is not None
+                        ):
+                            request.reply = pipe.send  # The Engine awaits the result
+
                         await queue.put(request)
 
             except asyncio.CancelledError:
@@ -0,0 +1,80 @@
+"""
+Completion of ActionRequests, as seen from an Engine.
+A request submitted through PendingActions is tagged with a correlation id. Once the
+MainProcess is done with it (whether the procedure completed, failed, was cancelled
+or never ran), an ActionResult with the same id is sent back through the Engine pipe
+and resolves the Future awaited by the DecisionMaker.
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing.connection
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .action_data import ActionRequest, ActionResult
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+
+class PendingActions:
+    """
+    Lives in an Engine (one per process).
+    """
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._futures: dict[int, asyncio.Future] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self._futures)} pending)"
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def submit(
+        self, pipe: multiprocessing.connection.Connection, request: "ActionRequest"
+    ) -> asyncio.Future:
+        """
+        Must be called from within the event loop of the Engine.
+        Sends the request to the MainProcess. The same request may be submitted
+        again, in which case it is tagged with a new correlation id.
+        :param pipe: The Engine pipe.
+        :param request: The ActionRequest to send.
+        :return: A Future which resolves to the value returned by the procedure. It
+        is cancelled if the procedure is cancelled or never runs, and raises any
+        exception raised by the procedure.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        correlation_id = request.correlation_id = next(self._ids)
+        self._futures[correlation_id] = fut
+        # The caller may stop waiting (e.g. on timeout) before any result is back
+        fut.add_done_callback(lambda _: self._futures.pop(correlation_id, None))
+        pipe.send(request)
+        return fut
+
+    def resolve(self, result: "ActionResult") -> None:
+        """
+        Called by the Engine when an ActionResult is received.
+        :param result: The outcome of a submitted request.
+        """
+        fut = self._futures.pop(result.correlation_id, None)
+        if fut is None or fut.done():
+            logger.log(LOG_LEVEL, f"No one is awaiting {result}.")
+        elif result.status == "completed":
+            fut.set_result(result.value)
+        elif result.status == "failed":
+            fut.set_exception(result.error)
+        else:
+            fut.cancel(msg=result.status)
+
+    def cancel_all(self) -> None:
+        for fut in list(self._futures.values()):
+            fut.cancel(msg="Engine exited")
+        self._futures.clear()
+
+
+# Pending requests of the current process.
+PENDING_ACTIONS = PendingActions()
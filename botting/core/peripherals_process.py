@@ -2,9 +2,11 @@ import asyncio
 import logging
 import multiprocessing.connection
 
+from contextlib import aclosing
+
 from botting.screen_recorder import Recorder
 from botting.communications import DiscordIO, BaseParser
-from botting.utilities import setup_child_proc_logging
+from botting.utilities import pipe_messages, setup_child_proc_logging
 
 from .action_data import ActionRequest
 
@@ -63,9 +65,8 @@ class PeripheralsProcess:
         :return: None
         """
         try:
-            while True:
-                if await asyncio.to_thread(self.pipe_main_proc.poll):
-                    message: str = self.pipe_main_proc.recv()
+            async with aclosing(pipe_messages(self.pipe_main_proc)) as messages:
+                async for message in messages:
                     action: ActionRequest = self.discord_parser.parse_message(message)
                     # TODO - Finish this
                     if action is not None:
@@ -2,15 +2,20 @@ import asyncio
 import logging
 import logging.handlers
 import multiprocessing.connection
+import os
+import time
 
 from typing import Self
 
 from .async_task_manager import AsyncTaskManager
+from .attribute_metrics import MetricsExporter
 from .bot import Bot
 from .engine import Engine
 from .peripherals_process import PeripheralsProcess
+from .shared_primitives import SHARED_PRIMITIVES
 from botting.communications import BaseParser
-from botting.controller import release_all
+from botting.controller import INPUT_TIMING, release_all
+from paths import ROOT
 
 logger = logging.getLogger(__name__)
 LOG_LEVEL = logging.INFO
@@ -27,11 +32,21 @@ class SessionManager:
     - TaskManager
     """
 
-    def __init__(self, discord_parser: type[BaseParser]) -> None:
+    def __init__(
+        self,
+        discord_parser: type[BaseParser],
+        share_ocr_cache: bool = False,
+        metrics_interval: float | None = None,
+    ) -> None:
         """
         Creates all necessary objects to start a new Session.
         :param discord_parser: A callable that parses discord message and returns
         ActionRequests.
+        :param share_ocr_cache: If True, OCR results are shared across all Engines
+        through a dictionary living in the Manager process.
+        :param metrics_interval: If specified, each Engine records the latency
+        metrics of its BotData attributes and sends them at this interval (seconds).
+        They are exported into the logs folder.
         """
         # Create a Manager Process to share data between processes.
         self.process_manager = multiprocessing.Manager()
@@ -40,6 +55,12 @@ class SessionManager:
             proxy_request=self.process_manager.Condition(),
             # _disabled=self.process_manager.dict(),
         )
+        if share_ocr_cache:
+            self.metadata["ocr_cache"] = self.process_manager.dict()
+        self.metrics_exporter = None
+        if metrics_interval:
+            self.metadata["metrics_interval"] = metrics_interval
+            self.metrics_exporter = MetricsExporter(os.path.join(ROOT, "logs"))
         self.metadata["ignored_keys"] = set(self.metadata.keys()).union(
             {"ignored_keys"}
         )
@@ -58,6 +79,7 @@ class SessionManager:
         )
 
         self.engines: list[multiprocessing.Process] = []
+        self.engine_pipes: list[multiprocessing.connection.Connection] = []
         self.listeners: list[asyncio.Task] = []
         self.discord_listener: asyncio.Task | None = None
         self.proxy_listener: asyncio.Task | None = None
@@ -128,16 +150,29 @@ class SessionManager:
         self.barrier = self.process_manager.Barrier(
             sum(len(group) for group in grouped_bots)
         )
+        self._provision_primitives([bot for group in grouped_bots for bot in group])
+
         for group in grouped_bots:
             self.bots.extend(group)
+            for bot in group:
+                INPUT_TIMING.register(bot.get_handle_from_ign(bot.ign), bot.ign)
             engine_side, listener_side = multiprocessing.Pipe()
-            engine_proc = Engine.start(engine_side, self.metadata, group, self.barrier)
+            engine_proc = Engine.start(
+                engine_side,
+                self.metadata,
+                group,
+                self.barrier,
+                SHARED_PRIMITIVES.export(),
+            )
             engine_listener = Engine.listener(
                 listener_side,
                 self.task_manager.queue,
                 engine_proc,
                 self.peripherals.pipe_main_proc,
+                self.metrics_exporter,
+                self.engine_pipes,
             )
+            self.engine_pipes.append(listener_side)
             self.engines.append(engine_proc)
             self.listeners.append(engine_listener)
         t_done, t_pending = await asyncio.wait(
@@ -156,9 +191,33 @@ class SessionManager:
             raise t_done.exception()
         logger.info("All bots have been stopped. Session is about to exit.")
 
+    @staticmethod
+    def _provision_primitives(bots: list[Bot]) -> None:
+        """
+        Declarative provisioning phase, performed before any Engine is spawned.
+        Every primitive declared by the DecisionMakers of all Bots is created in a
+        single batch, such that DecisionMakers do not request them one at a time
+        through the Manager process when they are instantiated.
+        :param bots: All Bots of the session.
+        :return:
+        """
+        start = time.perf_counter()
+        declared = {}
+        for bot in bots:
+            declared.update(bot.shared_primitives())
+        for name, primitive_type in declared.items():
+            SHARED_PRIMITIVES.provision(name, primitive_type)
+        logger.log(
+            LOG_LEVEL,
+            f"Provisioned {len(declared)} primitives for {len(bots)} bots in "
+            f"{time.perf_counter() - start:.3f}s.",
+        )
+
     async def _monitor_proxy(self) -> None:
         """
         Monitor the proxy request queue.
+        Only primitives which were not provisioned upfront are requested here.
+        All pending requests are fulfilled at once upon each notification.
         :return:
         """
         notifier = self.metadata["proxy_request"]
@@ -169,17 +228,21 @@ class SessionManager:
                     if self.proxy_listener.cancelling():
                         return
                 # Reaching here, we've reacquired the Lock after being notified
-                key = next(
-                    key
+                ignored = self.metadata["ignored_keys"]
+                pending = {
+                    key: self.metadata[key]
                     for key in self.metadata.keys()
-                    if key not in self.metadata["ignored_keys"]
-                )
-                type_, args, kwargs = self.metadata[key]
-                logger.log(LOG_LEVEL, f"Request received from {key} for {type_}.")
-                self.metadata[key] = getattr(self.process_manager, type_)(
-                    *args, **kwargs
-                )
-                cond.notify_all()  # The proxy request has been processed, notify waiter
+                    if key not in ignored
+                }
+                # Fulfilled requests may not have been retrieved by their requester yet
+                pending = {k: v for k, v in pending.items() if isinstance(v, tuple)}
+                for key, (type_, args, kwargs) in pending.items():
+                    logger.log(LOG_LEVEL, f"Request received from {key} for {type_}.")
+                    pending[key] = getattr(self.process_manager, type_)(
+                        *args, **kwargs
+                    )
+                self.metadata.update(pending)
+                cond.notify_all()  # The proxy requests have been processed
 
         while True:
             await asyncio.to_thread(_single_cycle, notifier)
@@ -0,0 +1,181 @@
+"""
+Native synchronization primitives shared between the MainProcess and all Engines.
+Primitives living in the Manager process are proxies, such that every acquire,
+release, wait or notify is a round trip to that process. Native primitives are
+shared semaphores instead, but they can only be transferred to a child process when
+it is spawned. They are therefore provisioned by the MainProcess before Engines are
+spawned, and passed to the Engines as arguments.
+
+Afterward, primitives are still sent through pipes (for instance, the release method
+of a Lock as the callback of an ActionRequest). Those are then pickled by name and
+resolved against the registry of the receiving process.
+"""
+import logging
+import multiprocessing
+import multiprocessing.context
+import multiprocessing.synchronize
+
+from typing import Any
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+
+def _condition() -> multiprocessing.synchronize.Condition:
+    # A standard Lock (instead of an RLock) may be released by other processes.
+    return multiprocessing.Condition(multiprocessing.Lock())
+
+
+PRIMITIVE_TYPES = {
+    "Lock": multiprocessing.Lock,
+    "RLock": multiprocessing.RLock,
+    "Condition": _condition,
+    "Event": multiprocessing.Event,
+    "Semaphore": multiprocessing.Semaphore,
+    "BoundedSemaphore": multiprocessing.BoundedSemaphore,
+}
+
+
+class SharedPrimitive:
+    """
+    Wraps a native primitive such that it can be pickled by name once Engines are
+    running. Only the methods exposed here are forwarded, such that bound methods
+    (e.g. lock.release used as a callback) are also pickled by name.
+    """
+
+    __slots__ = ("name", "type", "_primitive")
+
+    def __init__(self, name: str, primitive_type: str, primitive: Any) -> None:
+        self.name = name
+        self.type = primitive_type
+        self._primitive = primitive
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name}, {self.type})"
+
+    def __reduce__(self) -> tuple:
+        if multiprocessing.context.get_spawning_popen() is not None:
+            # The native primitive may only be transferred when a process is spawned
+            return _restore, (self.name, self.type, self._primitive)
+        return _lookup, (self.name,)
+
+    def __enter__(self) -> bool:
+        return self._primitive.__enter__()
+
+    def __exit__(self, *args) -> None:
+        return self._primitive.__exit__(*args)
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        return self._primitive.acquire(blocking, timeout)
+
+    def release(self) -> None:
+        self._primitive.release()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._primitive.wait(timeout)
+
+    def wait_for(self, predicate: callable, timeout: float = None) -> bool:
+        return self._primitive.wait_for(predicate, timeout)
+
+    def notify(self, n: int = 1) -> None:
+        self._primitive.notify(n)
+
+    def notify_all(self) -> None:
+        self._primitive.notify_all()
+
+    def set(self) -> None:
+        self._primitive.set()
+
+    def clear(self) -> None:
+        self._primitive.clear()
+
+    def is_set(self) -> bool:
+        return self._primitive.is_set()
+
+
+class SharedPrimitives:
+    """
+    Registry of the native primitives available to the current process, by name.
+    The MainProcess provisions them, and each Engine attaches to the registry it
+    received when spawned.
+    """
+
+    def __init__(self) -> None:
+        self._primitives: dict[str, SharedPrimitive] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self._primitives)} primitives)"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._primitives
+
+    def __len__(self) -> int:
+        return len(self._primitives)
+
+    def provision(self, name: str, primitive_type: str) -> SharedPrimitive:
+        """
+        Called from the MainProcess, before Engines are spawned.
+        Creates a native primitive, unless one already exists under that name.
+        :param name: Name under which the primitive is requested.
+        :param primitive_type: One of PRIMITIVE_TYPES.
+        :return: The primitive registered under that name.
+        """
+        assert multiprocessing.current_process().name == "MainProcess"
+        existing = self._primitives.get(name)
+        if existing is not None:
+            if existing.type != primitive_type:
+                raise ValueError(
+                    f"{name} already provisioned as {existing.type}, "
+                    f"not {primitive_type}."
+                )
+            return existing
+        primitive = SharedPrimitive(
+            name, primitive_type, PRIMITIVE_TYPES[primitive_type]()
+        )
+        self._primitives[name] = primitive
+        logger.log(LOG_LEVEL, f"Provisioned {primitive}.")
+        return primitive
+
+    def get(self, name: str, primitive_type: str = None) -> SharedPrimitive | None:
+        """
+        :param name: Name under which the primitive was provisioned.
+        :param primitive_type: If specified, the primitive is only returned when it
+         is of that type.
+        :return: The primitive, or None if it was not provisioned.
+        """
+        primitive = self._primitives.get(name)
+        if primitive is None or primitive_type not in (None, primitive.type):
+            return None
+        return primitive
+
+    def export(self) -> dict[str, SharedPrimitive]:
+        """
+        :return: The primitives to pass to an Engine when it is spawned.
+        """
+        return dict(self._primitives)
+
+    def attach(self, primitives: dict[str, SharedPrimitive]) -> None:
+        """
+        Called within an Engine, with the primitives received at spawn.
+        """
+        self._primitives.update(primitives)
+
+
+def _restore(name: str, primitive_type: str, primitive: Any) -> SharedPrimitive:
+    restored = SHARED_PRIMITIVES.get(name)
+    if restored is None:
+        restored = SharedPrimitive(name, primitive_type, primitive)
+        SHARED_PRIMITIVES._primitives[name] = restored
+    return restored
+
+
+def _lookup(name: str) -> SharedPrimitive:
+    primitive = SHARED_PRIMITIVES.get(name)
+    if primitive is None:
+        process = multiprocessing.current_process().name
+        raise KeyError(f"{name} was not provisioned in {process}.")
+    return primitive
+
+
+# Registry of the current process.
+SHARED_PRIMITIVES = SharedPrimitives()
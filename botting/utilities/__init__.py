@@ -3,6 +3,7 @@ from .client_handler import get_open_clients
 from .child_process import setup_child_proc_logging
 from .config_reader import config_reader
 from .objects_by_id import get_object_by_id
+from .pipe_reader import pipe_messages
 from .functions_helpers import cooldown, randomize_params
 from .screenshots import (
     take_screenshot,
@@ -0,0 +1,56 @@
+"""
+Asynchronous reception of messages from a multiprocessing Connection.
+When the event loop supports it (selector-based loops, on Linux), the file descriptor
+of the Connection is registered with loop.add_reader, such that the loop itself is
+woken up when messages are available. Otherwise (e.g. the Proactor loop on Windows),
+a thread polls the Connection instead.
+Either way, all available messages are drained on each wake-up.
+"""
+import asyncio
+import logging
+import multiprocessing.connection
+
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+
+async def pipe_messages(
+    pipe: multiprocessing.connection.Connection,
+) -> AsyncIterator[Any]:
+    """
+    Yields every message received through the pipe.
+    Should be used within contextlib.aclosing, such that the file descriptor is
+    unregistered as soon as the caller stops iterating.
+    :param pipe: The Connection to receive from.
+    :return: An async generator of the received messages.
+    """
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    fd = pipe.fileno()
+    try:
+        loop.add_reader(fd, ready.set)
+    except NotImplementedError:
+        logger.log(LOG_LEVEL, f"{loop} does not support readers. Polling {pipe}.")
+        async for message in _poll_messages(pipe):
+            yield message
+        return
+
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            while pipe.poll():
+                yield pipe.recv()
+    finally:
+        loop.remove_reader(fd)
+
+
+async def _poll_messages(
+    pipe: multiprocessing.connection.Connection,
+) -> AsyncIterator[Any]:
+    while True:
+        if await asyncio.to_thread(pipe.poll):
+            while pipe.poll():
+                yield pipe.recv()
@@ -3,3 +3,6 @@ from .in_game_visuals import (
     InGameToggleableVisuals,
     InGameDynamicVisuals,
 )
+from .ocr_batch import read_batch
+from .ocr_cache import OCRCache, OCR_CACHE
+from .ui_states import UIStateRegistry, UI_STATES
@@ -8,7 +8,9 @@ import pytesseract
 
 from abc import ABC, abstractmethod
 
-from botting.utilities import Box, take_screenshot, find_image
+from botting.utilities import Box, take_screenshot
+from .ocr_cache import OCRCache, OCR_CACHE
+from .ui_states import UI_STATES
 
 
 class InGameBaseVisuals(ABC):
@@ -16,8 +18,12 @@ class InGameBaseVisuals(ABC):
     Base class for in-game visuals.
     Should be used for any on-screen component that is "fixed" in game,
     meaning that it will always be in the same position.
+    Text read through OCR is cached based on the image content. Set _ocr_cache to
+    None in a subclass to disable caching.
     """
 
+    _ocr_cache: OCRCache | None = OCR_CACHE
+
     @abstractmethod
     def _preprocess_img(self, image: np.ndarray) -> np.ndarray:
         """
@@ -63,6 +69,36 @@ class InGameBaseVisuals(ABC):
          to be considered valid. Defaults to 15 (this is quite low).
         :return:
         """
+        if self._ocr_cache is None:
+            return self._read_from_img(image, config, confidence_level)
+
+        key = self._ocr_key(image, config, confidence_level)
+        text = self._ocr_cache.get(key)
+        if text is None:
+            text = self._read_from_img(image, config, confidence_level)
+            self._ocr_cache.put(key, text)
+        return text
+
+    def _ocr_key(
+        self, image: np.ndarray, config: str | None, confidence_level: int
+    ) -> bytes:
+        """
+        Preprocessing is deterministic for a given visual class, so the raw image
+        and class are hashed instead. This way, cache hits also skip preprocessing.
+        """
+        return self._ocr_cache.make_key(
+            image,
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            config,
+            confidence_level,
+        )
+
+    def _read_from_img(
+        self, image: np.ndarray, config: str | None, confidence_level: int
+    ) -> str:
+        """
+        Preprocesses the image and reads it through pytesseract, bypassing the cache.
+        """
         img = self._preprocess_img(image)
         result = pytesseract.image_to_data(
             img, lang="eng", config=config or "", output_type=pytesseract.Output.DICT
@@ -139,6 +175,8 @@ class InGameDynamicVisuals(InGameToggleableVisuals, ABC):
      as long as it is unique enough to be detected only once.
     The detection is made through templateMatching.
      If the visual is obstructed, it may not be properly detected.
+    Template matching is skipped as long as the icon is unchanged at the position
+     where it was last found.
     """
 
     _menu_icon_detection_needle: np.ndarray
@@ -157,7 +195,9 @@ class InGameDynamicVisuals(InGameToggleableVisuals, ABC):
         """
         if client_img is None:
             client_img = take_screenshot(handle)
-        boxes = find_image(client_img, cls._menu_icon_detection_needle)
+        boxes = UI_STATES.find(
+            (cls.__name__, handle), client_img, cls._menu_icon_detection_needle
+        )
         if len(boxes) > 1:
             raise ValueError("More than one menu icon detected")
         elif boxes:
@@ -0,0 +1,157 @@
+"""
+Batched OCR. Several regions are stitched into a single page, which is read through
+a single tesseract invocation. Results are then split back to their originating
+region based on the vertical position of each word on the page.
+Launching tesseract has a significant fixed cost, so reading N regions at once is
+much cheaper than N separate reads.
+"""
+import cv2
+import itertools
+import logging
+import numpy as np
+import pytesseract
+import re
+
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .in_game_visuals import InGameBaseVisuals
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+PAGE_MARGIN_PX = 10
+MIN_SEPARATOR_PX = 20
+_PSM_PATTERN = re.compile(r"--psm\s+\d+")
+
+
+def read_batch(
+    regions: Iterable[tuple["InGameBaseVisuals", np.ndarray, str | None]],
+    confidence_level: int = 15,
+) -> list[str]:
+    """
+    Reads text from multiple (raw) images, using as few tesseract calls as possible.
+    Regions are grouped by visual class and config (ignoring page segmentation mode),
+    since these determine preprocessing and character whitelist. Each group is then
+    read with a single tesseract call.
+    Cached results are used whenever available, and new results are cached. Both are
+    keyed on the config with which pages are actually read (see batch_config), since
+    they may differ from single reads of the same region.
+    :param regions: Tuples of (visual, raw image, config). The visual is the instance
+     whose _preprocess_img is applied on the image.
+    :param confidence_level: The minimum confidence level for a character
+     to be considered valid.
+    :return: The text read for each region, in the same order as the input.
+    """
+    regions = list(regions)
+    results: list[str | None] = [None] * len(regions)
+    keys: list[bytes | None] = [None] * len(regions)
+
+    for idx, (visual, image, config) in enumerate(regions):
+        if visual._ocr_cache is not None:
+            keys[idx] = visual._ocr_key(image, batch_config(config), confidence_level)
+            results[idx] = visual._ocr_cache.get(keys[idx])
+
+    def _group(idx: int) -> tuple:
+        visual, _, config = regions[idx]
+        return type(visual), batch_config(config)
+
+    missing = sorted((i for i, res in enumerate(results) if res is None), key=_group)
+    for (_, config), group in itertools.groupby(missing, key=_group):
+        group = list(group)
+        processed = [regions[i][0]._preprocess_img(regions[i][1]) for i in group]
+        texts = _read_stitched(processed, config, confidence_level)
+        for i, text in zip(group, texts):
+            results[i] = text
+            if keys[i] is not None:
+                regions[i][0]._ocr_cache.put(keys[i], text)
+
+    return results
+
+
+def batch_config(config: str | None) -> str:
+    """
+    :return: The config with which a page of regions read with config is read.
+     Each region is expected to contain a single line, but the page has several.
+    """
+    return f"--psm 6 {_PSM_PATTERN.sub('', config or '').strip()}".strip()
+
+
+def stitch(images: list[np.ndarray]) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """
+    Stacks preprocessed images vertically into a single grayscale page.
+    Each image is padded with its own background color, and separated from the next
+    one by a band of background color, such that tesseract sees distinct lines.
+    :param images: Preprocessed images. May be grayscale or BGR.
+    :return: The page and the (top, bottom) rows occupied by each image.
+    """
+    images = [_as_gray(img) for img in images]
+    backgrounds = [_background_value(img) for img in images]
+    page_background = int(np.bincount(backgrounds).argmax())
+    width = max(img.shape[1] for img in images) + 2 * PAGE_MARGIN_PX
+    separator = max(MIN_SEPARATOR_PX, max(img.shape[0] for img in images) // 2)
+
+    bands = []
+    offsets = []
+    top = PAGE_MARGIN_PX
+    bands.append(np.full((PAGE_MARGIN_PX, width), page_background, dtype=np.uint8))
+    for img, background in zip(images, backgrounds):
+        # Normalize polarity such that all text is drawn over the page background
+        if background != page_background:
+            img = cv2.bitwise_not(img)
+        band = np.full((img.shape[0], width), page_background, dtype=np.uint8)
+        band[:, PAGE_MARGIN_PX : PAGE_MARGIN_PX + img.shape[1]] = img
+        bands.append(band)
+        offsets.append((top, top + img.shape[0]))
+        bands.append(np.full((separator, width), page_background, dtype=np.uint8))
+        top += img.shape[0] + separator
+    return np.vstack(bands), offsets
+
+
+def split_results(
+    data: dict[str, list], offsets: list[tuple[int, int]], confidence_level: int
+) -> list[str]:
+    """
+    Assigns each word found by tesseract to the region in which its vertical center
+    lies.
+    :param data: Output of pytesseract.image_to_data, as a dictionary.
+    :param offsets: The (top, bottom) rows occupied by each region on the page.
+    :param confidence_level: The minimum confidence level for a word to be kept.
+    :return: The text of each region.
+    """
+    words: list[list[str]] = [[] for _ in offsets]
+    tops = [top for top, _ in offsets]
+    for i in range(len(data["text"])):
+        if int(float(data["conf"][i])) < confidence_level:
+            continue
+        center = data["top"][i] + data["height"][i] / 2
+        idx = int(np.searchsorted(tops, center, side="right")) - 1
+        if idx >= 0 and center < offsets[idx][1]:
+            words[idx].append(data["text"][i])
+    return [" ".join(w) for w in words]
+
+
+def _read_stitched(
+    images: list[np.ndarray], config: str, confidence_level: int
+) -> list[str]:
+    page, offsets = stitch(images)
+    data = pytesseract.image_to_data(
+        page, lang="eng", config=config, output_type=pytesseract.Output.DICT
+    )
+    logger.log(LOG_LEVEL, f"Read {len(images)} regions in a single tesseract call.")
+    return split_results(data, offsets, confidence_level)
+
+
+def _as_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image.astype(np.uint8, copy=False)
+
+
+def _background_value(image: np.ndarray) -> int:
+    """
+    The background is assumed to be the most frequent value along the border.
+    Returned value is binarized (0 or 255) to determine the image polarity.
+    """
+    border = np.concatenate([image[0], image[-1], image[:, 0], image[:, -1]])
+    return 255 if np.bincount(border, minlength=256).argmax() >= 128 else 0
@@ -0,0 +1,161 @@
+"""
+Content-addressed cache placed in front of pytesseract.
+Many in-game regions that are read through OCR (level, AP, mesos, IGN, etc.) remain
+pixel-identical for long periods of time. Instead of running tesseract on each read,
+the image bytes are hashed and the previous result is returned if the same image
+was already read with the same configuration.
+"""
+import hashlib
+import logging
+import multiprocessing.managers
+import threading
+import numpy as np
+
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+DEFAULT_MAX_SIZE = 512
+
+
+class OCRCache:
+    """
+    LRU cache mapping a hash of (image, reader, config) to the text read by tesseract.
+    Keeps track of hits, misses and evictions such that its efficiency can be monitored.
+
+    The cache always lives locally within a process. Optionally, a shared dictionary
+    (usually a DictProxy created by the SessionManager) can be attached, in which case
+    local misses are looked up in the shared dictionary before tesseract is called.
+    This allows Engines to benefit from each other's results (e.g. same UI
+    layout across all clients).
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        shared: multiprocessing.managers.DictProxy | dict | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.shared = shared
+        self._entries: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(size={len(self)}/{self.max_size}, "
+            f"hit_rate={self.hit_rate:.2%})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: Ratio of lookups (local or shared) that avoided a call to tesseract.
+        """
+        total = self.hits + self.shared_hits + self.misses
+        return (self.hits + self.shared_hits) / total if total else 0.0
+
+    @staticmethod
+    def make_key(image: np.ndarray, *discriminants) -> bytes:
+        """
+        Computes the cache key of an image.
+        Shape and dtype are included such that two images with identical bytes but
+        different dimensions are not confused.
+        :param image: The image to hash.
+        :param discriminants: Anything else that influences the OCR result, such as the
+         reader class, tesseract config and confidence level.
+        :return: A 16-bytes digest.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(np.ascontiguousarray(image).data)
+        hasher.update(repr((image.shape, image.dtype.str, *discriminants)).encode())
+        return hasher.digest()
+
+    def get(self, key: bytes) -> str | None:
+        """
+        Looks up the local entries first, then the shared dictionary (if any).
+        :param key: The key computed by make_key.
+        :return: The cached text, or None if the key is unknown.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                    self._insert(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key: bytes, value: str) -> None:
+        """
+        Stores a new result, both locally and in the shared dictionary (if any).
+        The shared dictionary is not evicted from. Instead, writes stop once it is full.
+        :param key: The key computed by make_key.
+        :param value: The text read by tesseract.
+        :return:
+        """
+        with self._lock:
+            self._insert(key, value)
+        if self.shared is not None and len(self.shared) < self.max_size:
+            self.shared[key] = value
+
+    def _insert(self, key: bytes, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def attach(
+        self, shared: multiprocessing.managers.DictProxy | dict | None
+    ) -> None:
+        """
+        Attaches (or detaches, if None) a shared dictionary to the cache.
+        :param shared: A dictionary shared across processes.
+        :return:
+        """
+        self.shared = shared
+        logger.log(LOG_LEVEL, f"{self} shared store set to {type(shared).__name__}.")
+
+    def clear(self) -> None:
+        """
+        Removes all local entries and resets the statistics.
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, float]:
+        """
+        :return: Summary of the cache efficiency.
+        """
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+# Default cache instance, used by all InGameBaseVisuals within a process.
+OCR_CACHE = OCRCache()
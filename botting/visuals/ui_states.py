@@ -0,0 +1,212 @@
+"""
+Registry of known UI states.
+Many checks compare a fixed region of the client to known images (menu icons, titles,
+active tabs, etc.), usually through template matching or color detection. Since UI
+elements are pixel-identical whenever they are in the same state, the crop of each
+region is hashed and looked up against the hashes of states already seen. The
+expensive detection is only performed on a miss, and its result is learned such that
+subsequent lookups of the same state are a single dictionary access.
+"""
+import hashlib
+import logging
+import threading
+import numpy as np
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from botting.utilities import (
+    Box,
+    find_image,
+    CLIENT_HORIZONTAL_MARGIN_PX,
+    CLIENT_VERTICAL_MARGIN_PX,
+)
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+DEFAULT_MAX_STATES = 256
+_MISSING = object()
+
+
+class UIStateRegistry:
+    """
+    Maps, for each region, the hash of a crop to the state it represents.
+    Regions are identified by any hashable key (usually a string naming the check).
+    Known states can be registered upfront. Unknown crops are resolved by a fallback
+    function (the original detection method) and the result is learned.
+    Each region holds at most max_states entries, the least recently used being
+    evicted first. This prevents unbounded growth when a region overlaps moving
+    parts of the game (e.g. the map behind a menu).
+
+    The registry can also remember where a needle image was last found. As long as
+    the crop at that location is unchanged, template matching is skipped.
+    """
+
+    def __init__(self, max_states: int = DEFAULT_MAX_STATES) -> None:
+        self.max_states = max_states
+        self._states: dict[Hashable, OrderedDict[bytes, Any]] = {}
+        self._locations: dict[Hashable, list[tuple[Box, bytes]]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(regions={len(self._states)}, "
+            f"hit_rate={self.hit_rate:.2%})"
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @staticmethod
+    def image_hash(image: np.ndarray) -> bytes:
+        """
+        :param image: The crop to hash.
+        :return: A 16-bytes digest of the image content and shape.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(np.ascontiguousarray(image).data)
+        hasher.update(repr((image.shape, image.dtype.str)).encode())
+        return hasher.digest()
+
+    def is_registered(self, region: Hashable) -> bool:
+        return region in self._states
+
+    def register(self, region: Hashable, image: np.ndarray, state: Any) -> None:
+        """
+        Registers a known state for a region.
+        :param region: Key identifying the region.
+        :param image: Crop of the region when in that state.
+        :param state: The state represented by the crop.
+        :return:
+        """
+        with self._lock:
+            self._insert(region, self.image_hash(image), state)
+
+    def lookup(
+        self,
+        region: Hashable,
+        image: np.ndarray,
+        fallback: Callable[[np.ndarray], Any] | None = None,
+        learn: bool = True,
+    ) -> Any:
+        """
+        Returns the state of a region based on its crop.
+        :param region: Key identifying the region.
+        :param image: Current crop of the region.
+        :param fallback: Called with the crop when its hash is unknown. Its result is
+         returned and, if learn is True, associated with the crop. It must therefore
+         only depend on the crop.
+        :param learn: Whether to learn the result of the fallback.
+        :return: The state of the region. None if unknown and no fallback is provided.
+        """
+        key = self.image_hash(image)
+        with self._lock:
+            states = self._states.get(region)
+            state = _MISSING if states is None else states.get(key, _MISSING)
+            if state is not _MISSING:
+                states.move_to_end(key)
+                self.hits += 1
+                return state
+            self.misses += 1
+
+        if fallback is None:
+            return None
+        state = fallback(image)
+        if learn:
+            with self._lock:
+                self._insert(region, key, state)
+            logger.log(LOG_LEVEL, f"Learned state {state} for region {region}.")
+        return state
+
+    def find(
+        self,
+        region: Hashable,
+        haystack: np.ndarray,
+        needle: np.ndarray,
+        **kwargs,
+    ) -> list[Box]:
+        """
+        Finds a needle image within a haystack, using template matching only when the
+        crops at the locations previously found have changed.
+        :param region: Key identifying the search. Should include the client handle
+         when several clients are used.
+        :param haystack: The image to search in.
+        :param needle: The image to search for.
+        :param kwargs: Passed to find_image.
+        :return: A list of boxes where the needle image was found.
+        """
+        add_margins = kwargs.get("add_margins", True)
+        with self._lock:
+            known = self._locations.get(region)
+        if known and all(
+            self.image_hash(self._crop(haystack, box, add_margins)) == key
+            for box, key in known
+        ):
+            with self._lock:
+                self.hits += 1
+            return [box for box, _ in known]
+
+        boxes = find_image(haystack, needle, **kwargs)
+        with self._lock:
+            self.misses += 1
+            if boxes:
+                self._locations[region] = [
+                    (box, self.image_hash(self._crop(haystack, box, add_margins)))
+                    for box in boxes
+                ]
+            else:
+                self._locations.pop(region, None)
+        return boxes
+
+    def forget(self, region: Hashable | None = None) -> None:
+        """
+        Removes learned states and locations of a region, or of all regions.
+        :param region: Key identifying the region. If None, everything is removed.
+        :return:
+        """
+        with self._lock:
+            if region is None:
+                self._states.clear()
+                self._locations.clear()
+            else:
+                self._states.pop(region, None)
+                self._locations.pop(region, None)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "regions": len(self._states),
+            "states": sum(len(states) for states in self._states.values()),
+            "locations": len(self._locations),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _insert(self, region: Hashable, key: bytes, state: Any) -> None:
+        states = self._states.setdefault(region, OrderedDict())
+        states[key] = state
+        states.move_to_end(key)
+        while len(states) > self.max_states:
+            states.popitem(last=False)
+
+    @staticmethod
+    def _crop(image: np.ndarray, box: Box, add_margins: bool) -> np.ndarray:
+        """
+        Same as Box.extract_client_img, without copying the entire image.
+        """
+        top, left = box.top, box.left
+        if add_margins:
+            top -= CLIENT_VERTICAL_MARGIN_PX
+            left -= CLIENT_HORIZONTAL_MARGIN_PX
+        top, left = max(top, 0), max(left, 0)
+        return image[top : top + box.height, left : left + box.width]
+
+
+# Default registry, shared by all visuals within a process.
+UI_STATES = UIStateRegistry()
@@ -3,7 +3,7 @@ import random
 from typing import Literal
 
 from botting import controller
-from botting.core import ActionRequest, ActionWithValidation
+from botting.core import ActionRequest, ActionWithValidation, PROCEDURES
 from royals.model.interface import Minimap, AbilityMenu
 from .priorities import ERROR_HANDLING
 
@@ -18,6 +18,7 @@ async def toggle_menu(
     )
 
 
+@PROCEDURES.register
 async def toggle_minimap(
     handle: int,
     ign: str,
@@ -25,6 +26,7 @@ async def toggle_minimap(
     await toggle_menu(handle, ign, "Minimap Toggle")
 
 
+@PROCEDURES.register
 async def toggle_ability_menu(
     handle: int,
     ign: str,
@@ -32,6 +34,7 @@ async def toggle_ability_menu(
     await toggle_menu(handle, ign, "Ability Menu")
 
 
+@PROCEDURES.register
 async def expand_inventory(handle: int, target: tuple[int, int], **kwargs) -> None:
     """
     Must be called after the inventory menu is displayed.
@@ -49,6 +52,7 @@ async def expand_inventory(handle: int, target: tuple[int, int], **kwargs) -> No
     await controller.mouse_move(handle, next_target, total_duration=0)
 
 
+@PROCEDURES.register
 async def toggle_inventory(
     handle: int,
     ign: str,
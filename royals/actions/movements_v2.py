@@ -61,6 +61,9 @@ def move(
     limit = initial_duration + duration
     if structure is None:
         structure = _create_initial_input(handle, direction, secondary_direction)
+        structure.mark("move", 0)
+    else:
+        structure.mark("move")
 
     repeated_key: str = secondary_direction or direction  # noqa
 
@@ -92,6 +95,9 @@ def single_jump(
     # TODO - Adjust the hard-coded 0.75 delay appropriately
     if structure is None:
         structure = _create_initial_input(handle, direction, None)
+        structure.mark("single_jump", 0)
+    else:
+        structure.mark("single_jump")
     for key in structure.keys_held:
         if key == direction:
             continue
@@ -152,6 +158,9 @@ def jump_on_rope(
     """
     if structure is None:
         structure = _create_initial_input(handle, direction, None)
+        structure.mark("jump_on_rope", 0)
+    else:
+        structure.mark("jump_on_rope")
     for key in structure.keys_held:
         if key == direction:
             continue
@@ -196,6 +205,9 @@ def teleport(
     """
     if structure is None:
         structure = _create_initial_input(handle, direction, None)
+        structure.mark("teleport", 0)
+    else:
+        structure.mark("teleport")
 
     initial_duration = structure.duration
     limit = initial_duration + teleport_skill.animation_time * num_times
@@ -254,11 +266,11 @@ def telecast(
 
     # Modify the structure such that teleports are combined with ultimate casts
     ultimate_key = ultimate_skill.key_bind(ign)
+    structure.mark("telecast", 0)
     structure.forced_key_releases.append(ultimate_key)
     for idx, (key, event) in enumerate(zip(structure.keys, structure.events)):
         if key == teleport_key and event == "keydown":
-            structure.keys[idx] = [teleport_key, ultimate_key]
-            structure.events[idx] = ["keydown", "keydown"]
+            structure.replace(idx, [teleport_key, ultimate_key], ["keydown"] * 2)
     return structure.truncate(ultimate_skill.animation_time)
 
 
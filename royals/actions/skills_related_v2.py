@@ -1,5 +1,6 @@
 import asyncio
 from botting import controller
+from botting.core import PROCEDURES
 from botting.models_abstractions import Skill
 
 
@@ -18,6 +19,7 @@ def cast_skill(
     :return:
     """
     structure = controller.KeyboardInputWrapper(handle)
+    structure.mark("cast_skill")
     held_keys = controller.get_held_movement_keys(handle)
 
     if "down" in held_keys:
@@ -44,6 +46,7 @@ def cast_skill(
     return structure
 
 
+@PROCEDURES.register
 async def cast_skill_single_press(handle: int, ign: str, skill: Skill) -> None:
     await controller.press(handle, skill.key_bind(ign))
     await asyncio.sleep(skill.animation_time)
@@ -1,7 +1,7 @@
 import multiprocessing.connection
 import multiprocessing.managers
 from abc import ABC
-from botting.core import Bot
+from botting.core import Bot, LastValidHistory
 from botting.utilities import take_screenshot
 from royals import royals_ign_finder, royals_job_finder
 from royals.model.characters import MAPPING as CHARACTER_MAPPING
@@ -60,4 +60,5 @@ class RoyalsBot(Bot, ABC):
             "current_client_img",
             lambda: take_screenshot(self.data.handle),
             threshold=0.1,
+            history=LastValidHistory(),
         )
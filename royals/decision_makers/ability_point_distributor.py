@@ -19,6 +19,8 @@ LOG_LEVEL = logging.WARNING
 class AbilityPointDistributor(MenusMixin, UIMixin, DecisionMaker):
     CONFIG_KEY = "Ability Menu"
     _throttle = 30.0
+    _trigger = "current_level_img"
+    _primitives = {"{cls}({ign})": "Condition"}
 
     def __init__(
         self,
@@ -35,8 +37,6 @@ class AbilityPointDistributor(MenusMixin, UIMixin, DecisionMaker):
         self._prev_level_img = self.data.current_level_img.copy()
 
     async def _decide(self) -> None:
-        self.data.update_attribute("current_level_img")
-
         if not np.array_equal(self.data.current_level_img, self._prev_level_img):
             logger.log(LOG_LEVEL, f"Level up detected for {self.data.ign}.")
             ensure_ability_menu_displayed(
@@ -8,8 +8,15 @@ import numpy as np
 import os
 import random
 from botting import controller, PARENT_LOG
-from botting.core import ActionRequest, BotData, DecisionMaker, DiscordRequest
-from botting.utilities import Box, find_image
+from botting.core import (
+    ActionRequest,
+    BotData,
+    DecisionMaker,
+    DiscordRequest,
+    SHARED_PRIMITIVES,
+)
+from botting.utilities import Box
+from botting.visuals import UI_STATES
 from paths import ROOT
 from royals.actions import toggle_inventory, expand_inventory, priorities
 from royals.actions.skills_related_v2 import cast_skill_single_press
@@ -33,6 +40,7 @@ class InventoryManager(
     # TODO - Add NPC'ing of ETC items as well
     _throttle = 180
     _TIME_LIMIT = 300
+    _primitives = {"{cls}({ign})": "Condition"}
     _DISTANCE_TO_DOOR_THRESHOLD = 2
     TABS_OFFSETS = {
         "Equip": Box(left=84, right=55, top=90, bottom=35, offset=True),
@@ -60,8 +68,10 @@ class InventoryManager(
     ) -> None:
         super().__init__(metadata, data, pipe, **kwargs)
         # Set a condition but use a standard Lock instead of RLock, allowing to use
-        # basic lock mechanism as well
-        temp_lock = self.request_proxy(metadata, f"{self}", "Lock")
+        # basic lock mechanism as well. Native Conditions already do.
+        temp_lock = None
+        if f"{self}" not in SHARED_PRIMITIVES:
+            temp_lock = self.request_proxy(metadata, f"{self}", "Lock")
         self._condition = DecisionMaker.request_proxy(
             metadata, f"{self}", "Condition", False, temp_lock
         )
@@ -369,8 +379,8 @@ class InventoryManager(
         self.data.create_attribute(
             "current_minimap_position",
             _temp_minimap_pos,
-            threshold=self.MINIMAP_POS_REFRESH_RATE,
             error_handler=None,
+            dependencies=("current_client_img", "current_minimap_area_box"),
         )
 
         # Wait until the minimap changes - should be indicator that the map has changed
@@ -418,7 +428,11 @@ class InventoryManager(
 
     def _confirm_shop_open(self) -> bool:
         with self._condition:
-            match = find_image(self.data.current_client_img, self._open_shop_img)
+            match = UI_STATES.find(
+                (self.data.handle, "Open NPC Shop"),
+                self.data.current_client_img,
+                self._open_shop_img,
+            )
             res = len(match) > 0
             if res:
                 self._open_shop_box = match.pop()
@@ -8,7 +8,7 @@ import win32gui
 from functools import cached_property, lru_cache
 
 from botting import PARENT_LOG
-from botting.core import ActionRequest, ActionWithValidation, BotData
+from botting.core import ActionRequest, ActionWithValidation, BotData, PROCEDURES
 from botting.utilities import Box
 from royals.actions.skills_related_v2 import cast_skill_single_press
 from royals.actions import priorities
@@ -141,6 +141,7 @@ class RebuffMixin:
         return duration * (0.8 + 0.05 * random.random())
 
     @staticmethod
+    @PROCEDURES.register
     async def _cast_skills_single_press(
         handle: int, ign: str, skills: list[RoyalsSkill]
     ) -> None:
@@ -14,6 +14,10 @@ class MenusMixin:
     data: BotData
     metadata: multiprocessing.managers.DictProxy
     pipe: multiprocessing.connection.Connection
+    _primitives = {
+        "{cls}({ign}) - Ability Menu Setup": "Condition",
+        "{cls}({ign}) - Inventory Menu Setup": "Condition",
+    }
 
     def _create_ap_menu_attributes(self, condition=None):
         menu = AbilityMenu()
@@ -132,5 +136,6 @@ class UIMixin:
         self.data.create_attribute(
             "current_level_img",
             lambda: stats.level_box.extract_client_img(self.data.current_client_img),
+            dependencies=("current_client_img",),
         )
         self.data.create_attribute("has_ui_attributes", lambda: True)
@@ -16,8 +16,20 @@ class MinimapAttributesMixin:
     data: BotData
     metadata: multiprocessing.managers.DictProxy
     pipe: multiprocessing.connection.Connection
-    MINIMAP_POS_REFRESH_RATE = 0.1
     ERROR_HANDLING_TIME_LIMIT = 5.0
+    # Attributes derived from the client image are recomputed whenever it changes
+    MINIMAP_DEPENDENCIES = ("current_client_img", "current_minimap")
+    _primitives = {
+        "{cls}({ign}) Initial Setup": "Condition",
+        "{cls}({ign}).current_minimap_position Error Handler": "Condition",
+    }
+    DERIVED_MINIMAP_ATTRIBUTES = (
+        "minimap_currently_displayed",
+        "current_minimap_state",
+        "current_minimap_area_box",
+        "current_entire_minimap_box",
+        "current_minimap_title_box",
+    )
 
     def _get_minimap_pos(self) -> tuple[int, int]:
         return self.data.current_minimap.get_character_positions(
@@ -51,14 +63,9 @@ class MinimapAttributesMixin:
         )
 
         self._ensure_mouse_not_on_minimap(identifier)
-        self.data.update_attributes(
-            "current_client_img",
-            "minimap_currently_displayed",
-            "current_minimap_state",
-            "current_minimap_area_box",
-            "current_entire_minimap_box",
-            "current_minimap_title_box",
-            "current_minimap_position",
+        # Derived minimap attributes are independent and computed concurrently
+        self.data.refresh_attributes(
+            "current_client_img", *self.DERIVED_MINIMAP_ATTRIBUTES
         )
 
     def _ensure_mouse_not_on_minimap(self, identifier: str) -> None:
@@ -95,34 +102,35 @@ class MinimapAttributesMixin:
         self.pipe.send(request)
 
     def _create_minimap_attributes(self) -> None:
+        condition = getattr(self, "_condition", None)
+        if condition is None:
+            condition = DecisionMaker.request_proxy(
+                self.metadata,
+                f"{self} Initial Setup",
+                "Condition",
+            )
         ensure_minimap_displayed(
             f"{self} Initial Setup",
             self.data.handle,
             self.data.ign,
             self.pipe,
             self.data.current_minimap,
-            getattr(
-                self,
-                '_condition',
-                DecisionMaker.request_proxy(
-                    self.metadata,
-                    f"{self} Initial Setup",
-                    "Condition",
-                )
-            ),
+            condition,
             self.ERROR_HANDLING_TIME_LIMIT,
-            )
+        )
         self.data.create_attribute(
             "minimap_currently_displayed",
             lambda: self.data.current_minimap.is_displayed(
                 self.data.handle, self.data.current_client_img
             ),
+            dependencies=self.MINIMAP_DEPENDENCIES,
         )
         self.data.create_attribute(
             "current_minimap_state",
             lambda: self.data.current_minimap.get_minimap_state(
                 self.data.handle, self.data.current_client_img
             ),
+            dependencies=self.MINIMAP_DEPENDENCIES,
         )
         self.data.create_attribute(
             "current_minimap_area_box",
@@ -130,18 +138,21 @@ class MinimapAttributesMixin:
                 self.data.handle,
                 self.data.current_client_img,
             ),
+            dependencies=self.MINIMAP_DEPENDENCIES,
         )
         self.data.create_attribute(
             "current_entire_minimap_box",
             lambda: self.data.current_minimap.get_entire_minimap_box(
                 self.data.handle, self.data.current_client_img
             ),
+            dependencies=self.MINIMAP_DEPENDENCIES,
         )
         self.data.create_attribute(
             "current_minimap_title_box",
             lambda: self.data.current_minimap.get_minimap_title_box(
                 self.data.handle, self.data.current_client_img
             ),
+            dependencies=self.MINIMAP_DEPENDENCIES,
         ),
         self.data.create_attribute(
             "current_minimap_title_img",
@@ -152,8 +163,8 @@ class MinimapAttributesMixin:
         self.data.create_attribute(
             "current_minimap_position",
             self._get_minimap_pos,
-            threshold=self.MINIMAP_POS_REFRESH_RATE,
             error_handler=self._minimap_pos_error_handler,
+            dependencies=("current_client_img", "current_minimap_area_box"),
         )
         self.data.current_minimap.generate_grid_template(
             self.data.character.skills.get("Teleport") is not None,
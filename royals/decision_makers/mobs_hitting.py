@@ -21,6 +21,8 @@ LOG_LEVEL = logging.INFO
 
 
 class MobsHitting(MobsHittingMixin, MinimapAttributesMixin, DecisionMaker):
+    _primitives = {"{cls}({ign})": "Lock"}
+
     def __init__(
         self,
         metadata: multiprocessing.managers.DictProxy,
@@ -24,6 +24,7 @@ class EnsureSafeSpot(MinimapAttributesMixin, DecisionMaker):
     """
 
     _throttle = 2.0
+    _trigger = "current_minimap_position"
 
     def __init__(
         self,
@@ -39,8 +40,6 @@ class EnsureSafeSpot(MinimapAttributesMixin, DecisionMaker):
         self._prev_minimap_position = self.data.current_minimap_position
 
     async def _decide(self) -> None:
-        self.data.update_attribute("current_minimap_position")
-
         if self.data.current_minimap_position != self._prev_minimap_position:
             self._send_alert()
 
@@ -79,6 +78,7 @@ class ResetIdleSafeguard(
 
     _TIME_LIMIT = 240.0
     DISTANCE_THRESHOLD = 2
+    _primitives = {"{cls}({ign})": "Lock"}
 
     def __init__(
         self,
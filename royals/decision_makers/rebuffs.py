@@ -6,7 +6,7 @@ import multiprocessing.managers
 
 from .mixins import RebuffMixin, NextTargetMixin, MinimapAttributesMixin
 from botting import PARENT_LOG
-from botting.core import ActionRequest, DecisionMaker, BotData
+from botting.core import ActionRequest, DecisionMaker, BotData, CONTROL_CHANNEL
 from botting.utilities import cooldown
 from royals.actions import priorities
 from royals.model.mechanics import RoyalsSkill
@@ -18,6 +18,11 @@ LOG_LEVEL = logging.INFO
 class PartyRebuff(MinimapAttributesMixin, NextTargetMixin, RebuffMixin, DecisionMaker):
     _TIME_LIMIT = 120  # An error is triggered after 2 minutes of waiting
     # TODO - Deal with Macros as well.
+    _primitives = {
+        "{cls}Lock": "Lock",
+        "{cls}Event": "Event",
+        "{cls}({ign})": "Lock",
+    }
 
     def __init__(
         self,
@@ -297,36 +302,31 @@ class SoloRebuff(RebuffMixin, DecisionMaker):
         each buff individually.
         :return:
         """
+        self._task_group = tg
+        self._task_args = {}
         for buff in self._buffs:
             ident = f"{self} - {buff.name}"
             condition = self.request_proxy(self.metadata, ident, "Condition")
-            tg.create_task(
-                asyncio.to_thread(self._disabler_task, tg, buff, condition),
-                name=f"{ident} - Disabler",
-            )
-            self._decision_task[ident] = tg.create_task(
-                self._task(buff, condition), name=ident
-            )
+            self._task_args[ident] = buff, condition
+        CONTROL_CHANNEL.register(self)
+        self.enable()
 
-    def _disabler_task(self, tg: asyncio.TaskGroup, *args, **kwargs) -> None:
+    def enable(self) -> None:
         """
-        Overwrites the DecisionMaker start method such that there is one disabler per
-        individual buff.
-        :return:
+        Overwrites the DecisionMaker enable method such that each individual buff task
+        is started, unless it is running.
         """
-        ident = f"{self} - {args[0].name}"
-        while True:
-            with self._disabler:
-                # When notified, cancel the task
-                self._disabler.wait()
-                self._decision_task[ident].cancel()
-
-                # Upon next notification, re-enable the task
-                self._disabler.wait()
-                self._decision_task[ident] = tg.create_task(
-                    self._task(*args, **kwargs), name=f"{self}"
+        for ident, args in self._task_args.items():
+            task = self._decision_task.get(ident)
+            if task is None or task.done() or task.cancelling():
+                self._decision_task[ident] = self._task_group.create_task(
+                    self._task(*args), name=ident
                 )
 
+    def disable(self) -> None:
+        for task in self._decision_task.values():
+            task.cancel()
+
     async def _decide(
         self, buff: RoyalsSkill, condition: multiprocessing.managers.ConditionProxy
     ) -> None:
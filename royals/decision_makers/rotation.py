@@ -5,7 +5,13 @@ import multiprocessing.managers
 import time
 from functools import partial
 from botting import PARENT_LOG, controller
-from botting.core import ActionRequest, BotData, DecisionMaker, DiscordRequest
+from botting.core import (
+    ActionRequest,
+    BotData,
+    DecisionMaker,
+    DiscordRequest,
+    PROCEDURES,
+)
 from royals.actions.movements_v2 import random_jump
 from royals.actions import priorities
 from .mixins import (
@@ -30,8 +36,10 @@ class Rotation(
     #  path to cancel current movements
     # TODO - improved failsafe reactions, including writing in chat after 2x or 3x
     _throttle = 0.1
+    _primitives = {"{cls}({ign})": "Lock"}
     STATIC_POS_KILL_SWITCH = 30.0
     NO_PATH_KILL_SWITCH = 30.0
+    MOVEMENT_MAX_AGE = 0.5  # Movements are planned from the current position
 
     def __init__(
         self,
@@ -121,6 +129,7 @@ class Rotation(
             inputs.send,
             ign=self.data.ign,
             requeue_if_not_scheduled=True,
+            max_age=self.MOVEMENT_MAX_AGE,
             callbacks=[self.lock.release],
             cancel_callback=partial(self._release_left_right, self.data.handle),
         )
@@ -157,6 +166,7 @@ class Rotation(
         )
 
     @staticmethod
+    @PROCEDURES.register
     async def _wait_and_random_jump(handle: int, jump_key: str) -> None:
         await asyncio.sleep(3.0)
         await random_jump(handle, jump_key).send()
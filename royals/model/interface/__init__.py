@@ -3,3 +3,4 @@ from .dynamic_components.inventory import InventoryMenu
 from .dynamic_components.minimap import Minimap
 from .fixed_components.character_stats import CharacterStats
 from .fixed_components.in_game_chat.chat_feed import LargeClientChatFeed
+from .fixed_components.in_game_chat.chat_watcher import ChatWatcher
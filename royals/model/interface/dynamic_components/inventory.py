@@ -3,7 +3,7 @@ import numpy as np
 import os
 import string
 from paths import ROOT
-from botting.visuals import InGameDynamicVisuals
+from botting.visuals import InGameDynamicVisuals, UI_STATES
 from botting.utilities import (
     Box,
     take_screenshot,
@@ -60,16 +60,21 @@ class InventoryMenu(InGameDynamicVisuals):
     def is_extended(self, handle: int, image: np.ndarray = None) -> bool:
         if image is None:
             image = take_screenshot(handle)
-        if not self.is_displayed(handle, image):
+        menu_pos = self._menu_icon_position(handle, image)
+        if menu_pos is None:
             return False
 
-        processed = cv2.inRange(image, self._slot_color, self._slot_color)
+        def _count_slot_pixels(img: np.ndarray) -> bool:
+            processed = cv2.inRange(img, self._slot_color, self._slot_color)
+            # 30000 is generally sufficient such that even when inventory is full,
+            # there are still more than 30000 pixels that are the same color as the slots.
+            return np.count_nonzero(processed) > 20000
 
-        # 30000 is generally sufficient such that even when inventory is full, there are still
-        # more than 30000 pixels that are the same color as the slots.
-        if np.count_nonzero(processed) > 20000:
-            return True
-        return False
+        # The extended inventory area is only identical to a known state when
+        # the inventory content is unchanged. Slots are only counted within that
+        # area, such that the cached state only depends on what is hashed.
+        target = (menu_pos + self._entire_inventory_box).extract_client_img(image)
+        return UI_STATES.lookup("InventoryMenu.extended", target, _count_slot_pixels)
 
     def get_current_mesos(self, handle: int, image: np.ndarray = None) -> str:
         if image is None:
@@ -85,7 +90,13 @@ class InventoryMenu(InGameDynamicVisuals):
         menu_pos = self._menu_icon_position(handle, image)
         buffer = Box(left=0, right=100, top=0, bottom=30)
         target = (menu_pos + buffer).extract_client_img(image)
+        return UI_STATES.lookup(
+            "InventoryMenu.active_tab",
+            target,
+            lambda img: self._active_tab_from_img(img, menu_pos.width),
+        )
 
+    def _active_tab_from_img(self, target: np.ndarray, icon_width: int) -> str | None:
         processed = cv2.inRange(
             target, self._active_tab_color_lower, self._active_tab_color_upper
         )
@@ -97,7 +108,7 @@ class InventoryMenu(InGameDynamicVisuals):
             rect = cv2.boundingRect(largest)
             center = (rect[0] + rect[2] // 2, rect[1] + rect[3] // 2)
 
-            horizontal_distance = center[0] - (menu_pos.width // 2)
+            horizontal_distance = center[0] - (icon_width // 2)
             if horizontal_distance < -16:
                 return "Equip"
             elif -16 <= horizontal_distance < 18:
@@ -10,7 +10,7 @@ from botting.utilities import (
     CLIENT_HORIZONTAL_MARGIN_PX,
     CLIENT_VERTICAL_MARGIN_PX,
 )
-from botting.visuals import InGameDynamicVisuals
+from botting.visuals import InGameDynamicVisuals, UI_STATES
 
 
 class Minimap(InGameDynamicVisuals, ABC):
@@ -70,8 +70,18 @@ class Minimap(InGameDynamicVisuals, ABC):
         img = take_screenshot(handle, region)
         return img
 
+    @cached_property
+    def _validation_region(self) -> str:
+        region = f"{self.__class__.__name__}.title"
+        UI_STATES.register(region, self._validation_title_img, True)
+        return region
+
     def validate_in_map(self, handle: int) -> bool:
-        return np.array_equal(self.get_minimap_title_img(handle), self._validation_title_img)
+        return UI_STATES.lookup(
+            self._validation_region,
+            self.get_minimap_title_img(handle),
+            lambda img: np.array_equal(img, self._validation_title_img),
+        )
 
     @classmethod
     def is_displayed(
@@ -120,18 +130,24 @@ class Minimap(InGameDynamicVisuals, ABC):
                 detection_img = detection_box.extract_client_img(client_img)
             else:
                 detection_img = take_screenshot(handle, detection_box)
-            detection_color = cv2.inRange(
-                detection_img, *cls._minimap_state_detection_color
+            return UI_STATES.lookup(
+                "Minimap.state", detection_img, cls._minimap_state_from_img
             )
-            columns = np.unique(detection_color.nonzero()[1])
-            if columns.size > 0:
-                leftmost, rightmost = columns[0], columns[-1]
-                if rightmost < 10:
-                    return "Full"
-                elif leftmost > 10:
-                    return "Hidden"
-                else:
-                    return "Partial"
+
+    @classmethod
+    def _minimap_state_from_img(cls, detection_img: np.ndarray) -> str | None:
+        detection_color = cv2.inRange(
+            detection_img, *cls._minimap_state_detection_color
+        )
+        columns = np.unique(detection_color.nonzero()[1])
+        if columns.size > 0:
+            leftmost, rightmost = columns[0], columns[-1]
+            if rightmost < 10:
+                return "Full"
+            elif leftmost > 10:
+                return "Hidden"
+            else:
+                return "Partial"
 
     def get_character_positions(
         self,
@@ -0,0 +1,175 @@
+"""
+Vectorized chat line type detection.
+Every chat type is recognized by the presence of a specific color in the line.
+Instead of running cv2.inRange once per chat type and per line, all chat colors are
+compiled into a single lookup table. Each pixel of the feed is labelled once, and
+per-line color counts for all chat types are obtained at once with np.add.reduceat.
+"""
+import logging
+import numpy as np
+
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.DEBUG
+
+
+def _pack(blue, green, red) -> np.ndarray:
+    return (
+        (np.asarray(blue, dtype=np.uint32) << 16)
+        | (np.asarray(green, dtype=np.uint32) << 8)
+        | np.asarray(red, dtype=np.uint32)
+    )
+
+
+class ChatTypeClassifier:
+    """
+    Labels each line of a chat feed image with the chat type whose color is present.
+    Chat types are any objects exposing chat_color (lower and upper BGR bounds) and
+    threshold (minimum number of pixels with that color) attributes.
+    Ambiguities are resolved through rules, never by user intervention:
+    1. Types listed in suppressions remove the types they suppress when both are
+       detected (e.g. Smega lines also contain the color of General lines).
+    2. If several types remain, the one whose pixel count exceeds its threshold
+       by the largest factor wins.
+    3. If no type is detected, None is returned.
+    """
+
+    def __init__(
+        self,
+        chat_types: Iterable[type],
+        suppressions: dict[str, set[str]] | None = None,
+        skip_rows: int = 2,
+        max_width: int = 350,
+    ) -> None:
+        """
+        :param chat_types: The chat types to recognize.
+        :param suppressions: Mapping of chat type name to the names of the types it
+         suppresses when both are detected.
+        :param skip_rows: Number of rows skipped at the top of each line, since some
+         characters of the previous line may be present (the "@" does so).
+        :param max_width: Only the left-hand side of each line is used, since login
+         or cc notifications can mess up line type recognition.
+        """
+        self.chat_types = tuple(sorted(chat_types, key=lambda t: t.__name__))
+        self.skip_rows = skip_rows
+        self.max_width = max_width
+        self._thresholds = np.array([t.threshold for t in self.chat_types])
+        names = [t.__name__ for t in self.chat_types]
+        self._suppressions = np.zeros((len(names), len(names)), dtype=bool)
+        for name, suppressed in (suppressions or {}).items():
+            for other in suppressed:
+                self._suppressions[names.index(name), names.index(other)] = True
+        self._codes, self._labels = self._compile()
+
+    def _compile(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Enumerates every color included in each chat type's bounds and maps it to the
+        label of that type (index + 1, 0 being reserved for "no chat color").
+        :return: Sorted packed colors and their labels.
+        """
+        codes, labels = [], []
+        for label, chat_type in enumerate(self.chat_types, start=1):
+            lower, upper = chat_type.chat_color
+            if any(low > high for low, high in zip(lower, upper)):
+                continue  # Placeholder colors, which never match anything
+            grid = np.meshgrid(
+                *(np.arange(low, high + 1) for low, high in zip(lower, upper)),
+                indexing="ij",
+            )
+            packed = _pack(*grid).ravel()
+            codes.append(packed)
+            labels.append(np.full(packed.size, label, dtype=np.uint8))
+
+        codes = np.concatenate(codes)
+        labels = np.concatenate(labels)
+        order = np.argsort(codes)
+        codes, labels = codes[order], labels[order]
+        if np.any(codes[1:] == codes[:-1]):
+            raise ValueError("Chat colors of different chat types must not overlap.")
+        return codes, labels
+
+    def label_pixels(self, image: np.ndarray) -> np.ndarray:
+        """
+        :param image: BGR image.
+        :return: Array of the same height and width, containing the label of the chat
+         type whose color matches each pixel (0 if None).
+        """
+        packed = _pack(image[..., 0], image[..., 1], image[..., 2])
+        idx = np.minimum(np.searchsorted(self._codes, packed), self._codes.size - 1)
+        return np.where(self._codes[idx] == packed, self._labels[idx], 0)
+
+    def count_colors(
+        self,
+        feed_img: np.ndarray,
+        nbr_lines: int = 1,
+        labels: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Counts, for each line and each chat type, the number of pixels whose color
+        matches that chat type.
+        :param feed_img: Image of one or more stacked chat lines of equal height.
+        :param nbr_lines: Number of lines in the image.
+        :param labels: If provided, the output of label_pixels on the feed image, which
+         is then not computed again.
+        :return: Array of shape (nbr_lines, nbr chat types).
+        """
+        if labels is None:
+            labels = self.label_pixels(feed_img[:, : self.max_width])
+        height = labels.shape[0]
+        line_height = height // nbr_lines
+        nbr_labels = len(self.chat_types) + 1
+
+        rows = np.arange(height)[:, None] * nbr_labels
+        row_counts = np.bincount(
+            (rows + labels).ravel(), minlength=height * nbr_labels
+        ).reshape(height, nbr_labels)
+        # Trailing zero row allows to use the image height as a reduceat boundary
+        row_counts = np.vstack([row_counts, np.zeros((1, nbr_labels), dtype=np.intp)])
+
+        starts = np.arange(nbr_lines) * line_height
+        ends = starts + line_height
+        bounds = np.column_stack(
+            [np.minimum(starts + self.skip_rows, ends), ends]
+        ).ravel()
+        return np.add.reduceat(row_counts, bounds, axis=0)[::2, 1:]
+
+    def classify(
+        self,
+        feed_img: np.ndarray,
+        nbr_lines: int = 1,
+        labels: np.ndarray | None = None,
+    ) -> list[type | None]:
+        """
+        :param feed_img: Image of one or more stacked chat lines of equal height.
+        :param nbr_lines: Number of lines in the image.
+        :param labels: If provided, the output of label_pixels on the feed image.
+        :return: The chat type of each line, from top to bottom. None when no chat
+         type is detected.
+        """
+        counts = self.count_colors(feed_img, nbr_lines, labels)
+        detected = counts > self._thresholds
+        # Rule 1 - Remove suppressed types
+        suppressed = (detected.astype(np.uint8) @ self._suppressions) > 0
+        detected &= ~suppressed
+        # Rule 2 - Largest count relative to threshold
+        scores = np.where(detected, counts / np.maximum(self._thresholds, 1), -1.0)
+        best = scores.argmax(axis=1)
+
+        result = []
+        for line, idx in enumerate(best):
+            nbr_detected = np.count_nonzero(detected[line])
+            if nbr_detected == 0:
+                result.append(None)
+                continue
+            elif nbr_detected > 1:
+                candidates = [
+                    t.__name__ for t, d in zip(self.chat_types, detected[line]) if d
+                ]
+                logger.log(
+                    LOG_LEVEL,
+                    f"Multiple chat types detected on line {line}: {candidates}. "
+                    f"Resolved to {self.chat_types[idx].__name__}.",
+                )
+            result.append(self.chat_types[idx])
+        return result
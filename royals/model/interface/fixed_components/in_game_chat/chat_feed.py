@@ -163,10 +163,12 @@ class ChatFeed(InGameToggleableVisuals, ABC):
         :return:
         """
         chat_img = take_screenshot(handle, self.get_chat_feed_box(handle))
-        lines = reversed(
-            np.split(chat_img, self.get_nbr_lines_displayed(handle), axis=0)
+        chat_lines = list(
+            reversed(
+                ChatLine.from_feed_img(chat_img, self.get_nbr_lines_displayed(handle))
+            )
         )
-        return (ChatLine.from_img(img) for img in lines)
+        return (line for line in chat_lines)
 
 
 class LargeClientChatFeed(ChatFeed):
@@ -5,6 +5,7 @@ import time
 from abc import ABC, abstractmethod
 
 from botting.visuals import InGameBaseVisuals
+from .chat_classifier import ChatTypeClassifier
 
 
 class ChatLine(InGameBaseVisuals, ABC):
@@ -41,15 +42,38 @@ class ChatLine(InGameBaseVisuals, ABC):
     def __init__(self, chat_line_img: np.ndarray, read: bool = False) -> None:
         self.image = chat_line_img
         self._timestamp = time.ctime()
+        self._text = None
+        self._author = None
         if read:
-            self.text = self.read_text()
-            self.author = self.get_author()
-        else:
-            self.text = None
-            self.author = None
+            self._text = self.read_text()
+            self._author = self.get_author()
 
     def __repr__(self) -> str:
-        return f"{self.name}({self.author}:{self.text})"
+        return f"{self.name}({self._author}:{self._text})"
+
+    @property
+    def text(self) -> str:
+        """
+        The text of the line. When not read upon instantiation, OCR is performed
+        lazily on first access.
+        """
+        if self._text is None:
+            self._text = self.read_text()
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text = value
+
+    @property
+    def author(self) -> str:
+        if self._author is None:
+            self._author = self.get_author()
+        return self._author
+
+    @author.setter
+    def author(self, value: str) -> None:
+        self._author = value
 
     @property
     def name(self) -> str:
@@ -57,39 +81,52 @@ class ChatLine(InGameBaseVisuals, ABC):
 
     @staticmethod
     def from_img(chat_line_img: np.ndarray, read: bool = False) -> "ChatLine":
-        # Skip first rows of pixels in the line, because some characters of the previous line may be present (the "@" does so).
-        # Skip right-hand side of the image, as sometimes login or cc notifications can mess up line type recognition.
-        img = chat_line_img[2:, 0:350]
-        detected_types = set()
-        for chat_type in ChatLine.all_chat_types:
-            if InGameBaseVisuals._color_detection(
-                img,
-                eval(chat_type).chat_color,
-                pixel_threshold=eval(chat_type).threshold,
-            ):
-                detected_types.add(eval(chat_type))
-
-        # Color used for Item Smega is also visible in Gachapon lines, so remove Item Smega if Gachapon is detected.
-        # if detected_types == {ItemSmega, Gachapon}:
-        #     detected_types.remove(ItemSmega)
-
-        # Smega lines do contain the color of General lines, so remove General if Smega is detected.
-        if (
-            detected_types == {Smega, General}
-            or detected_types == {TVSmega, General}
-            or detected_types == {ItemSmega, General}
-        ):
-            detected_types.remove(General)
-
-        if len(detected_types) == 1:
-            chat_class = detected_types.pop()
-            chat_instance = chat_class(chat_line_img, read)
-            return chat_instance
-
-        else:
-            cv2.imshow(f"Multi Lines Recognized {detected_types}", chat_line_img)
-            cv2.waitKey(1)
-            breakpoint()  # TODO - Handle these cases, start by assuming cursor or a menu is overlapping the chat line.
+        """
+        Instantiates the proper chat line class based on the colors found in the image.
+        :param chat_line_img: Image of a single chat line.
+        :param read: Whether to read the text of the line upon instantiation.
+        :return: ChatLine instance. Unknown if no chat type is recognized.
+        """
+        return ChatLine.from_feed_img(chat_line_img, 1, read)[0]
+
+    @staticmethod
+    def from_feed_img(
+        feed_img: np.ndarray, nbr_lines: int, read: bool = False
+    ) -> list["ChatLine"]:
+        """
+        Classifies all lines of a chat feed image in a single pass.
+        :param feed_img: Image of the chat feed, made of nbr_lines of equal height.
+        :param nbr_lines: Number of lines in the image.
+        :param read: Whether to read the text of each line upon instantiation.
+        :return: ChatLine instances, from top to bottom.
+        """
+        chat_classes = _CLASSIFIER.classify(feed_img, nbr_lines)
+        return ChatLine.from_classified(feed_img, nbr_lines, chat_classes, read)
+
+    @staticmethod
+    def from_classified(
+        feed_img: np.ndarray,
+        nbr_lines: int,
+        chat_classes: list[type["ChatLine"] | None],
+        read: bool = False,
+    ) -> list["ChatLine"]:
+        """
+        Instantiates chat lines for which the chat type is already known.
+        :param feed_img: Image of the chat feed, made of nbr_lines of equal height.
+        :param nbr_lines: Number of lines in the image.
+        :param chat_classes: The chat type of each line, from top to bottom.
+        :param read: Whether to read the text of each line upon instantiation.
+        :return: ChatLine instances, from top to bottom.
+        """
+        lines = np.split(feed_img, nbr_lines, axis=0)
+        return [
+            (chat_class or Unknown)(img, read)
+            for chat_class, img in zip(chat_classes, lines)
+        ]
+
+    @staticmethod
+    def classifier() -> ChatTypeClassifier:
+        return _CLASSIFIER
 
     def read_text(self) -> str:
         return self.read_from_img(self.image, config="--psm 7")
@@ -482,3 +519,27 @@ class System(ChatLine):
 
     def get_author(self) -> str:
         pass
+
+
+class Unknown(ChatLine):
+    """Lines for which no chat type is recognized, e.g. when obstructed by a menu."""
+
+    def __init__(self, img: np.ndarray, read: bool = False):
+        super().__init__(img, read)
+
+    def _preprocess_img(self, image: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    def get_author(self) -> str:
+        pass
+
+
+_CLASSIFIER = ChatTypeClassifier(
+    (globals()[chat_type] for chat_type in ChatLine.all_chat_types),
+    # Smega lines do contain the color of General lines.
+    suppressions={
+        "Smega": {"General"},
+        "TVSmega": {"General"},
+        "ItemSmega": {"General"},
+    },
+)
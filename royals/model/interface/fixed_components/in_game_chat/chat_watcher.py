@@ -0,0 +1,169 @@
+"""
+Incremental chat feed parsing.
+Instead of classifying (and reading) every visible line on each poll, the watcher keeps
+a signature of each line displayed on the previous poll. When new lines appear, older
+lines scroll up, so the new snapshot is matched against the previous one to find the
+scroll offset. Only the lines that scrolled in are instantiated and yielded.
+
+Since the chat feed background is semi-transparent, the raw pixels of a line change
+whenever the map behind it moves. Signatures are therefore computed on the chat color
+labels of each line, which only depend on the text being displayed.
+"""
+import asyncio
+import hashlib
+import logging
+import numpy as np
+
+from typing import AsyncGenerator
+
+from botting.utilities import Box, take_screenshot
+from .chat_feed import ChatFeed
+from .chat_lines import ChatLine
+
+logger = logging.getLogger(__name__)
+LOG_LEVEL = logging.NOTSET
+
+
+class ChatWatcher:
+    """
+    Watches the chat feed of a single client and returns new lines as they appear.
+    The feed box and number of lines displayed are detected once and re-used, such
+    that each poll requires a single screenshot (covering both the feed and the
+    "displayed" detection box). They are detected again whenever the feed is hidden.
+    Lines are classified immediately, but their text is only read (through OCR)
+    when accessed.
+    """
+
+    def __init__(
+        self, chat_feed: ChatFeed, handle: int, emit_existing: bool = False
+    ) -> None:
+        """
+        :param chat_feed: The chat feed to watch.
+        :param handle: Handle to the client window.
+        :param emit_existing: Whether the lines already displayed on the first poll
+         are considered new.
+        """
+        self.chat_feed = chat_feed
+        self.handle = handle
+        self.emit_existing = emit_existing
+        self._nbr_lines: int | None = None
+        self._feed_box: Box | None = None
+        self._region: Box | None = None
+        self._signatures: list[bytes] | None = None
+
+    def reset(self) -> None:
+        """
+        Forgets the feed location and the previous snapshot.
+        Should be called whenever the chat feed is resized.
+        :return:
+        """
+        self.chat_feed.get_nbr_lines_displayed.cache_clear()
+        self._nbr_lines = self._feed_box = self._region = None
+        self._signatures = None
+
+    def _locate(self) -> bool:
+        nbr_lines = self.chat_feed.get_nbr_lines_displayed(self.handle)
+        if nbr_lines is None:
+            self.chat_feed.get_nbr_lines_displayed.cache_clear()
+            return False
+        self._nbr_lines = nbr_lines
+        self._feed_box = self.chat_feed.get_chat_feed_box(self.handle)
+        detection = self.chat_feed._chat_feed_displayed_detection_box
+        self._region = Box(
+            left=min(self._feed_box.left, detection.left),
+            right=max(self._feed_box.right, detection.right),
+            top=min(self._feed_box.top, detection.top),
+            bottom=max(self._feed_box.bottom, detection.bottom),
+        )
+        logger.log(LOG_LEVEL, f"Chat feed located with {nbr_lines} lines.")
+        return True
+
+    @staticmethod
+    def _crop(image: np.ndarray, box: Box, region: Box) -> np.ndarray:
+        top, left = box.top - region.top, box.left - region.left
+        return image[top : top + box.height, left : left + box.width]
+
+    def signatures(self, labels: np.ndarray) -> list[bytes]:
+        """
+        :param labels: Chat color labels of the entire feed.
+        :return: A digest of each line, from top to bottom.
+        """
+        return [
+            hashlib.blake2b(np.ascontiguousarray(band).data, digest_size=8).digest()
+            for band in np.split(labels, self._nbr_lines, axis=0)
+        ]
+
+    @staticmethod
+    def scroll_offset(previous: list[bytes], current: list[bytes]) -> int:
+        """
+        Finds by how many lines the feed scrolled between two snapshots, which is the
+        smallest offset for which the lines that remain visible are unchanged.
+        When identical lines are displayed consecutively, this may under-estimate the
+        number of new lines.
+        :param previous: Line signatures of the previous snapshot, top to bottom.
+        :param current: Line signatures of the current snapshot, top to bottom.
+        :return: The number of new lines at the bottom of the current snapshot.
+        """
+        nbr_lines = len(current)
+        if len(previous) != nbr_lines:
+            return nbr_lines
+        for offset in range(nbr_lines):
+            if previous[offset:] == current[: nbr_lines - offset]:
+                return offset
+        return nbr_lines
+
+    def poll(self, image: np.ndarray | None = None) -> list[ChatLine]:
+        """
+        Takes a single snapshot of the chat feed and returns the lines that appeared
+        since the previous snapshot.
+        :param image: If provided, screenshot of the watched region (see region).
+        :return: New ChatLine instances, from oldest to most recent.
+        """
+        if self._region is None and not self._locate():
+            return []
+        if image is None:
+            image = take_screenshot(self.handle, self._region)
+
+        detection = self.chat_feed._chat_feed_displayed_detection_box
+        if not self.chat_feed.is_displayed(
+            self.handle, self._crop(image, detection, self._region)
+        ):
+            self.reset()
+            return []
+
+        feed_img = self._crop(image, self._feed_box, self._region)
+        classifier = ChatLine.classifier()
+        labels = classifier.label_pixels(feed_img[:, : classifier.max_width])
+        current = self.signatures(labels)
+        previous, self._signatures = self._signatures, current
+
+        if previous is None and not self.emit_existing:
+            return []
+        offset = self.scroll_offset(previous or [], current)
+        if offset == 0:
+            return []
+
+        # Only the new lines need to be classified and instantiated
+        line_height = feed_img.shape[0] // self._nbr_lines
+        start = (self._nbr_lines - offset) * line_height
+        new_img = feed_img[start:]
+        chat_classes = classifier.classify(new_img, offset, labels[start:])
+        return ChatLine.from_classified(new_img.copy(), offset, chat_classes)
+
+    @property
+    def region(self) -> Box | None:
+        """
+        The region captured on each poll, once the chat feed is located.
+        """
+        return self._region
+
+    async def watch(self, interval: float = 0.5) -> AsyncGenerator[ChatLine, None]:
+        """
+        Polls the chat feed indefinitely and yields new lines as they appear.
+        :param interval: Time (in seconds) between polls.
+        :return:
+        """
+        while True:
+            for line in self.poll():
+                yield line
+            await asyncio.sleep(interval)
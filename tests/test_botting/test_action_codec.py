@@ -0,0 +1,122 @@
+import asyncio
+import numpy as np
+import pickle
+
+from functools import partial
+from unittest import TestCase
+
+from botting import controller
+from botting.core import ActionRequest, ActionWithValidation, DiscordRequest
+from botting.core.action_codec import (
+    OP_KEYBOARD,
+    OP_PICKLED,
+    OP_VALIDATED,
+    PROCEDURES,
+    ProcedureRegistry,
+    decode,
+    encode,
+    is_encoded,
+)
+
+
+async def _unregistered(handle: int) -> None:
+    pass
+
+
+def _transfer(request: ActionRequest) -> ActionRequest:
+    message = pickle.loads(pickle.dumps(encode(request)))
+    assert is_encoded(message)
+    return decode(message)
+
+
+class TestActionCodec(TestCase):
+    def setUp(self) -> None:
+        self.inputs = controller.KeyboardInputWrapper(123)
+        self.inputs.append("left", "keydown", 0.05)
+        self.inputs.append(["alt", "up"], ["keydown", "keydown"], 0.1)
+        self.inputs.append("ctrl", "keydown", 0.033)
+        self.inputs.append(["alt", "up"], ["keyup", "keyup"], 0.03)
+        self.inputs.forced_key_releases.append("ctrl")
+        self.inputs.mark("move", 0)
+
+    def test_registered_procedures_are_sent_as_opcodes(self):
+        request = ActionRequest(
+            "Test",
+            controller.press,
+            "Ign",
+            priority=7,
+            cancels_itself=True,
+            requeue_if_not_scheduled=False,
+            cancel_tasks=["Other"],
+            args=(123, "pageup"),
+            kwargs={"silenced": True},
+        )
+        message = encode(request)
+        self.assertIsNone(message[5])
+        self.assertEqual(_transfer(request), request)
+
+    def test_expiry_is_preserved(self):
+        request = ActionRequest("Test", controller.press, "Ign", max_age=0.5)
+        request.created_at -= 1.0
+        received = _transfer(request)
+        self.assertEqual(received.created_at, request.created_at)
+        self.assertTrue(received.expired())
+
+    def test_keyboard_inputs_are_packed(self):
+        request = ActionRequest("Test", self.inputs.send, "Ign", args=(self.inputs,))
+        self.assertEqual(encode(request)[1], OP_KEYBOARD)
+        received = _transfer(request)
+        self.assertEqual(received.procedure.__self__, self.inputs)
+        self.assertEqual(received.args, (self.inputs,))
+        self.assertEqual(received.procedure.__self__.actions, [("move", 0)])
+
+        single_keys = controller.KeyboardInputWrapper(123)
+        single_keys.append("ctrl", "keydown", 0.1)
+        single_keys.append("ctrl", "keyup", 0.1)
+        received = _transfer(ActionRequest("Test", single_keys.send, "Ign"))
+        self.assertEqual(received.procedure.__self__, single_keys)
+
+    def test_validated_procedures_are_rebuilt(self):
+        wrapped = partial(
+            ActionWithValidation._wrapped_procedure, self.inputs.send, None, 5.0
+        )
+        request = ActionRequest("Test", wrapped, "Ign")
+        self.assertEqual(encode(request)[1], OP_VALIDATED)
+        procedure = _transfer(request).procedure
+        self.assertIs(procedure.func, ActionWithValidation._wrapped_procedure)
+        self.assertEqual(procedure.args[0].__self__, self.inputs)
+        self.assertEqual(procedure.args[1:], (None, 5.0))
+
+    def test_unregistered_procedures_are_pickled(self):
+        request = ActionRequest("Test", _unregistered, "Ign", args=(123,))
+        self.assertEqual(encode(request)[1], OP_PICKLED)
+        self.assertEqual(_transfer(request), request)
+
+    def test_discord_images_are_compressed(self):
+        img = np.zeros((200, 300, 3), dtype=np.uint8)
+        img[50:100, 100:200] = (10, 20, 30)
+        request = ActionRequest(
+            "Test", asyncio.sleep, "Ign", discord_request=DiscordRequest("Alert", img)
+        )
+        self.assertLess(len(pickle.dumps(encode(request))), img.nbytes // 10)
+        received = _transfer(request).discord_request
+        self.assertEqual(received.msg, "Alert")
+        np.testing.assert_array_equal(received.img, img)
+
+    def test_registry(self):
+        registry = ProcedureRegistry()
+        registry.register(_unregistered)
+        registry.register(_unregistered)
+        opcode = registry.opcode(_unregistered)
+        self.assertIs(registry.procedure(opcode), _unregistered)
+        self.assertEqual(len(registry), 1)
+        self.assertIsNone(registry.opcode(controller.press))
+        self.assertIn(controller.press, PROCEDURES)
+
+        def _homonym():
+            pass
+
+        _homonym.__module__ = _unregistered.__module__
+        _homonym.__qualname__ = _unregistered.__qualname__
+        with self.assertRaises(ValueError):
+            registry.register(_homonym)
@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from botting.core.action_data import ActionRequest
+from botting.core.async_task_manager import AsyncTaskManager
+
+
+class TestAsyncTaskManager(TestCase):
+    def setUp(self) -> None:
+        self.manager = AsyncTaskManager(MagicMock())
+        self.started: dict[str, float] = {}
+
+    def _request(
+        self, identifier: str, duration: float = 0, ign: str = "Ign", **kwargs
+    ) -> ActionRequest:
+        async def _procedure() -> None:
+            self.started[identifier] = time.perf_counter()
+            await asyncio.sleep(duration)
+
+        return ActionRequest(identifier, _procedure, ign, **kwargs)
+
+    async def _run(self, *requests: ActionRequest, wait: float = 0.2) -> None:
+        manager = asyncio.create_task(self.manager.start())
+        for request in requests:
+            await self.manager.queue.put(request)
+        await asyncio.sleep(wait)
+        await self.manager.queue.put(None)
+        await manager
+
+    def test_requests_are_dispatched_immediately(self):
+        async def _test() -> None:
+            start = time.perf_counter()
+            await self._run(*[self._request(f"Test{i}") for i in range(20)])
+            self.assertEqual(len(self.started), 20)
+            self.assertLess(max(self.started.values()) - start, 0.05)
+
+        asyncio.run(_test())
+        metrics = self.manager.metrics["Test0"]
+        self.assertEqual(metrics.queue_wait.count, 1)
+        self.assertEqual(metrics.dispatch.count, 1)
+
+    def test_parked_requests_wake_when_unblocked(self):
+        blocker = self._request(
+            "Blocker", duration=0.05, priority=10, block_lower_priority=True
+        )
+        blocked = self._request("Blocked", priority=1)
+
+        async def _test() -> None:
+            await self._run(blocker, blocked)
+
+        asyncio.run(_test())
+        delay = self.started["Blocked"] - self.started["Blocker"]
+        self.assertGreaterEqual(delay, 0.05)
+        self.assertLess(delay, 0.1)
+        self.assertEqual(self.manager.metrics["Blocked"].parked, 1)
+        self.assertFalse(self.manager.lanes["Ign"].parked)
+
+    def test_lanes_do_not_block_each_other(self):
+        blocker = self._request(
+            "Blocker", duration=0.1, priority=10, block_lower_priority=True
+        )
+        other_client = self._request("Other", priority=1, ign="Other")
+
+        async def _test() -> None:
+            await self._run(blocker, other_client)
+
+        asyncio.run(_test())
+        self.assertLess(self.started["Other"] - self.started["Blocker"], 0.05)
+        self.assertEqual(self.manager.metrics["Other"].parked, 0)
+
+    def test_global_lane_blocks_every_lane(self):
+        kill = self._request(
+            "Kill", duration=0.05, ign="All", priority=999, block_lower_priority=True
+        )
+        others = [self._request(f"Other{i}", priority=1, ign=f"Bot{i}") for i in (1, 2)]
+        blocker = self._request(
+            "Blocker", duration=0.1, priority=10, block_lower_priority=True
+        )
+        pause = self._request("Pause", ign="All", priority=5)
+
+        async def _test() -> None:
+            await self._run(kill, *others)
+            self.started.clear()
+            await self._run(blocker, pause)
+
+        asyncio.run(_test())
+        # Requests of the global lane also wait for the priorities of other lanes
+        self.assertGreaterEqual(self.started["Pause"] - self.started["Blocker"], 0.1)
+        self.assertEqual(self.manager.metrics["Pause"].parked, 1)
+        for i in (1, 2):
+            self.assertEqual(self.manager.metrics[f"Other{i}"].parked, 1)
+        self.assertFalse(any(lane.parked for lane in self.manager.lanes.values()))
+
+    def test_parked_requests_are_superseded(self):
+        released = MagicMock()
+        blocker = self._request(
+            "Blocker", duration=0.05, priority=10, block_lower_priority=True
+        )
+        first = self._request("Rotation", cancels_itself=True, callbacks=[released])
+        second = self._request("Rotation", cancels_itself=True)
+        second.procedure = MagicMock(side_effect=first.procedure)
+
+        async def _test() -> None:
+            await self._run(blocker, first, second)
+
+        asyncio.run(_test())
+        released.assert_called_once()
+        second.procedure.assert_called_once()
+        self.assertEqual(self.manager.metrics["Rotation"].superseded, 1)
+
+    def test_expired_requests_are_dropped(self):
+        released = MagicMock()
+        blocker = self._request(
+            "Blocker", duration=0.1, priority=10, block_lower_priority=True
+        )
+        stale = self._request("Rotation", max_age=0.05, callbacks=[released])
+        fresh = self._request("Fresh", max_age=1.0)
+        late = self._request("Late", deadline=time.time() - 1)
+
+        async def _test() -> None:
+            await self._run(blocker, stale, fresh, late)
+
+        asyncio.run(_test())
+        self.assertNotIn("Rotation", self.started)
+        self.assertNotIn("Late", self.started)
+        self.assertIn("Fresh", self.started)
+        released.assert_called_once()
+        self.assertEqual(self.manager.metrics["Rotation"].expired, 1)
+        self.assertEqual(self.manager.metrics["Rotation"].parked, 1)
+        self.assertEqual(self.manager.metrics["Late"].expired, 1)
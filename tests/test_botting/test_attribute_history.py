@@ -0,0 +1,71 @@
+import numpy as np
+import unittest
+from unittest.mock import Mock
+
+from botting.core.attribute_history import (
+    HashHistory,
+    LastValidHistory,
+    NoHistory,
+    ThumbnailHistory,
+    ValuesHistory,
+)
+from botting.core.bot_data import BotData
+
+
+class TestAttributeHistory(unittest.TestCase):
+    def setUp(self):
+        self.img = np.ones((64, 64, 3), dtype=np.uint8)
+
+    def _fill(self, history, *values):
+        for value in values:
+            history.append(value)
+        return history
+
+    def test_values_history(self):
+        history = self._fill(ValuesHistory(max_len=2), "a", "b", None)
+        self.assertEqual(list(history), ["b", None])
+        self.assertEqual(history.last_valid(), "b")
+
+    def test_no_history(self):
+        history = self._fill(NoHistory(), "a", "b")
+        self.assertEqual(len(history), 0)
+        self.assertIsNone(history.last_valid())
+
+    def test_last_valid_history(self):
+        history = self._fill(LastValidHistory(), self.img, np.zeros((2, 2)), None)
+        self.assertIs(history.last_valid(), self.img)
+        self.assertEqual(history.memory_usage({id(self.img)}), 0)
+
+    def test_hash_history(self):
+        history = self._fill(HashHistory(), self.img, (1, 2))
+        self.assertIn(self.img.copy(), history)
+        self.assertIn((1, 2), history)
+        self.assertNotIn((2, 1), history)
+        self.assertIsNone(history.last_valid())
+        self.assertLess(history.memory_usage(), self.img.nbytes)
+
+    def test_thumbnail_history(self):
+        history = self._fill(ThumbnailHistory(step=8), self.img, (1, 2))
+        self.assertEqual(list(history)[0].shape, (8, 8, 3))
+        self.assertIn(self.img, history)
+        self.assertEqual(history.last_valid(), (1, 2))
+
+    def test_bot_data_history_policy(self):
+        data = BotData("TestBot")
+        data.create_attribute(
+            "test_img", Mock(return_value=self.img), history=LastValidHistory()
+        )
+        data.create_attribute("test_imgs", Mock(side_effect=self.img.copy))
+        for _ in range(3):
+            data.update_attributes("test_img", "test_imgs")
+
+        usage = data.memory_usage()
+        # The current value is not counted twice
+        self.assertLess(usage["test_img"], self.img.nbytes * 2)
+        # Default policy retains every (distinct) array
+        self.assertEqual(usage["test_imgs"], self.img.nbytes * 3)
+        self.assertIs(data.get_last_known_value("test_img", update=False), self.img)
+
+
+if __name__ == "__main__":
+    unittest.main()
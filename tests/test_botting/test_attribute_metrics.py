@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from botting.core.attribute_metrics import (
+    AttributeMetrics,
+    LatencyHistogram,
+    MetricsExporter,
+    MetricsSnapshot,
+)
+from botting.core.bot_data import BotData
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_are_contiguous(self):
+        for value in [0, 1, 127, 128, 129, 255, 256, 10**6, 10**9 + 7]:
+            low, high = LatencyHistogram.bucket_bounds(
+                LatencyHistogram.bucket_index(value)
+            )
+            self.assertLessEqual(low, value)
+            self.assertGreaterEqual(high, value)
+            self.assertLessEqual(high - low, max(value / 64, 1))
+
+    def test_percentiles_preserve_tail(self):
+        histogram = LatencyHistogram()
+        for _ in range(990):
+            histogram.record(1_000_000)
+        for _ in range(10):
+            histogram.record(250_000_000)
+        self.assertAlmostEqual(histogram.percentile(50), 1_000_000, delta=16_000)
+        self.assertAlmostEqual(histogram.percentile(99.9), 250_000_000, delta=4e6)
+        self.assertEqual(histogram.percentile(100), 250_000_000)
+        self.assertEqual(histogram.min, 1_000_000)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(10)
+        second.record(5)
+        second.record(1000)
+        first.merge(second)
+        self.assertEqual((first.count, first.min, first.max), (3, 5, 1000))
+        self.assertEqual(first.total, 1015)
+
+
+class TestBotDataMetrics(unittest.TestCase):
+    def test_metrics_are_recorded_once_enabled(self):
+        data = BotData("TestBot")
+        data.create_attribute("test_attr", Mock(return_value=1), threshold=60)
+        _ = data.test_attr
+        data.enable_metrics()
+        data.create_attribute("test_other", Mock(return_value=2))
+        _ = data.test_attr, data.test_attr, data.test_other
+
+        snapshot = data.metrics_snapshot()
+        self.assertEqual(snapshot["test_attr"].reads, 2)
+        self.assertEqual(snapshot["test_attr"].update_latency.count, 0)
+        self.assertEqual(snapshot["test_other"].update_latency.count, 1)
+        self.assertGreater(snapshot["test_attr"].staleness.min, 0)
+        self.assertGreater(snapshot["test_attr"].read_rate, 0)
+        # A new window is started
+        self.assertEqual(data.metrics_snapshot()["test_attr"].reads, 0)
+
+
+class TestMetricsExporter(unittest.TestCase):
+    def test_export(self):
+        metrics = AttributeMetrics()
+        metrics.update_latency.record(2_000_000)
+        metrics.record_read(500_000)
+        snapshot = MetricsSnapshot(
+            "Engine(TestBot)",
+            {"TestBot": {"current_client_img": metrics.close_window()}},
+            {"TestBot": {"current_client_img": 0.1}},
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = MetricsExporter(directory)
+            exporter.add(snapshot)
+            exporter.add(snapshot)
+            exporter.export()
+            with open(exporter.json_path) as f:
+                exported = json.load(f)["bots"]["TestBot"]["current_client_img"]
+            with open(exporter.prometheus_path) as f:
+                prometheus = f.read()
+            self.assertEqual(os.listdir(directory).count("BotData Metrics.json"), 1)
+
+        self.assertEqual(exported["reads"], 2)
+        self.assertEqual(exported["threshold"], 0.1)
+        self.assertEqual(exported["update_latency"]["count"], 2)
+        self.assertAlmostEqual(exported["update_latency"]["p99"], 0.002, places=4)
+        self.assertIn(
+            'botdata_update_latency_seconds_count{bot="TestBot",'
+            'attribute="current_client_img"} 2',
+            prometheus,
+        )
+        self.assertIn('botdata_reads_total{bot="TestBot"', prometheus)
+
+    def test_concurrent_exports(self):
+        metrics = AttributeMetrics()
+        metrics.record_read(500_000)
+        snapshot = MetricsSnapshot(
+            "Engine(TestBot)", {"TestBot": {"attr": metrics.close_window()}}, {}
+        )
+
+        async def _listener(exporter: MetricsExporter) -> None:
+            for _ in range(20):
+                exporter.add(snapshot)
+                await exporter.export_async()
+
+        async def _listeners(exporter: MetricsExporter) -> None:
+            await asyncio.gather(*(_listener(exporter) for _ in range(4)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = MetricsExporter(directory)
+            asyncio.run(_listeners(exporter))
+            with open(exporter.json_path) as f:
+                exported = json.load(f)["bots"]["TestBot"]["attr"]
+            self.assertEqual(len(os.listdir(directory)), 2)  # No temporary files left
+        self.assertEqual(exported["reads"], 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
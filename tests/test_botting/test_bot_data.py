@@ -1,5 +1,8 @@
+import asyncio
+import numpy as np
+import threading
+import time
 import unittest
-from datetime import datetime, timedelta
 from unittest.mock import Mock
 
 from botting.core.bot_data import BotData
@@ -16,8 +19,19 @@ class TestBotData(unittest.TestCase):
     def test_create_attribute_initializes_metadata(self):
         self.create_attribute("test_attr", self.mock_update_function)
         self.assertIn("test_attr", self.bot_data._metadata)
+        self.assertEqual(self.bot_data._metadata["test_attr"].update_count, 0)
+        _ = self.bot_data.test_attr
         self.assertEqual(self.bot_data._metadata["test_attr"].update_count, 1)
 
+    def test_create_attribute_is_lazy(self):
+        self.create_attribute("test_attr", self.mock_update_function)
+        self.mock_update_function.assert_not_called()
+        self.bot_data.create_attribute(
+            "initialized_attr", self.mock_update_function, initial_value="initial"
+        )
+        self.assertEqual(self.bot_data.initialized_attr, "initial")
+        self.mock_update_function.assert_not_called()
+
     def test_create_attribute_sets_initial_value(self):
         self.create_attribute("test_attr", self.mock_update_function)
         self.assertEqual(self.bot_data.test_attr, "new_value")
@@ -37,9 +51,9 @@ class TestBotData(unittest.TestCase):
 
     def test_getattr_updates_value_if_threshold_exceeded(self):
         self.create_attribute("test_attr", self.mock_update_function, threshold=0.1)
-        self.bot_data._metadata[
-            "test_attr"
-        ].last_update_time = datetime.now() - timedelta(seconds=0.2)
+        self.bot_data._metadata["test_attr"].last_update_ns = (
+            time.monotonic_ns() - 200_000_000
+        )
         self.mock_update_function.return_value = "threshold_updated_value"
         _ = self.bot_data.test_attr
         self.assertEqual(self.bot_data.test_attr, "threshold_updated_value")
@@ -61,6 +75,246 @@ class TestBotData(unittest.TestCase):
         self.assertIn("test_attr", self.bot_data._thresholds)
         self.assertEqual(self.bot_data._thresholds["test_attr"], 1.0)
 
+    def test_getattr_does_not_update_within_threshold(self):
+        self.create_attribute("test_attr", self.mock_update_function, threshold=10)
+        self.create_attribute("other_attr", self.mock_update_function)
+        self.assertEqual(self.bot_data.test_attr, "new_value")
+        self.assertEqual(self.bot_data.other_attr, "new_value")
+        self.mock_update_function.return_value = "updated_value"
+        self.assertEqual(self.bot_data.test_attr, "new_value")
+        self.assertEqual(self.bot_data.other_attr, "new_value")
+
+    def test_attributes_created_by_other_instances(self):
+        self.create_attribute("has_test_attr", self.mock_update_function)
+        other = BotData("OtherBot")
+        self.assertFalse(other.has_test_attr)
+        with self.assertRaises(AttributeError):
+            _ = BotData("OtherBot").test_attr_created_elsewhere
+        self.create_attribute("test_attr_created_elsewhere", self.mock_update_function)
+        with self.assertRaises(AttributeError):
+            _ = other.test_attr_created_elsewhere
+
+    def test_dependencies_are_recomputed_only_on_upstream_change(self):
+        frame = Mock(return_value=np.zeros((2, 2)))
+        derived = Mock(side_effect=lambda: self.bot_data.test_frame.sum())
+        self.bot_data.create_attribute("test_frame", frame)
+        self.bot_data.create_attribute(
+            "test_derived", derived, dependencies=["test_frame"]
+        )
+        self.assertEqual(self.bot_data.test_derived, 0)
+        self.assertEqual(derived.call_count, 1)
+
+        # Identical frame: nothing to recompute downstream
+        self.bot_data.update_attribute("test_frame")
+        self.assertEqual(self.bot_data.test_derived, 0)
+        self.assertEqual(derived.call_count, 1)
+
+        frame.return_value = np.ones((2, 2))
+        self.bot_data.update_attribute("test_frame")
+        self.assertEqual(self.bot_data.test_derived, 4)
+        self.assertEqual(derived.call_count, 2)
+
+    def test_stale_dependencies_are_refreshed_on_read(self):
+        upstream = Mock(return_value=1)
+        self.bot_data.create_attribute("test_upstream", upstream, threshold=0.1)
+        self.bot_data.create_attribute(
+            "test_downstream",
+            lambda: self.bot_data.test_upstream * 10,
+            dependencies=["test_upstream"],
+        )
+        self.assertEqual(self.bot_data.test_downstream, 10)
+        upstream.return_value = 2
+        self.bot_data._metadata["test_upstream"].last_update_ns -= 200_000_000
+        self.assertEqual(self.bot_data.test_downstream, 20)
+
+    def test_circular_dependencies_are_rejected(self):
+        self.bot_data.create_attribute("test_a", Mock(), dependencies=["test_b"])
+        with self.assertRaises(ValueError):
+            self.bot_data.create_attribute("test_b", Mock(), dependencies=["test_a"])
+
+    def test_update_is_valid(self):
+        self.assertFalse(BotData._update_is_valid(None))
+        self.assertFalse(BotData._update_is_valid(""))
+        self.assertFalse(BotData._update_is_valid(set()))
+        self.assertFalse(BotData._update_is_valid(np.zeros((2, 2))))
+        self.assertFalse(BotData._update_is_valid(np.array([])))
+        self.assertTrue(BotData._update_is_valid(0))
+        self.assertTrue(BotData._update_is_valid(np.array([0, 1])))
+
+    def test_get_last_known_value_with_arrays(self):
+        self.mock_update_function.return_value = np.ones((2, 2))
+        self.create_attribute("test_attr", self.mock_update_function)
+        _ = self.bot_data.test_attr
+        self.mock_update_function.return_value = np.zeros((2, 2))
+        self.bot_data.update_attribute("test_attr")
+        np.testing.assert_array_equal(
+            self.bot_data.get_last_known_value("test_attr"), np.ones((2, 2))
+        )
+
+    def test_changed_wakes_waiters_once_per_change(self):
+        self.create_attribute("test_attr", Mock(side_effect=[1, 2, 3]))
+        _ = self.bot_data.test_attr
+
+        async def scenario():
+            waiters = [
+                asyncio.create_task(self.bot_data.changed("test_attr"))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            self.assertFalse(any(waiter.done() for waiter in waiters))
+            # Both changes are coalesced into a single wake-up
+            self.bot_data.update_attribute("test_attr")
+            self.bot_data.update_attribute("test_attr")
+            return await asyncio.gather(*waiters)
+
+        self.assertEqual(asyncio.run(scenario()), [3, 3])
+        self.assertEqual(self.bot_data.test_attr, 3)
+
+    def test_changed_ignores_updates_without_change(self):
+        self.create_attribute("test_attr", self.mock_update_function)
+        _ = self.bot_data.test_attr
+
+        async def scenario():
+            waiter = asyncio.create_task(self.bot_data.changed("test_attr"))
+            await asyncio.sleep(0)
+            self.bot_data.update_attribute("test_attr")
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            self.bot_data.test_attr = "other_value"
+            return await waiter
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+
+    def test_changed_refreshes_stale_attribute(self):
+        self.create_attribute("test_attr", Mock(side_effect=[1, 1, 2]))
+        _ = self.bot_data.test_attr
+        coroutine = self.bot_data.changed("test_attr", refresh_interval=0.01)
+        self.assertEqual(asyncio.run(asyncio.wait_for(coroutine, 1)), 2)
+        self.assertEqual(self.bot_data._metadata["test_attr"].update_count, 3)
+
+    def test_refresh_attributes_runs_independent_updates_concurrently(self):
+        barrier = threading.Barrier(2, timeout=1)
+
+        def independent(value):
+            barrier.wait()  # Deadlocks unless both run concurrently
+            return value
+
+        self.create_attribute("test_upstream", Mock(return_value=10))
+        self.bot_data.create_attribute(
+            "test_a", lambda: independent(self.bot_data.test_upstream + 1),
+            dependencies=["test_upstream"],
+        )
+        self.bot_data.create_attribute(
+            "test_b", lambda: independent(self.bot_data.test_upstream + 2),
+            dependencies=["test_upstream"],
+        )
+        self.assertEqual(
+            self.bot_data._refresh_layers(["test_a", "test_b"]),
+            [["test_upstream"], ["test_a", "test_b"]],
+        )
+        timings = self.bot_data.refresh_attributes("test_a", "test_b")
+        self.assertEqual(set(timings), {"test_upstream", "test_a", "test_b"})
+        self.assertEqual((self.bot_data.test_a, self.bot_data.test_b), (11, 12))
+        self.assertEqual(self.bot_data._metadata["test_a"].update_count, 1)
+
+    def test_refresh_attributes_skips_fresh_dependencies(self):
+        self.create_attribute("test_upstream", self.mock_update_function, 60)
+        self.bot_data.create_attribute(
+            "test_downstream", Mock(), dependencies=["test_upstream"]
+        )
+        _ = self.bot_data.test_upstream, self.bot_data.test_downstream
+        self.assertEqual(
+            self.bot_data._refresh_layers(["test_downstream"]), [["test_downstream"]]
+        )
+
+    def test_refresh_attributes_is_atomic_per_layer(self):
+        self.create_attribute("test_a", Mock(return_value=1))
+        self.create_attribute("test_b", Mock(side_effect=ValueError))
+        with self.assertRaises(ValueError):
+            self.bot_data.refresh_attributes("test_a", "test_b")
+        self.assertEqual(self.bot_data._metadata["test_a"].update_count, 0)
+
+        handler = Mock()
+        self.bot_data.create_attribute(
+            "test_b", Mock(side_effect=[ValueError, 2]), error_handler=handler
+        )
+        self.bot_data.refresh_attributes("test_a", "test_b")
+        handler.assert_called_once()
+        self.assertEqual((self.bot_data.test_a, self.bot_data.test_b), (1, 2))
+
+
+    def test_refresh_attributes_async(self):
+        loop_thread = threading.get_ident()
+        threads = {}
+
+        def _update(value):
+            threads[value] = threading.get_ident()
+            return value
+
+        self.create_attribute("test_upstream", Mock(return_value=10))
+        self.bot_data.create_attribute(
+            "test_a",
+            lambda: _update(self.bot_data.test_upstream + 1),
+            dependencies=["test_upstream"],
+        )
+        self.create_attribute("test_b", lambda: _update(2))
+        timings = asyncio.run(
+            self.bot_data.refresh_attributes_async("test_a", "test_b")
+        )
+        self.assertEqual(set(timings), {"test_upstream", "test_a", "test_b"})
+        self.assertEqual((self.bot_data.test_a, self.bot_data.test_b), (11, 2))
+        self.assertNotIn(loop_thread, threads.values())
+
+        self.bot_data.shutdown()
+        self.assertIsNone(self.bot_data._executor)
+
+    def test_lazy_refreshes_are_serialized(self):
+        running = []
+
+        def _slow_update():
+            running.append(threading.get_ident())
+            time.sleep(0.01)
+            concurrent = len(running)
+            running.pop()
+            return concurrent
+
+        self.create_attribute("test_shared", _slow_update, threshold=0)
+        for name in ("test_a", "test_b", "test_c"):
+            self.create_attribute(name, lambda: self.bot_data.test_shared)
+        self.bot_data.refresh_attributes("test_a", "test_b", "test_c")
+        values = [self.bot_data._attributes[n] for n in ("test_a", "test_b", "test_c")]
+        self.assertEqual(values, [1, 1, 1])
+        self.bot_data.shutdown()
+
+
+    def test_error_handler_refreshes_during_lazy_refresh(self):
+        self.create_attribute("test_img", lambda: time.perf_counter(), threshold=0.05)
+        derived = [f"test_derived_{i}" for i in range(5)]
+
+        def _derive():
+            time.sleep(0.04)
+            return self.bot_data.test_img
+
+        for name in derived:
+            self.create_attribute(name, _derive)
+        self.bot_data.create_attribute(
+            "test_failing",
+            Mock(side_effect=[ValueError, "recovered"]),
+            error_handler=lambda: self.bot_data.refresh_attributes(
+                "test_img", *derived
+            ),
+        )
+
+        result = []
+        reader = threading.Thread(
+            target=lambda: result.append(self.bot_data.test_failing), daemon=True
+        )
+        reader.start()
+        reader.join(timeout=2)
+        self.assertFalse(reader.is_alive())
+        self.assertEqual(result, ["recovered"])
+        self.bot_data.shutdown()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from botting.core.bot_data import BotData
+from botting.core.control_channel import (
+    CONTROL_CHANNEL,
+    ControlChannel,
+    ControlCommand,
+)
+from botting.core.decision_maker import DecisionMaker
+
+
+class Movement(DecisionMaker):
+    async def _decide(self) -> None:
+        await asyncio.sleep(10)
+
+
+class _Rotation(Movement):
+    pass
+
+
+class _MobsHitting(DecisionMaker):
+    async def _decide(self) -> None:
+        await asyncio.sleep(10)
+
+
+def _maker(cls: type[DecisionMaker], ign: str) -> DecisionMaker:
+    return cls(MagicMock(), BotData(ign), MagicMock())
+
+
+def _running(maker: DecisionMaker) -> bool:
+    return not maker._decision_task.done()
+
+
+class TestControlChannel(TestCase):
+    def setUp(self) -> None:
+        self.channel = ControlChannel()
+        self.rotation = _maker(_Rotation, "Bot1")
+        self.other_rotation = _maker(_Rotation, "Bot2")
+        self.mobs_hitting = _maker(_MobsHitting, "Bot1")
+        self.makers = [self.rotation, self.other_rotation, self.mobs_hitting]
+
+    def tearDown(self) -> None:
+        for maker in self.makers:
+            CONTROL_CHANNEL.unregister(maker)
+
+    async def _start(self, tg: asyncio.TaskGroup) -> None:
+        for maker in self.makers:
+            await maker.start(tg)
+            self.channel.register(maker)
+        await asyncio.sleep(0)
+
+    async def _stop(self) -> None:
+        for maker in self.makers:
+            maker.disable()
+
+    def test_commands_target_class_hierarchy_and_ign(self):
+        async def _run() -> None:
+            async with asyncio.TaskGroup() as tg:
+                await self._start(tg)
+                command = ControlCommand("disable", ("Movement",), ign="Bot1")
+                self.assertEqual(self.channel.dispatch(command), 1)
+                await asyncio.sleep(0)
+                self.assertFalse(_running(self.rotation))
+                self.assertTrue(_running(self.other_rotation))
+                self.assertTrue(_running(self.mobs_hitting))
+
+                command = ControlCommand("disable", ("_Rotation", "_MobsHitting"))
+                self.assertEqual(self.channel.dispatch(command), 3)
+                self.channel.dispatch(ControlCommand("enable", ("DecisionMaker",)))
+                await asyncio.sleep(0)
+                self.assertTrue(all(_running(maker) for maker in self.makers))
+                await self._stop()
+
+        asyncio.run(_run())
+
+    def test_pause(self):
+        async def _run() -> None:
+            async with asyncio.TaskGroup() as tg:
+                await self._start(tg)
+                command = ControlCommand("pause", ("_MobsHitting",), duration=0.05)
+                self.channel.dispatch(command)
+                await asyncio.sleep(0)
+                self.assertFalse(_running(self.mobs_hitting))
+                await asyncio.sleep(0.1)
+                self.assertTrue(_running(self.mobs_hitting))
+
+                # An explicit command overrides the pending resume
+                self.channel.dispatch(command)
+                self.channel.dispatch(ControlCommand("disable", ("_MobsHitting",)))
+                await asyncio.sleep(0.1)
+                self.assertFalse(_running(self.mobs_hitting))
+                await self._stop()
+
+        asyncio.run(_run())
+
+    def test_decision_makers_send_commands_without_threads(self):
+        async def _run() -> None:
+            threads = threading.active_count()
+            async with asyncio.TaskGroup() as tg:
+                await self._start(tg)
+                self.assertEqual(threading.active_count(), threads)
+                self.mobs_hitting._disable_decision_makers("Movement", self_only=True)
+                await asyncio.sleep(0)
+                self.assertFalse(_running(self.rotation))
+                self.assertTrue(_running(self.other_rotation))
+                self.mobs_hitting.pipe.send.assert_called_once_with(
+                    ControlCommand("disable", ("Movement",), "Bot1")
+                )
+                await self._stop()
+
+        asyncio.run(_run())
@@ -0,0 +1,58 @@
+import asyncio
+
+from unittest import TestCase
+
+from botting.controller.inputs.focus_arbiter import FocusArbiter
+
+
+class TestFocusArbiter(TestCase):
+    def setUp(self) -> None:
+        self.arbiter = FocusArbiter(time_slice=0.05)
+        self.order: list[int] = []
+
+    async def _send(self, hwnd: int, duration: float = 0.01) -> None:
+        await self.arbiter.acquire(hwnd)
+        try:
+            self.order.append(hwnd)
+            await asyncio.sleep(duration)
+        finally:
+            self.arbiter.release(hwnd)
+
+    def test_same_window_requests_are_batched(self):
+        async def _test() -> None:
+            first = asyncio.create_task(self._send(1))
+            await asyncio.sleep(0)
+            others = [asyncio.create_task(self._send(hwnd)) for hwnd in (2, 1, 2, 1)]
+            await asyncio.gather(first, *others)
+
+        asyncio.run(_test())
+        self.assertEqual(self.order, [1, 1, 1, 2, 2])
+        self.assertEqual(self.arbiter.switches, 2)
+        self.assertEqual(self.arbiter.holders, 0)
+
+    def test_time_slice_yields_to_waiting_windows(self):
+        async def _test() -> None:
+            async def _busy_window() -> None:
+                for _ in range(10):
+                    await self._send(1, 0.02)
+
+            busy = asyncio.create_task(_busy_window())
+            await asyncio.sleep(0.01)
+            await self._send(2)
+            self.assertLess(self.order.index(2), 5)
+            await busy
+
+        asyncio.run(_test())
+
+    def test_cancelled_waiters_are_discarded(self):
+        async def _test() -> None:
+            first = asyncio.create_task(self._send(1, 0.02))
+            await asyncio.sleep(0)
+            cancelled = asyncio.create_task(self._send(2))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.gather(first, self._send(3), return_exceptions=True)
+
+        asyncio.run(_test())
+        self.assertEqual(self.order, [1, 3])
+        self.assertEqual(self.arbiter.holders, 0)
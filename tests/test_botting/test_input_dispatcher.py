@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from botting.controller.inputs.input_dispatcher import (
+    DispatchTrace,
+    dispatch,
+    wait_until,
+)
+
+
+def _slow_send(structure) -> None:
+    time.sleep(0.002)  # Sending and sleep overshoot take time
+
+
+class TestInputDispatcher(TestCase):
+    def test_errors_do_not_accumulate(self):
+        trace = DispatchTrace()
+        delays = [0.01] * 30
+        sent = asyncio.run(dispatch(range(30), delays, _slow_send, trace=trace))
+
+        self.assertEqual(sent, 30)
+        self.assertEqual(len(trace.actual), 30)
+        self.assertAlmostEqual(trace.planned[-1], 0.29)
+        self.assertAlmostEqual(trace.planned_duration, 0.3)
+        # Sequential sleeps would be late by 30 * 2 ms at the end
+        self.assertLess(trace.actual_duration - trace.planned_duration, 0.02)
+        self.assertLess(trace.max_error, 0.02)
+        self.assertTrue(all(error >= 0 for error in trace.errors))
+        self.assertTrue(trace.completed)
+        self.assertTrue(trace.lags)
+
+    def test_spin(self):
+        trace = DispatchTrace()
+        asyncio.run(dispatch(range(10), [0.005] * 10, lambda _: None, 0.002, trace))
+        self.assertLess(trace.max_error, 0.001)
+
+    def test_catch_up_is_capped(self):
+        async def _test() -> DispatchTrace:
+            trace = DispatchTrace()
+            sends = []
+
+            def _send(structure) -> None:
+                sends.append(time.perf_counter())
+                if structure == 0:
+                    time.sleep(0.05)  # Blocks the event loop beyond the next deadline
+
+            await dispatch(range(3), [0.01, 0.01, 0], _send, trace=trace)
+            # The next inputs keep their delay instead of being sent in a burst
+            self.assertGreater(sends[2] - sends[1], 0.009)
+            return trace
+
+        trace = asyncio.run(_test())
+        self.assertAlmostEqual(trace.planned_duration, 0.02)
+        self.assertAlmostEqual(trace.actual_duration, 0.07, delta=0.01)
+        self.assertAlmostEqual(trace.errors[1], 0.05, delta=0.01)
+
+    def test_sleep_without_spin(self):
+        async def _test() -> float:
+            # An early wake-up is accepted rather than spent polling the clock
+            with patch("time.perf_counter", side_effect=[0.0, 0.001]):
+                return await wait_until(0.005)
+
+        self.assertAlmostEqual(asyncio.run(_test()), -0.004)
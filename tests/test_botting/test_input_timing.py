@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import tempfile
+
+from array import array
+from unittest import TestCase
+
+from botting.controller.inputs.input_dispatcher import DispatchTrace, dispatch
+from botting.controller.inputs.input_timing import (
+    InputTimingRecorder,
+    TimingRecord,
+    distribution,
+)
+
+ACTIONS = [("move", 0), ("single_jump", 3)]
+
+
+def _trace(sent: int, completed: bool) -> DispatchTrace:
+    planned = [0.0, 0.1, 0.2, 0.5, 0.6]
+    return DispatchTrace(
+        planned=array("d", planned[:sent]),
+        actual=array("d", [t + 0.01 * i for i, t in enumerate(planned[:sent])]),
+        lags=array("d", [0.001] * sent),
+        planned_duration=0.75 if completed else 0.0,
+        actual_duration=0.8 if completed else 0.0,
+        completed=completed,
+    )
+
+
+class TestInputTiming(TestCase):
+    def test_segments(self):
+        record = TimingRecord.from_trace(123, ACTIONS, 5, _trace(5, True))
+        (move, planned, actual), (jump, jump_planned, jump_actual) = record.segments
+        self.assertEqual((move, jump), ("move", "single_jump"))
+        self.assertAlmostEqual(planned, 0.5)
+        self.assertAlmostEqual(actual, 0.53)
+        self.assertAlmostEqual(jump_planned, 0.25)
+        self.assertAlmostEqual(jump_actual, 0.27)
+
+        # Interrupted sends only report the actions which were entirely sent
+        record = TimingRecord.from_trace(123, ACTIONS, 5, _trace(4, False))
+        self.assertEqual([segment[0] for segment in record.segments], ["move"])
+        record = TimingRecord.from_trace(123, ACTIONS, 5, _trace(3, False))
+        self.assertEqual(record.segments, [])
+
+    def test_report(self):
+        recorder = InputTimingRecorder(capacity=3)
+        recorder.register(123, "Bot")
+        for _ in range(4):
+            recorder.record(123, ACTIONS, 5, _trace(5, True))
+        recorder.record(456, ACTIONS, 5, _trace(4, False))
+        recorder.record(456, ACTIONS, 5, DispatchTrace())  # Nothing sent
+        self.assertEqual(len(recorder), 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "Input Timing.json")
+            asyncio.run(recorder.dump_async(path))
+            with open(path) as f:
+                bots = json.load(f)["bots"]
+
+        self.assertEqual(set(bots), {"Bot", "456"})
+        bot = bots["Bot"]
+        self.assertEqual((bot["sends"], bot["completed"], bot["inputs"]), (2, 2, 10))
+        self.assertAlmostEqual(bot["jitter"]["max"], 0.04)
+        self.assertAlmostEqual(bot["overshoot"]["p50"], 0.05)
+        self.assertEqual(bot["loop_lag"]["count"], 10)
+        move = bot["actions"]["move"]
+        self.assertEqual(move["count"], 2)
+        self.assertAlmostEqual(move["actual"] - move["planned"], 0.06)
+        self.assertEqual(bots["456"]["overshoot"], {"count": 0})
+        self.assertEqual(list(bots["456"]["actions"]), ["move"])
+
+    def test_dispatched_traces(self):
+        trace = DispatchTrace()
+        asyncio.run(dispatch(range(6), [0.01] * 6, lambda _: None, trace=trace))
+        recorder = InputTimingRecorder()
+        recorder.record(123, [("move", 0), ("teleport", 2)], 6, trace)
+        report = recorder.report()["bots"]["123"]
+        self.assertEqual(list(report["actions"]), ["move", "teleport"])
+        self.assertAlmostEqual(report["actions"]["teleport"]["planned"], 0.04)
+        self.assertGreater(report["loop_lag"]["count"], 0)
+
+    def test_distribution(self):
+        result = distribution([0.3, 0.1, 0.2, 0.4])
+        self.assertEqual((result["min"], result["p50"], result["max"]), (0.1, 0.2, 0.4))
+        self.assertEqual(result["p99"], 0.4)
+        self.assertAlmostEqual(result["mean"], 0.25)
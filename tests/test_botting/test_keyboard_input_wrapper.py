@@ -0,0 +1,128 @@
+import ctypes
+import importlib
+import itertools
+import pickle
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from botting.controller.inputs.focused_inputs import KeyboardInputWrapper
+
+# The package re-exports the focused_inputs function under the module's name
+focused_inputs = importlib.import_module("botting.controller.inputs.focused_inputs")
+
+_VIRTUAL_KEYS = {"left": 0x25, "up": 0x26, "right": 0x27, "alt": 0x12, "ctrl": 0x11}
+_VIRTUAL_KEYS["alt_right"] = _VIRTUAL_KEYS["alt"]
+
+
+def _key_codes(key: str, layout) -> tuple[int, int]:
+    return _VIRTUAL_KEYS[key], _VIRTUAL_KEYS[key] + 0x100
+
+
+def _movement() -> KeyboardInputWrapper:
+    inputs = KeyboardInputWrapper(123)
+    inputs.append(["left", "up"], ["keyup", "keyup"], 0.03)
+    inputs.append(["right", "alt"], ["keydown", "keydown"], 0.5)
+    inputs.fill("ctrl", "keydown", itertools.cycle([0.03, 0.033, 0.031]), 1.0)
+    inputs.append("alt", "keyup", 0.03)
+    return inputs
+
+
+class TestKeyboardInputWrapper(TestCase):
+    def test_duration(self):
+        inputs = _movement()
+        self.assertAlmostEqual(inputs.duration, sum(inputs.delays))
+        self.assertGreaterEqual(inputs.duration, 1.0)
+        self.assertEqual(KeyboardInputWrapper(123).duration, 0)
+
+    def test_keys_held(self):
+        inputs = _movement()
+        self.assertEqual(inputs.keys_held, {"right", "ctrl"})
+
+        # Iterating while appending
+        for key in inputs.keys_held:
+            inputs.append(key, "keyup", 0.03)
+        self.assertEqual(inputs.keys_held, set())
+
+        inputs.replace(1, ["right", "ctrl"], ["keydown", "keydown"])
+        self.assertEqual(inputs.keys_held, set())
+        last_release = max(i for i, key in enumerate(inputs.keys) if key == "right")
+        inputs.replace(last_release, "right", "keydown")
+        self.assertEqual(inputs.keys_held, {"right"})
+        inputs.append("up", "keydown", 0.03)
+        self.assertEqual(inputs.keys_held, {"right", "up"})
+
+    def test_truncate(self):
+        inputs = _movement()
+        for limit in (-1, 0, 0.01, 0.2, 0.7, 0.75, inputs.duration, 10):
+            # Reference implementation: inputs are kept until the limit is reached
+            expected = KeyboardInputWrapper(123)
+            for key, event, delay in zip(inputs.keys, inputs.events, inputs.delays):
+                if expected.duration >= limit:
+                    break
+                expected.append(key, event, delay)
+
+            result = inputs.truncate(limit)
+            self.assertEqual(result.keys, expected.keys)
+            self.assertEqual(result.events, expected.events)
+            self.assertEqual(list(result.delays), list(expected.delays))
+            self.assertEqual(result.keys_held, expected.keys_held)
+            self.assertIs(result.forced_key_releases, inputs.forced_key_releases)
+
+    def test_actions_are_marked(self):
+        inputs = _movement()
+        inputs.mark("move", 0)
+        inputs.mark("single_jump")
+        inputs.append("alt", "keydown", 0.03)
+        marks = [("move", 0), ("single_jump", len(inputs.keys) - 1)]
+        self.assertEqual(inputs.actions, marks)
+
+        self.assertEqual(inputs.truncate(0.5).actions, [("move", 0)])
+        inputs.mark("telecast", 0)
+        self.assertEqual(inputs.actions, [("telecast", 0)])
+
+    def test_lists_are_converted(self):
+        inputs = KeyboardInputWrapper(123, ["left"] * 2, ["keydown"] * 2, [0.1, 0.2])
+        self.assertAlmostEqual(inputs.duration, 0.3)
+        self.assertEqual(inputs.keys_held, {"left"})
+        self.assertEqual(inputs, _copy(inputs))
+
+    @patch.object(focused_inputs, "_keyboard_layout_handle", return_value=0)
+    @patch.object(focused_inputs, "_key_codes", side_effect=_key_codes)
+    def test_inputs_are_compiled_once(self, *_):
+        inputs = _movement()
+        steps = inputs.c_input
+        self.assertIs(inputs.c_input, steps)
+        self.assertEqual(len(steps), len(inputs.keys))
+        self.assertEqual([step[0].value for step in steps[:3]], [2, 2, 1])
+
+        structures = inputs._compiled.structures
+        self.assertEqual(len(structures), sum(step[0].value for step in steps))
+        self.assertEqual(structures[2].structure.ki.wVk, _VIRTUAL_KEYS["right"])
+        self.assertEqual(steps[1][2].value, ctypes.sizeof(focused_inputs.Input))
+
+        self.assertEqual(pickle.loads(pickle.dumps(inputs)), inputs)
+        inputs.append("up", "keydown", 0.03)
+        self.assertIsNot(inputs.c_input, steps)
+        self.assertEqual(len(inputs.c_input), len(inputs.keys))
+
+    @patch.object(focused_inputs, "_keyboard_layout_handle", return_value=0)
+    @patch.object(focused_inputs, "_key_codes", side_effect=_key_codes)
+    def test_held_keys_are_queried_once(self, *_):
+        held = {_VIRTUAL_KEYS["alt"], _VIRTUAL_KEYS["left"]}
+        with patch.object(
+            focused_inputs,
+            "GetAsyncKeyState",
+            side_effect=lambda vk: 0x8000 if vk in held else 0,
+        ) as state, patch.object(focused_inputs, "HIBYTE", lambda v: v >> 8):
+            keys = ["alt", "alt_right", "left", "right", "alt"]
+            self.assertEqual(
+                focused_inputs.held_keys(123, keys), ["alt", "alt_right", "left", "alt"]
+            )
+            self.assertEqual(state.call_count, 3)
+
+
+def _copy(inputs: KeyboardInputWrapper) -> KeyboardInputWrapper:
+    return KeyboardInputWrapper(
+        inputs.handle, list(inputs.keys), list(inputs.events), list(inputs.delays)
+    )
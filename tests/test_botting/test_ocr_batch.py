@@ -0,0 +1,77 @@
+import numpy as np
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from botting.visuals import ocr_batch
+from botting.visuals.ocr_batch import batch_config, read_batch, split_results, stitch
+from botting.visuals.ocr_cache import OCRCache
+
+
+class _Visual:
+    def __init__(self, cache: OCRCache) -> None:
+        self._ocr_cache = cache
+
+    @staticmethod
+    def _preprocess_img(image: np.ndarray) -> np.ndarray:
+        return image
+
+    def _ocr_key(self, image: np.ndarray, config: str | None, confidence: int):
+        return self._ocr_cache.make_key(image, config, confidence)
+
+
+class TestOCRBatch(TestCase):
+    def setUp(self) -> None:
+        # Dark text on white background, and white text on black background
+        self.light = np.full((10, 30), 255, dtype=np.uint8)
+        self.light[3:7, 5:10] = 0
+        self.dark = np.zeros((12, 50, 3), dtype=np.uint8)
+        self.dark[3:7, 5:10] = 255
+
+    def test_stitch_offsets(self):
+        page, offsets = stitch([self.light, self.dark])
+        self.assertEqual(page.ndim, 2)
+        self.assertEqual(len(offsets), 2)
+        (top1, bottom1), (top2, bottom2) = offsets
+        self.assertEqual(bottom1 - top1, 10)
+        self.assertEqual(bottom2 - top2, 12)
+        self.assertGreater(top2, bottom1)
+        self.assertGreaterEqual(page.shape[1], 50)
+
+    def test_stitch_normalizes_polarity(self):
+        page, offsets = stitch([self.light, self.light, self.dark])
+        top, bottom = offsets[2]
+        region = page[top:bottom]
+        # The dark image was inverted to match the (white) page background
+        self.assertEqual(region[0, 0], 255)
+        self.assertEqual(np.count_nonzero(region == 0), 20)
+
+    def test_split_results(self):
+        offsets = [(10, 20), (40, 52)]
+        data = {
+            "text": ["", "123", "45", "noise", "6"],
+            "conf": ["-1", "90", "95.5", "2", "80"],
+            "top": [0, 11, 12, 42, 41],
+            "height": [60, 8, 7, 8, 9],
+        }
+        self.assertEqual(split_results(data, offsets, 15), ["123 45", "6"])
+        self.assertEqual(split_results(data, offsets, 0), ["123 45", "noise 6"])
+
+    def test_batch_results_are_cached_under_batch_config(self):
+        config = "--psm 7 -c tessedit_char_whitelist=0123456789"
+        self.assertEqual(
+            batch_config(config), "--psm 6 -c tessedit_char_whitelist=0123456789"
+        )
+        visual = _Visual(OCRCache())
+        with patch.object(ocr_batch, "_read_stitched", return_value=["12", "34"]):
+            regions = [(visual, self.light, config), (visual, self.dark, config)]
+            self.assertEqual(read_batch(regions), ["12", "34"])
+            ocr_batch._read_stitched.assert_called_once()
+            config_read = ocr_batch._read_stitched.call_args[0][1]
+            self.assertEqual(config_read, batch_config(config))
+
+            # Batches hit the cache, whereas single reads (--psm 7) do not
+            self.assertEqual(read_batch(regions[:1]), ["12"])
+            ocr_batch._read_stitched.assert_called_once()
+        single_key = visual._ocr_key(self.light, config, 15)
+        self.assertIsNone(visual._ocr_cache.get(single_key))
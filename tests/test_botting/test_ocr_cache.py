@@ -0,0 +1,58 @@
+import numpy as np
+
+from unittest import TestCase
+
+from botting.visuals.ocr_cache import OCRCache
+
+
+class TestOCRCache(TestCase):
+    def setUp(self) -> None:
+        self.cache = OCRCache(max_size=2)
+        self.img = np.zeros((10, 20, 3), dtype=np.uint8)
+
+    def test_make_key_depends_on_content_and_config(self):
+        key = OCRCache.make_key(self.img, "Reader", "--psm 7")
+        self.assertEqual(key, OCRCache.make_key(self.img.copy(), "Reader", "--psm 7"))
+        self.assertNotEqual(key, OCRCache.make_key(self.img, "Reader", "--psm 8"))
+        self.assertNotEqual(key, OCRCache.make_key(self.img, "Other", "--psm 7"))
+
+        other = self.img.copy()
+        other[0, 0, 0] = 1
+        self.assertNotEqual(key, OCRCache.make_key(other, "Reader", "--psm 7"))
+
+    def test_make_key_depends_on_shape(self):
+        self.assertNotEqual(
+            OCRCache.make_key(self.img),
+            OCRCache.make_key(self.img.reshape((20, 10, 3))),
+        )
+
+    def test_hits_and_misses(self):
+        key = OCRCache.make_key(self.img)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "123")
+        self.assertEqual(self.cache.get(key), "123")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+    def test_lru_eviction(self):
+        self.cache.put(b"a", "a")
+        self.cache.put(b"b", "b")
+        self.cache.get(b"a")  # "b" becomes the least recently used
+        self.cache.put(b"c", "c")
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertIsNone(self.cache.get(b"b"))
+        self.assertEqual(self.cache.get(b"a"), "a")
+
+    def test_shared_store(self):
+        shared = {}
+        writer = OCRCache(shared=shared)
+        reader = OCRCache(shared=shared)
+        writer.put(b"key", "text")
+        self.assertEqual(reader.get(b"key"), "text")
+        self.assertEqual(reader.shared_hits, 1)
+
+        # Now cached locally
+        self.assertEqual(reader.get(b"key"), "text")
+        self.assertEqual(reader.hits, 1)
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from botting.core.action_data import ActionRequest, ActionResult, ActionWithValidation
+from botting.core.async_task_manager import AsyncTaskManager
+from botting.core.pending_actions import PENDING_ACTIONS, PendingActions
+
+
+class _EnginePipe:
+    """
+    Both ends of an Engine pipe, along with the MainProcess listener.
+    """
+
+    def __init__(self, manager: AsyncTaskManager, pending: PendingActions) -> None:
+        self.manager = manager
+        self.pending = pending
+
+    def send(self, request: ActionRequest) -> None:
+        request.reply = self.pending.resolve
+        self.manager.queue.put_nowait(request)
+
+
+async def _double(value: int) -> int:
+    await asyncio.sleep(0.01)
+    return 2 * value
+
+
+class TestPendingActions(TestCase):
+    def setUp(self) -> None:
+        self.manager = AsyncTaskManager(MagicMock())
+
+    async def _with_manager(self, coro, pending: PendingActions = PENDING_ACTIONS):
+        manager = asyncio.create_task(self.manager.start())
+        try:
+            return await coro(_EnginePipe(self.manager, pending))
+        finally:
+            self.manager.queue.put_nowait(None)
+            await manager
+
+    def test_results_are_sent_back(self):
+        pending = PendingActions()
+
+        async def _test(pipe: _EnginePipe) -> None:
+            request = ActionRequest("Double", _double, "Ign", args=(21,))
+            self.assertEqual(await pending.submit(pipe, request), 42)
+
+            blocker = ActionRequest(
+                "Blocker",
+                asyncio.sleep,
+                "Ign",
+                priority=10,
+                block_lower_priority=True,
+                args=(0.05,),
+            )
+            stale = ActionRequest("Stale", _double, "Ign", max_age=0.01, args=(1,))
+            futures = pending.submit(pipe, blocker), pending.submit(pipe, stale)
+            with self.assertRaises(asyncio.CancelledError):
+                await futures[1]
+            await futures[0]
+            self.assertEqual(len(pending), 0)
+
+        asyncio.run(self._with_manager(_test, pending))
+
+    def test_failures_are_raised(self):
+        pending = PendingActions()
+
+        async def _test() -> None:
+            fut = pending.submit(MagicMock(), ActionRequest("Test", _double, "Ign"))
+            pending.resolve(ActionResult(1, "failed", error=KeyError("key")))
+            with self.assertRaises(KeyError):
+                await fut
+
+            # Results arriving after the caller stopped waiting are ignored
+            fut = pending.submit(MagicMock(), ActionRequest("Test", _double, "Ign"))
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(fut, 0.01)
+            self.assertEqual(len(pending), 0)
+            pending.resolve(ActionResult(2, "completed"))
+
+        asyncio.run(_test())
+
+    def test_validation_awaits_results(self):
+        state = {"validated": False}
+
+        async def _procedure() -> None:
+            state["validated"] = True
+
+        async def _test(pipe: _EnginePipe) -> float:
+            validator = ActionWithValidation(
+                pipe, lambda: state["validated"], None, timeout=1.0
+            )
+            start = time.perf_counter()
+            await validator.execute_async(ActionRequest("Test", _procedure, "Ign"))
+            return time.perf_counter() - start
+
+        self.assertLess(asyncio.run(self._with_manager(_test)), 0.05)
+        self.assertTrue(state["validated"])
@@ -0,0 +1,70 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+
+from contextlib import aclosing
+from unittest import TestCase
+from unittest.mock import patch
+
+from botting.utilities.pipe_reader import pipe_messages
+
+
+async def _receive(pipe, count: int) -> list:
+    received = []
+    async with aclosing(pipe_messages(pipe)) as messages:
+        async for message in messages:
+            received.append(message)
+            if len(received) == count:
+                break
+    return received
+
+
+class TestPipeMessages(TestCase):
+    def setUp(self) -> None:
+        self.receiver, self.sender = multiprocessing.Pipe(duplex=False)
+
+    def tearDown(self) -> None:
+        self.receiver.close()
+        self.sender.close()
+
+    def test_all_available_messages_are_drained(self):
+        for i in range(5):
+            self.sender.send(i)
+        self.assertEqual(asyncio.run(_receive(self.receiver, 5)), list(range(5)))
+
+    def test_no_thread_is_used_with_readers(self):
+        async def _run() -> tuple[list, float, int]:
+            loop = asyncio.get_running_loop()
+            task = asyncio.create_task(_receive(self.receiver, 1))
+            await asyncio.sleep(0.05)
+            threads = threading.active_count()
+            loop.call_soon(self.sender.send, "message")
+            start = time.perf_counter()
+            result = await task
+            return result, time.perf_counter() - start, threads
+
+        before = threading.active_count()
+        received, latency, during = asyncio.run(_run())
+        self.assertEqual(received, ["message"])
+        self.assertEqual(during, before)
+        self.assertLess(latency, 0.05)
+
+        # The file descriptor is unregistered once iteration stops
+        async def _reregister() -> None:
+            self.sender.send("other")
+            self.assertEqual(await _receive(self.receiver, 1), ["other"])
+
+        asyncio.run(_reregister())
+
+    def test_threaded_fallback(self):
+        async def _run() -> list:
+            loop = asyncio.get_running_loop()
+            with patch.object(loop, "add_reader", side_effect=NotImplementedError):
+                task = asyncio.create_task(_receive(self.receiver, 3))
+                await asyncio.sleep(0.05)
+                for i in range(3):
+                    self.sender.send(i)
+                return await task
+
+        self.assertEqual(asyncio.run(_run()), [0, 1, 2])
@@ -0,0 +1,90 @@
+import multiprocessing
+import pickle
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from botting.core.decision_maker import DecisionMaker
+from botting.core.shared_primitives import SHARED_PRIMITIVES, SharedPrimitives
+
+
+class TestSharedPrimitives(TestCase):
+    def setUp(self) -> None:
+        self.primitives = SharedPrimitives()
+
+    def test_provision_is_idempotent_per_name(self):
+        lock = self.primitives.provision("Test(Ign)", "Lock")
+        self.assertIs(self.primitives.provision("Test(Ign)", "Lock"), lock)
+        self.assertIs(self.primitives.get("Test(Ign)", "Lock"), lock)
+        self.assertIsNone(self.primitives.get("Test(Ign)", "Condition"))
+        with self.assertRaises(ValueError):
+            self.primitives.provision("Test(Ign)", "Condition")
+
+    def test_primitives_are_pickled_by_name(self):
+        lock = SHARED_PRIMITIVES.provision("TestPickle(Ign)", "Lock")
+        self.assertIs(pickle.loads(pickle.dumps(lock)), lock)
+        release = pickle.loads(pickle.dumps(lock.release))
+        self.assertTrue(lock.acquire(timeout=0.1))
+        release()  # Bound methods resolve to the same primitive
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+
+        unknown = SharedPrimitives().provision("TestUnknown(Ign)", "Lock")
+        with self.assertRaises(KeyError):
+            pickle.loads(pickle.dumps(unknown))
+
+    def test_primitives_are_shared_with_child_processes(self):
+        condition = SHARED_PRIMITIVES.provision("TestChild - Disabler", "Condition")
+        results = multiprocessing.Queue()
+        with condition:
+            child = multiprocessing.Process(
+                target=_try_acquire, args=(SHARED_PRIMITIVES.export(), results)
+            )
+            child.start()
+            self.assertFalse(results.get(timeout=10))
+        child.join(timeout=10)
+        self.assertEqual(child.exitcode, 0)
+
+    def test_request_proxy_returns_native_primitive(self):
+        class TestMaker(DecisionMaker):
+            _primitives = {"{cls}({ign})": "Lock"}
+
+            async def _decide(self) -> None:
+                pass
+
+        declared = TestMaker.shared_primitives("Ign")
+        self.assertEqual(declared, {"TestMaker(Ign)": "Lock"})
+        for name, primitive_type in declared.items():
+            SHARED_PRIMITIVES.provision(name, primitive_type)
+
+        metadata = MagicMock()
+        lock = DecisionMaker.request_proxy(metadata, "TestMaker(Ign)", "Lock")
+        self.assertIs(lock, SHARED_PRIMITIVES.get("TestMaker(Ign)"))
+        metadata.__getitem__.assert_not_called()
+
+    def test_declarations_are_combined_across_bases(self):
+        class SetupMixin:
+            _primitives = {"{cls}({ign}) Initial Setup": "Condition"}
+
+        class TestMaker(SetupMixin, DecisionMaker):
+            _primitives = {"{cls}({ign})": "Lock"}
+
+            async def _decide(self) -> None:
+                pass
+
+        class TestSubMaker(TestMaker):
+            pass
+
+        self.assertEqual(
+            TestSubMaker.shared_primitives("Ign"),
+            {
+                "TestSubMaker(Ign) Initial Setup": "Condition",
+                "TestSubMaker(Ign)": "Lock",
+            },
+        )
+
+
+def _try_acquire(primitives: dict, results: multiprocessing.Queue) -> None:
+    SHARED_PRIMITIVES.attach(primitives)
+    condition = SHARED_PRIMITIVES.get("TestChild - Disabler", "Condition")
+    results.put(condition.acquire(timeout=0.1))
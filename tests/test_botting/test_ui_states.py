@@ -0,0 +1,67 @@
+import numpy as np
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from botting.utilities import Box
+from botting.visuals.ui_states import UIStateRegistry
+
+
+class TestUIStateRegistry(TestCase):
+    def setUp(self) -> None:
+        self.registry = UIStateRegistry(max_states=2)
+        self.img = np.zeros((10, 20, 3), dtype=np.uint8)
+        self.other = self.img.copy()
+        self.other[0, 0] = 255
+
+    def test_registered_state_skips_fallback(self):
+        fallback = MagicMock(return_value=False)
+        self.registry.register("title", self.img, True)
+        self.assertTrue(self.registry.lookup("title", self.img.copy(), fallback))
+        fallback.assert_not_called()
+        self.assertIsNone(self.registry.lookup("other region", self.img))
+
+    def test_fallback_result_is_learned(self):
+        fallback = MagicMock(return_value=None)
+        self.assertIsNone(self.registry.lookup("tab", self.other, fallback))
+        self.assertIsNone(self.registry.lookup("tab", self.other, fallback))
+        fallback.assert_called_once()
+        self.assertEqual(self.registry.hits, 1)
+        self.assertEqual(self.registry.misses, 1)
+
+        self.registry.lookup("tab", self.img, fallback, learn=False)
+        self.registry.lookup("tab", self.img, fallback, learn=False)
+        self.assertEqual(fallback.call_count, 3)
+
+    def test_least_recently_used_states_are_evicted(self):
+        third = self.img.copy()
+        third[-1, -1] = 1
+        self.registry.register("tab", self.img, "Use")
+        self.registry.register("tab", self.other, "Etc")
+        self.registry.lookup("tab", self.img)
+        self.registry.register("tab", third, "Cash")
+        self.assertEqual(self.registry.lookup("tab", self.img), "Use")
+        self.assertIsNone(self.registry.lookup("tab", self.other))
+
+    @patch("botting.visuals.ui_states.find_image")
+    def test_find_skips_template_matching_when_unchanged(self, mock_find):
+        haystack = np.zeros((100, 100, 3), dtype=np.uint8)
+        haystack[10:20, 30:50] = 200
+        box = Box(left=30, right=50, top=10, bottom=20)
+        mock_find.return_value = [box]
+
+        self.assertEqual(
+            self.registry.find("icon", haystack, self.img, add_margins=False), [box]
+        )
+        haystack[80:, 80:] = 100  # Somewhere else in the image
+        self.assertEqual(
+            self.registry.find("icon", haystack, self.img, add_margins=False), [box]
+        )
+        mock_find.assert_called_once()
+
+        haystack[15, 40] = 0  # Icon moved or got obstructed
+        mock_find.return_value = []
+        self.assertEqual(
+            self.registry.find("icon", haystack, self.img, add_margins=False), []
+        )
+        self.assertEqual(mock_find.call_count, 2)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from unittest import TestCase
+
+from royals.model.interface.fixed_components.in_game_chat.chat_classifier import (
+    ChatTypeClassifier,
+)
+
+
+class Red:
+    chat_color = ((0, 0, 250), (0, 0, 255))
+    threshold = 5
+
+
+class White:
+    chat_color = ((255, 255, 255), (255, 255, 255))
+    threshold = 5
+
+
+class Blue:
+    chat_color = ((255, 0, 0), (255, 0, 0))
+    threshold = 5
+
+
+class Placeholder:
+    chat_color = ((1, 1, 1), (0, 0, 0))
+    threshold = 0
+
+
+class TestChatTypeClassifier(TestCase):
+    line_height = 13
+
+    def setUp(self) -> None:
+        self.classifier = ChatTypeClassifier(
+            [Red, White, Blue, Placeholder], suppressions={"Red": {"White"}}
+        )
+
+    def _line(self, *colors: tuple[tuple[int, int, int], int]) -> np.ndarray:
+        line = np.zeros((self.line_height, 400, 3), dtype=np.uint8)
+        col = 0
+        for color, nbr_pixels in colors:
+            line[5, col : col + nbr_pixels] = color
+            col += nbr_pixels
+        return line
+
+    def test_single_line(self):
+        self.assertEqual(self.classifier.classify(self._line(((0, 0, 252), 10))), [Red])
+        self.assertEqual(self.classifier.classify(self._line(((0, 0, 252), 3))), [None])
+
+    def test_feed_classified_in_one_pass(self):
+        feed = np.vstack(
+            [
+                self._line(((255, 255, 255), 10)),
+                self._line(((255, 0, 0), 10)),
+                self._line(),
+                self._line(((0, 0, 255), 6)),
+            ]
+        )
+        self.assertEqual(self.classifier.classify(feed, 4), [White, Blue, None, Red])
+
+    def test_skipped_rows_and_columns_are_ignored(self):
+        line = self._line()
+        line[0:2, :] = (255, 0, 0)  # Top rows belong to the previous line
+        line[5, 360:] = (255, 0, 0)  # Right-hand side of the line is ignored
+        self.assertEqual(self.classifier.classify(line), [None])
+
+    def test_suppression_rule(self):
+        line = self._line(((255, 255, 255), 50), ((0, 0, 255), 6))
+        self.assertEqual(self.classifier.classify(line), [Red])
+
+    def test_ambiguity_resolved_by_relative_count(self):
+        line = self._line(((255, 0, 0), 50), ((255, 255, 255), 6))
+        self.assertEqual(self.classifier.classify(line), [Blue])
+
+    def test_overlapping_colors_are_rejected(self):
+        class AlsoRed(Red):
+            pass
+
+        with self.assertRaises(ValueError):
+            ChatTypeClassifier([Red, AlsoRed])
@@ -0,0 +1,84 @@
+import asyncio
+import cv2
+import numpy as np
+import os
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from botting.utilities import Box
+from royals.model.interface.fixed_components.in_game_chat.chat_watcher import (
+    ChatWatcher,
+)
+from paths import ROOT
+
+
+class TestChatWatcher(TestCase):
+    nbr_lines = 4
+    feed_box = Box(left=4, right=628, top=672, bottom=724)
+    detection_box = Box(left=6, right=82, top=732, bottom=750)
+    region = Box(left=4, right=628, top=672, bottom=750)
+
+    def setUp(self) -> None:
+        img_path = os.path.join(ROOT, "tests", "images")
+        self.lines = []
+        for i in range(1, 9):
+            img = cv2.imread(os.path.join(img_path, f"line_test_{i}.png"))
+            line = np.zeros((13, self.feed_box.width, 3), dtype=np.uint8)
+            line[: img.shape[0], : img.shape[1]] = img[:13, : self.feed_box.width]
+            self.lines.append(line)
+
+        self.chat_feed = MagicMock()
+        self.chat_feed.get_nbr_lines_displayed.return_value = self.nbr_lines
+        self.chat_feed.get_chat_feed_box.return_value = self.feed_box
+        self.chat_feed._chat_feed_displayed_detection_box = self.detection_box
+        self.chat_feed.is_displayed.return_value = True
+        self.watcher = ChatWatcher(self.chat_feed, handle=0)
+
+    def _screenshot(self, *line_indexes: int) -> np.ndarray:
+        image = np.zeros((self.region.height, self.region.width, 3), dtype=np.uint8)
+        image[: self.feed_box.height] = np.vstack([self.lines[i] for i in line_indexes])
+        return image
+
+    def test_scroll_offset(self):
+        self.assertEqual(ChatWatcher.scroll_offset(list("abcd"), list("abcd")), 0)
+        self.assertEqual(ChatWatcher.scroll_offset(list("abcd"), list("cdef")), 2)
+        self.assertEqual(ChatWatcher.scroll_offset(list("abcd"), list("wxyz")), 4)
+        self.assertEqual(ChatWatcher.scroll_offset(list("abc"), list("wxyz")), 4)
+
+    def test_only_new_lines_are_returned(self):
+        self.assertEqual(self.watcher.poll(self._screenshot(0, 1, 2, 3)), [])
+        self.assertEqual(self.watcher.poll(self._screenshot(0, 1, 2, 3)), [])
+
+        new_lines = self.watcher.poll(self._screenshot(2, 3, 4, 5))
+        self.assertEqual([line.name for line in new_lines], ["TVSmega", "General"])
+        np.testing.assert_array_equal(new_lines[0].image, self.lines[4])
+        self.assertIsNone(new_lines[0]._text)  # Not read until accessed
+
+        # Screenshot region and feed box are only detected once
+        self.chat_feed.get_chat_feed_box.assert_called_once()
+
+    def test_emit_existing(self):
+        self.watcher.emit_existing = True
+        new_lines = self.watcher.poll(self._screenshot(0, 1, 2, 3))
+        self.assertEqual(
+            [line.name for line in new_lines], ["Smega", "Notice", "Notice", "Smega"]
+        )
+
+    def test_hidden_feed_resets_watcher(self):
+        self.watcher.poll(self._screenshot(0, 1, 2, 3))
+        self.chat_feed.is_displayed.return_value = False
+        self.assertEqual(self.watcher.poll(self._screenshot(4, 5, 6, 7)), [])
+        self.assertIsNone(self.watcher.region)
+
+    def test_watch(self):
+        screenshots = [self._screenshot(0, 1, 2, 3), self._screenshot(1, 2, 3, 6)]
+
+        async def _collect():
+            async for line in self.watcher.watch(interval=0):
+                return line
+
+        self.watcher.poll(screenshots[0])
+        poll = self.watcher.poll
+        self.watcher.poll = lambda: poll(screenshots[1])
+        self.assertEqual(asyncio.run(_collect()).name, "General")
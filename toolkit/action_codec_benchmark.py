@@ -0,0 +1,128 @@
+"""
+Benchmarks the transfer of ActionRequests from an Engine to the MainProcess.
+Each request is pickled as a full ActionRequest (legacy) and through the compact
+wire format of botting.core.action_codec. Times include encoding and decoding.
+
+Usage: python -m toolkit.action_codec_benchmark [--number N]
+"""
+import argparse
+import asyncio
+import numpy as np
+import sys
+
+from functools import partial
+from multiprocessing.reduction import ForkingPickler
+from timeit import repeat
+
+from botting import controller
+from botting.core import (
+    ActionRequest,
+    ActionWithValidation,
+    DiscordRequest,
+    SHARED_PRIMITIVES,
+)
+from botting.core.action_codec import decode, encode
+
+HANDLE = 0x000A0B0C
+
+
+def _rotation_inputs() -> controller.KeyboardInputWrapper:
+    inputs = controller.KeyboardInputWrapper(HANDLE)
+    inputs.append("left", "keydown", 0.05)
+    inputs.append(["alt", "up"], ["keydown", "keydown"], 0.1)
+    for _ in range(20):
+        inputs.append("ctrl", "keydown", 0.033)
+    inputs.append(["alt", "up"], ["keyup", "keyup"], 0.03)
+    inputs.forced_key_releases.append("ctrl")
+    return inputs
+
+
+def _frame() -> np.ndarray:
+    # Game frames are mostly flat regions, unlike random noise.
+    frame = np.zeros((768, 1024, 3), dtype=np.uint8)
+    frame[:, :, 0] = np.arange(1024, dtype=np.uint16)[None, :] // 8
+    frame[600:, :, 1] = 120
+    frame[100:200, 300:500] = (30, 200, 90)
+    return frame
+
+
+def requests() -> dict[str, ActionRequest]:
+    condition = SHARED_PRIMITIVES.provision("Benchmark - Validation", "Condition")
+    lock = SHARED_PRIMITIVES.provision("Benchmark(Ign)", "Lock")
+    inputs = _rotation_inputs()
+    return {
+        "rotation (inputs.send)": ActionRequest(
+            "Rotation(Benchmark)",
+            inputs.send,
+            ign="Benchmark",
+            cancels_itself=True,
+            callbacks=[lock.release],
+        ),
+        "press (registered)": ActionRequest(
+            "Consumables(Benchmark)",
+            controller.press,
+            "Benchmark",
+            args=(HANDLE, "pageup"),
+            kwargs={"silenced": True},
+        ),
+        "validated procedure": ActionRequest(
+            "Ensure Minimap Displayed",
+            partial(
+                ActionWithValidation._wrapped_procedure,
+                controller.press,
+                condition,
+                5.0,
+            ),
+            "Benchmark",
+            priority=10,
+            block_lower_priority=True,
+            args=(HANDLE, "m"),
+        ),
+        "discord alert (frame)": ActionRequest(
+            "Rotation(Benchmark) - Failsafe",
+            asyncio.sleep,
+            "Benchmark",
+            discord_request=DiscordRequest("Failsafe triggered.", _frame()),
+            args=(0,),
+        ),
+    }
+
+
+def _legacy(request: ActionRequest) -> ActionRequest:
+    return ForkingPickler.loads(ForkingPickler.dumps(request))
+
+
+def _codec(request: ActionRequest) -> ActionRequest:
+    return decode(ForkingPickler.loads(ForkingPickler.dumps(encode(request))))
+
+
+def run(number: int) -> None:
+    print(
+        f"{'Request':<26}{'legacy':>10}{'codec':>10}"
+        f"{'legacy':>12}{'codec':>12}{'speedup':>9}"
+    )
+    for name, request in requests().items():
+        n = max(number // 100, 10) if "frame" in name else number
+        sizes = [
+            len(ForkingPickler.dumps(request)),
+            len(ForkingPickler.dumps(encode(request))),
+        ]
+        times = [
+            min(repeat(partial(func, request), number=n, repeat=5)) / n * 1e6
+            for func in (_legacy, _codec)
+        ]
+        print(
+            f"{name:<26}{sizes[0]:>8} B{sizes[1]:>8} B"
+            f"{times[0]:>9.1f} us{times[1]:>9.1f} us{times[0] / times[1]:>8.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.number)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
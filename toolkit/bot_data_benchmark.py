@@ -0,0 +1,112 @@
+"""
+Microbenchmarks of BotData reads and updates.
+The current implementation is compared against the one found at a given git
+revision, such as the revision preceding the monotonic-clock implementation.
+Only botting/core/bot_data.py is loaded from the given revision, and the modules it
+imports are loaded from the working tree. The botting packages are registered without
+running their __init__, which import Windows-only dependencies, such that this can be
+run without a client (and on Linux).
+
+Usage: python -m toolkit.bot_data_benchmark --baseline REV [--number N]
+"""
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import types
+import numpy as np
+
+from timeit import repeat
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_PATH = "botting/core/bot_data.py"
+
+
+def _register_packages() -> None:
+    """
+    BotData only depends on the standard library, numpy and its sibling modules.
+    """
+    for name in ("botting", "botting.core"):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [os.path.join(ROOT, *name.split("."))]
+            sys.modules[name] = package
+
+
+def load_current() -> types.ModuleType:
+    _register_packages()
+    return importlib.import_module("botting.core.bot_data")
+
+
+def load_revision(revision: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{MODULE_PATH}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    _register_packages()
+    module = types.ModuleType(f"bot_data_{revision}")
+    module.__package__ = "botting.core"
+    exec(compile(source, f"{revision}:{MODULE_PATH}", "exec"), module.__dict__)
+    return module
+
+
+def scenarios(module: types.ModuleType) -> dict[str, callable]:
+    """
+    Each scenario is a callable performing a single operation on a fresh BotData.
+    """
+    img = np.random.randint(0, 256, (768, 1024, 3), dtype=np.uint8)
+    data = module.BotData("Benchmark")
+    data.create_attribute("no_threshold", lambda: (10, 20))
+    data.create_attribute("within_threshold", lambda: (10, 20), threshold=60)
+    data.create_attribute("tuple_update", lambda: (10, 20))
+    data.create_attribute("img_update", lambda: img)
+    data.create_attribute("history", lambda: None, initial_value=(10, 20))
+    for _ in range(module.N_RET_VALUES):
+        data.history = None
+    data.history = (10, 20)
+    data.history = None
+
+    return {
+        "read (no threshold)": lambda: data.no_threshold,
+        "read (within threshold)": lambda: data.within_threshold,
+        "update (tuple)": lambda: data.update_attribute("tuple_update"),
+        "update (client image)": lambda: data.update_attribute("img_update"),
+        "get_last_known_value": lambda: data.get_last_known_value("history", False),
+    }
+
+
+def run(module: types.ModuleType, number: int) -> dict[str, float]:
+    """
+    :return: Best time per operation (in nanoseconds) for each scenario.
+    """
+    results = {}
+    for name, func in scenarios(module).items():
+        n = max(number // 100, 10) if "image" in name else number
+        results[name] = min(repeat(func, number=n, repeat=5)) / n * 1e9
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--baseline", required=True, help="Git revision to compare against."
+    )
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    baseline = run(load_revision(args.baseline), args.number)
+    current = run(load_current(), args.number)
+    print(f"{'Scenario':<28}{args.baseline:>14}{'current':>14}{'speedup':>10}")
+    for name in current:
+        print(
+            f"{name:<28}{baseline[name]:>11.0f} ns{current[name]:>11.0f} ns"
+            f"{baseline[name] / current[name]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Microbenchmarks of building KeyboardInputWrapper structures, as done for movements.
+The current implementation is compared against the one found at a given git
+revision, such as the revision preceding the array-backed implementation.
+Only botting/controller/inputs/focused_inputs.py is loaded from the given revision,
+and the rest of the botting.controller package is imported from the working tree.
+
+Usage: python -m toolkit.keyboard_inputs_benchmark --baseline REV [--number N]
+"""
+import argparse
+import importlib
+import itertools
+import subprocess
+import sys
+import types
+
+from timeit import repeat
+
+from paths import ROOT
+
+MODULE_PATH = "botting/controller/inputs/focused_inputs.py"
+HANDLE = 0x000A0B0C
+
+
+def load_current() -> types.ModuleType:
+    return importlib.import_module("botting.controller.inputs.focused_inputs")
+
+
+def load_revision(revision: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{MODULE_PATH}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # Earlier revisions padded durations with an OVERHEAD constant, since removed.
+    # Without it, both implementations build the same structures.
+    helpers = importlib.import_module("botting.controller.inputs.inputs_helpers")
+    if not hasattr(helpers, "OVERHEAD"):
+        helpers.OVERHEAD = 0.0
+    module = types.ModuleType(f"focused_inputs_{revision}")
+    module.__package__ = "botting.controller.inputs"
+    exec(compile(source, f"{revision}:{MODULE_PATH}", "exec"), module.__dict__)
+    return module
+
+
+def _movement(module: types.ModuleType, duration: float):
+    """
+    Same structure as movements_v2.move: the direction is pressed, then repeated
+    until the duration is reached.
+    """
+    delays = itertools.cycle([0.031, 0.033, 0.029, 0.032])
+    inputs = module.KeyboardInputWrapper(HANDLE)
+    inputs.append(["up", "down"], ["keyup", "keyup"], next(delays))
+    for key in inputs.keys_held:
+        inputs.append(key, "keyup", next(delays))
+    inputs.append(["left"], ["keydown"], 0.5)
+    inputs.fill("left", "keydown", delays, limit=duration)
+    return inputs
+
+
+def scenarios(module: types.ModuleType) -> dict[str, callable]:
+    """
+    Each scenario is a callable performing a single operation.
+    """
+    long_movement = _movement(module, 5.0)
+    return {
+        "move (1s)": lambda: _movement(module, 1.0),
+        "move (5s)": lambda: _movement(module, 5.0),
+        "keys_held (5s)": lambda: long_movement.keys_held,
+        "truncate (5s to 2s)": lambda: long_movement.truncate(2.0),
+    }
+
+
+def run(module: types.ModuleType, number: int) -> dict[str, float]:
+    """
+    :return: Best time per operation (in microseconds) for each scenario.
+    """
+    results = {}
+    for name, func in scenarios(module).items():
+        results[name] = min(repeat(func, number=number, repeat=5)) / number * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--baseline", required=True, help="Git revision to compare against."
+    )
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    baseline = run(load_revision(args.baseline), args.number)
+    current = run(load_current(), args.number)
+    print(f"{'Scenario':<24}{args.baseline:>14}{'current':>14}{'speedup':>10}")
+    for name in current:
+        print(
+            f"{name:<24}{baseline[name]:>11.1f} us{current[name]:>11.1f} us"
+            f"{baseline[name] / current[name]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
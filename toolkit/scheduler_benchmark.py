@@ -0,0 +1,317 @@
+"""
+Replays a stream of ActionRequests through the AsyncTaskManager, as if many Bots
+were flooding the MainProcess. Procedures are replaced by sleeps of the recorded
+duration, such that only scheduling is measured.
+
+Streams are JSON lines, one ActionRequest per line:
+{"at": 0.1, "identifier": "Rotation(Bot0)", "ign": "Bot0", "priority": 1,
+ "duration": 0.5, "block_lower_priority": false, "cancels_itself": false,
+ "cancel_tasks": [], "requeue": true, "max_age": 0.5, "locked": true}
+"at" is the time (in seconds) at which the request is sent. "locked" requests are
+guarded by their DecisionMaker's Lock: they are not sent while the previous request
+with the same identifier is pending, and the Lock is released through callbacks.
+Without --replay, a synthetic stream of Rotation, MobsHitting, failsafe, rebuff and
+consumable requests is generated for each Bot.
+
+Reported per priority: throughput, queue wait percentiles (from reception until the
+procedure starts), cancellations, requests dropped by the scheduler and starvation
+(requests which waited longer than --starvation, or never ran).
+
+Usage: python -m toolkit.scheduler_benchmark [--bots N] [--duration S]
+    [--time-scale X] [--seed N] [--record PATH | --replay PATH] [--json PATH]
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+import types
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# As in royals.actions.priorities
+ROTATION = 1
+FOOD = 1
+MOBS_HITTING = 2
+BUFFS = 3
+FAILSAFE = 29
+
+
+def _import_scheduler() -> types.ModuleType:
+    """
+    The AsyncTaskManager only depends on the standard library and numpy. The
+    botting packages are registered without running their __init__, which import
+    Windows-only dependencies, such that the harness runs headless on Linux.
+    """
+    for name in ("botting", "botting.core"):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [os.path.join(ROOT, *name.split("."))]
+            sys.modules[name] = package
+    return importlib.import_module("botting.core.async_task_manager")
+
+
+scheduler = _import_scheduler()
+ActionRequest = scheduler.ActionRequest
+LatencyHistogram = scheduler.LatencyHistogram
+
+
+def synthetic_stream(bots: int, duration: float, seed: int) -> list[dict]:
+    """
+    Each Bot runs a Rotation deciding every 0.1s, MobsHitting interrupting it every
+    1.5s on average, along with occasional failsafes, rebuffs and consumables.
+    """
+    rng = random.Random(seed)
+    events = []
+
+    def _poisson(mean: float, **request) -> None:
+        at = rng.expovariate(1 / mean)
+        while at < duration:
+            events.append(dict(request, at=at, duration=request["duration"]()))
+            at += rng.expovariate(1 / mean)
+
+    for i in range(bots):
+        ign = f"Bot{i}"
+        rotation = f"Rotation({ign})"
+        for step in range(int(duration / 0.1)):
+            events.append(
+                dict(
+                    at=step * 0.1 + rng.uniform(0, 0.01),
+                    identifier=rotation,
+                    ign=ign,
+                    priority=ROTATION,
+                    duration=rng.uniform(0.2, 0.8),
+                    max_age=0.5,
+                    locked=True,
+                )
+            )
+        _poisson(
+            1.5,
+            identifier=f"MobsHitting({ign})",
+            ign=ign,
+            priority=MOBS_HITTING,
+            duration=lambda: rng.uniform(0.3, 0.6),
+            block_lower_priority=True,
+            cancels_itself=True,
+            cancel_tasks=[rotation],
+        )
+        _poisson(
+            20.0,
+            identifier=f"{rotation} - Failsafe",
+            ign=ign,
+            priority=FAILSAFE,
+            duration=lambda: 3.0,
+            block_lower_priority=True,
+            cancels_itself=True,
+            cancel_tasks=[rotation],
+        )
+        _poisson(
+            15.0,
+            identifier=f"PartyRebuff({ign})",
+            ign=ign,
+            priority=BUFFS,
+            duration=lambda: 1.0,
+            block_lower_priority=True,
+            locked=True,
+        )
+        _poisson(
+            8.0,
+            identifier=f"Consumables({ign})",
+            ign=ign,
+            priority=FOOD,
+            duration=lambda: 0.1,
+            locked=True,
+        )
+    return sorted(events, key=lambda event: event["at"])
+
+
+@dataclass
+class PriorityReport:
+    sent: int = 0
+    skipped: int = 0  # Not sent since the Lock of the DecisionMaker was held
+    started: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    expired: int = 0
+    superseded: int = 0
+    parked: int = 0
+    starved: int = 0
+    waits: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_json(self, elapsed: float) -> dict:
+        return {
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "superseded": self.superseded,
+            "parked": self.parked,
+            "starved": self.starved,
+            "throughput": self.completed / elapsed,
+            "wait_ms": {
+                f"p{p}": self.waits.percentile(p) / 1e6 for p in (50, 90, 99)
+            }
+            | {"max": self.waits.max / 1e6},
+        }
+
+
+class Replay:
+    """
+    Sends the stream to a real AsyncTaskManager and collects the outcome of every
+    request.
+    """
+
+    def __init__(self, time_scale: float, starvation: float) -> None:
+        self.time_scale = time_scale
+        self.starvation_ns = int(starvation / time_scale * 1e9)
+        self.manager = scheduler.AsyncTaskManager(discord_pipe=None)
+        self.reports: dict[int, PriorityReport] = defaultdict(PriorityReport)
+        self._held: set[str] = set()
+        self._priorities: dict[str, int] = {}
+        self._unstarted: dict[int, ActionRequest] = {}
+
+    async def run(self, events: list[dict]) -> float:
+        """
+        :return: The elapsed time, in seconds.
+        """
+        manager = asyncio.create_task(self.manager.start())
+        start = time.perf_counter()
+        for event in events:
+            delay = start + event["at"] / self.time_scale - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._send(event)
+        # Let pending requests run their course
+        while self.manager.running_tasks or self.manager.queue.qsize():
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        self.manager.queue.put_nowait(None)
+        await manager
+        self._collect()
+        return elapsed
+
+    def _send(self, event: dict) -> None:
+        identifier = event["identifier"]
+        report = self.reports[event["priority"]]
+        if event.get("locked") and identifier in self._held:
+            report.skipped += 1
+            return
+
+        request = ActionRequest(
+            identifier,
+            self._procedure,
+            event["ign"],
+            priority=event["priority"],
+            cancels_itself=event.get("cancels_itself", False),
+            cancel_tasks=event.get("cancel_tasks", []),
+            requeue_if_not_scheduled=event.get("requeue", True),
+            block_lower_priority=event.get("block_lower_priority", False),
+            max_age=event.get("max_age"),
+        )
+        if request.max_age is not None:
+            request.max_age /= self.time_scale
+        request.args = (request, event["duration"] / self.time_scale, report)
+        request.cancel_callback = lambda fut, r=report: self._done(fut, r)
+        if event.get("locked"):
+            self._held.add(identifier)
+            request.callbacks.append(lambda: self._held.discard(identifier))
+        self._priorities[identifier] = event["priority"]
+        self._unstarted[id(request)] = request
+        report.sent += 1
+        self.manager.queue.put_nowait(request)
+
+    async def _procedure(
+        self, request: ActionRequest, duration: float, report: PriorityReport
+    ) -> None:
+        wait = time.perf_counter_ns() - request.received_at
+        del self._unstarted[id(request)]
+        report.started += 1
+        report.waits.record(wait)
+        report.starved += wait > self.starvation_ns
+        await asyncio.sleep(duration)
+
+    @staticmethod
+    def _done(fut: asyncio.Future, report: PriorityReport) -> None:
+        if fut.cancelled():
+            report.cancelled += 1
+        elif fut.exception() is None:
+            report.completed += 1
+
+    def _collect(self) -> None:
+        for identifier, metrics in self.manager.metrics.items():
+            report = self.reports[self._priorities[identifier]]
+            report.expired += metrics.expired
+            report.superseded += metrics.superseded
+            report.parked += metrics.parked
+        for request in self._unstarted.values():
+            # Dropped requests never ran by design. Others were starved.
+            if request.task is None or request.task.cancelled():
+                continue
+            self.reports[request.priority].starved += 1
+
+
+def print_report(reports: dict[int, PriorityReport], elapsed: float) -> None:
+    print(
+        f"{'Priority':>8}{'sent':>7}{'skipped':>9}{'done':>7}{'cancel':>8}"
+        f"{'expired':>9}{'supers.':>9}{'parked':>8}{'starved':>9}{'/s':>8}"
+        f"{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for priority, report in sorted(reports.items()):
+        r = report.to_json(elapsed)
+        print(
+            f"{priority:>8}{r['sent']:>7}{r['skipped']:>9}{r['completed']:>7}"
+            f"{r['cancelled']:>8}{r['expired']:>9}{r['superseded']:>9}"
+            f"{r['parked']:>8}{r['starved']:>9}{r['throughput']:>8.1f}"
+            f"{r['wait_ms']['p50']:>9.2f}{r['wait_ms']['p99']:>9.2f}"
+            f"{r['wait_ms']['max']:>9.2f}"
+        )
+    completed = sum(report.completed for report in reports.values())
+    print(f"{completed} procedures completed in {elapsed:.2f}s.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bots", type=int, default=12)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--starvation", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    stream = parser.add_mutually_exclusive_group()
+    stream.add_argument("--record")
+    stream.add_argument("--replay")
+    parser.add_argument("--json")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.replay:
+        with open(args.replay) as f:
+            events = [json.loads(line) for line in f if line.strip()]
+    else:
+        events = synthetic_stream(args.bots, args.duration, args.seed)
+    if args.record:
+        with open(args.record, "w") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+
+    replay = Replay(args.time_scale, args.starvation)
+    elapsed = asyncio.run(replay.run(events))
+    print_report(replay.reports, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {str(p): r.to_json(elapsed) for p, r in replay.reports.items()},
+                f,
+                indent=4,
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())